@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Benchmark script measuring the memory used per model instance
+
+Builds a batch of Document and Account models from representative API
+payloads and reports the bytes allocated per instance, excluding the raw
+payloads themselves, which the caller holds either way. The models are
+compared with the previous model shape, which copied every key of the raw
+data into an instance __dict__ and built nested models eagerly.
+"""
+
+import sys
+import os
+import gc
+import tracemalloc
+
+# Add the current directory to the path so we can import the client
+sys.path.insert(0, os.path.dirname(__file__))
+
+from koywe_api_client.models import Document, Account
+
+
+class BaselineModel:
+    """Previous model shape: every raw key copied into the instance __dict__"""
+    
+    def __init__(self, data: dict):
+        self._data = data
+        for key, value in data.items():
+            setattr(self, key, value)
+            
+    _parse_datetime = staticmethod(Document._parse_datetime)
+
+
+class BaselineDocumentDetail(BaselineModel):
+    def __init__(self, data: dict):
+        super().__init__(data)
+        for key in ("product_name", "quantity", "unit_price", "total", "description"):
+            setattr(self, key, data.get(key))
+
+
+class BaselineDocumentHeader(BaselineModel):
+    FIELDS = (
+        "document_type_id", "currency_id", "account_id",
+        "issuer_address", "issuer_city", "issuer_district", "issuer_phone", "issuer_activity",
+        "receiver_address", "receiver_city", "receiver_district", "receiver_phone", "receiver_activity"
+    )
+    
+    def __init__(self, data: dict):
+        super().__init__(data)
+        for key in self.FIELDS:
+            setattr(self, key, data.get(key))
+        self.issue_date = self._parse_datetime(data.get("issue_date"))
+
+
+class BaselineDocument(BaselineModel):
+    def __init__(self, data: dict):
+        super().__init__(data)
+        self.document_id = data.get("document_id")
+        self.header = BaselineDocumentHeader(data.get("header", {}))
+        self.details = [BaselineDocumentDetail(detail) for detail in data.get("details", [])]
+        totals = data.get("totals", {})
+        self.subtotal = totals.get("subtotal")
+        self.tax = totals.get("tax")
+        self.total = totals.get("total")
+        electronic_document = data.get("electronic_document", {})
+        self.electronic_document_id = electronic_document.get("id")
+        self.electronic_document_url = electronic_document.get("url")
+        self.payment_link_url = data.get("payment_link", {}).get("url")
+    
+    def get_line_items_total(self) -> float:
+        return sum(detail.total or 0 for detail in self.details)
+
+
+class BaselineAccount(BaselineModel):
+    FIELDS = (
+        "name", "tax_id", "email", "phone", "address", "city", "state", "country_id",
+        "postal_code", "business_type", "industry"
+    )
+    
+    def __init__(self, data: dict):
+        super().__init__(data)
+        self.account_id = data.get("account_id") or data.get("id")
+        for key in self.FIELDS:
+            setattr(self, key, data.get(key))
+        self.is_active = data.get("is_active", True)
+        self.is_verified = data.get("is_verified", False)
+
+
+def make_document(index: int) -> dict:
+    """Build a document payload shaped like the API's"""
+    return {
+        "document_id": index,
+        "header": {
+            "document_type_id": 33,
+            "issue_date": "2024-03-15T10:30:00",
+            "currency_id": 1,
+            "account_id": 1000 + index % 50,
+            "issuer_address": "Av. Providencia 1234",
+            "issuer_city": "Santiago",
+            "issuer_district": "Providencia",
+            "issuer_phone": "+56 2 2345 6789",
+            "issuer_activity": "Software development",
+            "receiver_address": f"Calle {index} 100",
+            "receiver_city": "Valparaiso",
+            "receiver_district": "Centro",
+            "receiver_phone": "+56 9 8765 4321",
+            "receiver_activity": "Retail"
+        },
+        "details": [
+            {
+                "product_name": f"Item {line}",
+                "quantity": line + 1,
+                "unit_price": 1500.0,
+                "total": 1500.0 * (line + 1),
+                "description": "Monthly subscription"
+            }
+            for line in range(3)
+        ],
+        "totals": {"subtotal": 9000.0, "tax": 1710.0, "total": 10710.0},
+        "electronic_document": {"id": f"DTE-{index}", "url": f"https://example.com/dte/{index}"},
+        "payment_link": {"url": f"https://example.com/pay/{index}"}
+    }
+
+
+def make_account(index: int) -> dict:
+    """Build an account payload shaped like the API's"""
+    return {
+        "id": index,
+        "name": f"Account {index}",
+        "tax_id": "76.123.456-7",
+        "email": f"billing{index}@example.com",
+        "phone": "+56 2 2345 6789",
+        "address": "Av. Apoquindo 4500",
+        "city": "Santiago",
+        "state": "RM",
+        "country_id": 1,
+        "postal_code": "7550000",
+        "business_type": "company",
+        "industry": "software",
+        "is_active": True,
+        "is_verified": True
+    }
+
+
+def measure(model_class, payloads: list, touch=None) -> float:
+    """
+    Return the bytes allocated per model built from the payloads
+    
+    Args:
+        model_class: Model class to instantiate
+        payloads: Raw API payloads
+        touch: Optional function called with each model before measuring,
+            so that attributes built on first access are included
+    """
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    models = [model_class(payload) for payload in payloads]
+    if touch is not None:
+        for model in models:
+            touch(model)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) / len(models)
+
+
+def read_document(document) -> None:
+    """Read the typed attributes of a document"""
+    document.header.issue_date
+    document.get_line_items_total()
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    
+    print("=== Model Memory Benchmark ===\n")
+    print(f"Instances per model: {count}\n")
+    
+    documents = [make_document(index) for index in range(count)]
+    accounts = [make_account(index) for index in range(count)]
+    
+    rows = [
+        ("Document", BaselineDocument, Document, documents, None),
+        ("Document, after reads", BaselineDocument, Document, documents, read_document),
+        ("Account", BaselineAccount, Account, accounts, None)
+    ]
+    
+    print(f"{'Bytes per instance':<24}{'baseline':>10}{'current':>10}")
+    for name, baseline_class, model_class, payloads, touch in rows:
+        baseline = measure(baseline_class, payloads, touch)
+        current = measure(model_class, payloads, touch)
+        print(f"{name:<24}{baseline:>10.0f}{current:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -93,6 +93,14 @@ def main():
                 print(f"Error fetching page {page_num}: {str(e)}")
                 break
         
+        # Iterate over every document without handling pages manually
+        print("\n--- Iterating over all documents ---")
+        
+        count = 0
+        for document in client.documents.iter_all(page_size=50, prefetch=1):
+            count += 1
+        print(f"Iterated over {count} documents")
+        
     except KoyweAPIError as e:
         print(f"API Error: {e.message}")
         print(f"Status Code: {e.status_code}")
@@ -0,0 +1,179 @@
+"""
+Local stand-in for the Koywe API used by the test scripts
+
+FakeAPI serves a small in-memory document store over HTTP on localhost,
+so tests drive the real clients through their real transports.
+"""
+
+import json
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+
+def make_document(document_id: int) -> Dict[str, Any]:
+    """Build the document the fake API stores under an id"""
+    return {
+        "document_id": document_id,
+        "header": {"document_type_id": 1, "issue_date": "2024-01-01", "currency_id": 1, "account_id": 1},
+        "totals": {"subtotal": 10.0, "tax": 1.0, "total": 11.0}
+    }
+
+
+class FakeAPI:
+    """
+    Koywe API stand-in served on localhost
+    
+    Document listings return at most page_cap documents per page,
+    whatever limit was requested, with pagination metadata in the style
+    given by pagination: "total_count", "total_pages", "has_more" or None.
+    
+    failures queues error responses for the next requests of a method,
+    authentication aside: each entry is (method, status), or (method,
+    status, True) to let the request take effect before the error is
+    returned, like a response lost on its way back.
+    """
+    
+    def __init__(self, documents: int = 0, page_cap: Optional[int] = None, pagination: Optional[str] = "total_count"):
+        self.documents: Dict[int, Dict[str, Any]] = {i: make_document(i) for i in range(1, documents + 1)}
+        self.page_cap = page_cap
+        self.pagination = pagination
+        self.requests: List[Tuple[str, str, Dict[str, str]]] = []
+        self.failures: List[Tuple] = []
+        self.auth_calls = 0
+        self.lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+    
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_address[1]}/V1"
+    
+    def credentials(self) -> Dict[str, str]:
+        """Keyword arguments for a client talking to this API"""
+        return {
+            "client_id": "test_id",
+            "client_secret": "test_secret",
+            "username": "test_user",
+            "password": "test_pass",
+            "base_url": self.base_url
+        }
+    
+    def count(self, method: str, path: str = "/V1/documents") -> int:
+        """Number of requests received for a method and path, ignoring the query"""
+        with self.lock:
+            return sum(1 for m, p, _ in self.requests if m == method and p.split("?")[0] == path)
+    
+    def __enter__(self) -> "FakeAPI":
+        self._thread.start()
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+    
+    def _handler_class(self):
+        api = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            
+            def log_message(self, *args):
+                pass
+            
+            def do_GET(self):
+                self._handle("GET")
+            
+            def do_POST(self):
+                self._handle("POST")
+            
+            def do_PUT(self):
+                self._handle("PUT")
+            
+            def do_DELETE(self):
+                self._handle("DELETE")
+            
+            def _handle(self, method: str):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length)) if length else None
+                url = urlsplit(self.path)
+                with api.lock:
+                    api.requests.append((method, self.path, dict(self.headers)))
+                    failure = api._next_failure(method, url.path)
+                    if failure is None or len(failure) > 2:
+                        status, payload, headers = api._respond(
+                            method, url.path, dict(parse_qsl(url.query)), body, self.headers
+                        )
+                if failure is not None:
+                    status, payload, headers = failure[1], {"error": "injected"}, {}
+                self._send(status, payload, headers)
+            
+            def _send(self, status: int, payload: Any, headers: Optional[Dict[str, str]] = None):
+                raw = json.dumps(payload).encode("utf-8") if payload is not None else b""
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(raw)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(raw)
+                
+        return Handler
+    
+    def _next_failure(self, method: str, path: str) -> Optional[Tuple]:
+        """Take the first queued failure for a request; called under the lock"""
+        if path.endswith("/auth"):
+            return None
+        for entry in self.failures:
+            if entry[0] == method:
+                self.failures.remove(entry)
+                return entry
+        return None
+    
+    def _respond(self, method: str, path: str, query: Dict[str, str], body: Any, headers) -> Tuple[int, Any, Dict[str, str]]:
+        """Answer a request from the document store; called under the lock"""
+        if path.endswith("/auth"):
+            self.auth_calls += 1
+            token = f"token-{self.auth_calls}"
+            return 200, {"access_token": token, "refresh_token": f"refresh-{token}", "expires_in": 3600}, {}
+        
+        match = re.search(r"/documents/(\d+)$", path)
+        if match:
+            document_id = int(match.group(1))
+            document = self.documents.get(document_id)
+            if document is None:
+                return 404, {"error": "not found"}, {}
+            if method == "DELETE":
+                del self.documents[document_id]
+                return 200, {"deleted": True}, {}
+            if method == "PUT":
+                document.update(body or {})
+            etag = f'"{document_id}-{hash(json.dumps(document, sort_keys=True))}"'
+            if method == "GET" and headers.get("If-None-Match") == etag:
+                return 304, None, {"ETag": etag}
+            return 200, document, {"ETag": etag}
+        
+        if path.endswith("/documents"):
+            if method == "POST":
+                document_id = max(self.documents, default=0) + 1
+                self.documents[document_id] = {**(body or {}), "document_id": document_id}
+                return 201, self.documents[document_id], {}
+            return 200, self._page(int(query.get("page", 1)), int(query.get("limit", 10))), {}
+        
+        return 404, {"error": "not found"}, {}
+    
+    def _page(self, page: int, limit: int) -> Dict[str, Any]:
+        size = min(limit, self.page_cap) if self.page_cap else limit
+        documents = [self.documents[key] for key in sorted(self.documents)]
+        start = (page - 1) * size
+        response: Dict[str, Any] = {"data": documents[start:start + size]}
+        if self.pagination == "total_count":
+            response["total_count"] = len(documents)
+        elif self.pagination == "total_pages":
+            response["total_pages"] = -(-len(documents) // size)
+        elif self.pagination == "has_more":
+            response["has_more"] = start + size < len(documents)
+        return response
@@ -3,23 +3,69 @@ Koywe API Client - Python integration for Koywe e-invoicing API
 """
 
 from .client import KoyweClient
+from .async_client import AsyncKoyweClient
+from .retry import RetryPolicy, RetryAttempt
+from .token_store import TokenStore, MemoryTokenStore, FileTokenStore
+from .ratelimit import RateLimiter, TokenBucket, FileTokenBucket
+from .concurrency import AdaptiveConcurrencyLimiter
+from .bulk import BulkResult
+from .mirror import DocumentMirror
+from .models import DocumentBatch
+from .cache import ResponseCache, CacheBackend, MemoryCache, SQLiteCache
+from .coalesce import RequestCoalescer
+from .idempotency import IdempotencyLedger, idempotency_key
+from .outbox import InvoiceOutbox
+from .codec import JSONCodec, OrjsonCodec, UjsonCodec
+from .sync import DocumentSync, CheckpointStore, MemoryCheckpointStore, FileCheckpointStore
 from .exceptions import (
     KoyweAPIError,
     AuthenticationError,
     ValidationError,
     NotFoundError,
     RateLimitError,
-    NetworkError
+    NetworkError,
+    RequestTimeoutError,
+    PendingCreateError
 )
 
 __version__ = "1.0.0"
 __all__ = [
     "KoyweClient",
+    "AsyncKoyweClient",
+    "RetryPolicy",
+    "RetryAttempt",
+    "TokenStore",
+    "MemoryTokenStore",
+    "FileTokenStore",
+    "RateLimiter",
+    "TokenBucket",
+    "FileTokenBucket",
+    "AdaptiveConcurrencyLimiter",
+    "BulkResult",
+    "DocumentMirror",
+    "DocumentBatch",
+    "ResponseCache",
+    "CacheBackend",
+    "MemoryCache",
+    "SQLiteCache",
+    "RequestCoalescer",
+    "IdempotencyLedger",
+    "idempotency_key",
+    "InvoiceOutbox",
+    "JSONCodec",
+    "OrjsonCodec",
+    "UjsonCodec",
+    "DocumentSync",
+    "CheckpointStore",
+    "MemoryCheckpointStore",
+    "FileCheckpointStore",
     "KoyweAPIError",
     "AuthenticationError", 
     "ValidationError",
     "NotFoundError",
     "RateLimitError",
-    "NetworkError"
+    "NetworkError",
+    "RequestTimeoutError",
+    "PendingCreateError"
 ]
 
@@ -0,0 +1,126 @@
+"""
+Asynchronous authentication handler for Koywe API
+"""
+
+import asyncio
+from typing import Dict, Optional
+from .auth import BaseAuthHandler
+from .exceptions import AuthenticationError, NetworkError
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - optional dependency
+    httpx = None
+
+
+class AsyncAuthHandler(BaseAuthHandler):
+    """Handles authentication with the Koywe API on an asyncio event loop"""
+    
+    def __init__(
+        self,
+        client_id: str,
+        client_secret: str,
+        username: str,
+        password: str,
+        base_url: str,
+        session: "httpx.AsyncClient"
+    ):
+        super().__init__(client_id, client_secret, username, password, base_url)
+        self.session = session
+        self._lock: Optional[asyncio.Lock] = None
+    
+    @property
+    def _token_lock(self) -> asyncio.Lock:
+        """Lock guarding token acquisition, created on the running event loop"""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        return self._lock
+    
+    async def get_auth_headers(self) -> Dict[str, str]:
+        """Get authorization headers for API requests"""
+        if not self.is_authenticated:
+            # Single flight: one task authenticates, the others wait and reuse its token
+            async with self._token_lock:
+                if not self.is_authenticated:
+                    await self._authenticate()
+                    
+        return self._build_auth_headers()
+    
+    async def authenticate(self) -> None:
+        """Authenticate with the Koywe API and obtain access token"""
+        async with self._token_lock:
+            await self._authenticate()
+    
+    async def refresh_access_token(self, stale_headers: Optional[Dict[str, str]] = None) -> None:
+        """
+        Refresh the access token using the refresh token
+        
+        Args:
+            stale_headers: Authorization headers that were rejected; when the
+                token has changed since, another task already refreshed it
+                and no request is made
+        """
+        async with self._token_lock:
+            if stale_headers is not None and self.is_authenticated and self._build_auth_headers() != stale_headers:
+                return
+            await self._refresh_access_token()
+    
+    async def discard_tokens(self, stale_headers: Dict[str, str]) -> None:
+        """
+        Clear the stored tokens after a request was rejected with them
+        
+        Args:
+            stale_headers: Authorization headers that were rejected; when the
+                token has changed since, another task already replaced it
+                and it is kept
+        """
+        async with self._token_lock:
+            if self._build_auth_headers() == stale_headers:
+                self.clear_tokens()
+    
+    async def _authenticate(self) -> None:
+        """Run the password grant; the caller must hold the token lock"""
+        headers = {
+            "Content-Type": "application/json"
+        }
+        
+        try:
+            response = await self.session.post(
+                self.auth_url,
+                json=self._password_grant_payload(),
+                headers=headers
+            )
+            self._handle_auth_response(response)
+            
+        except httpx.HTTPError as e:
+            raise NetworkError(f"Network error during authentication: {str(e)}")
+        except ValueError as e:
+            raise AuthenticationError(f"Invalid authentication response: {str(e)}")
+    
+    async def _refresh_access_token(self) -> None:
+        """Run the refresh token grant; the caller must hold the token lock"""
+        if not self._refresh_token:
+            # If no refresh token, re-authenticate
+            await self._authenticate()
+            return
+        
+        headers = {
+            "Content-Type": "application/json"
+        }
+        
+        try:
+            response = await self.session.post(
+                self.auth_url,
+                json=self._refresh_grant_payload(),
+                headers=headers
+            )
+            
+            if response.status_code == 200:
+                self._process_auth_response(response.json())
+                return
+        
+        except (httpx.HTTPError, ValueError):
+            pass
+        
+        # If refresh fails, try full authentication
+        await self._authenticate()
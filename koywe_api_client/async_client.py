@@ -0,0 +1,158 @@
+"""
+Asynchronous Koywe API client
+"""
+
+from typing import Optional, Union
+from .async_auth import AsyncAuthHandler
+from .client import _DEFAULT_RETRY_POLICY, _environment_settings
+from .retry import RetryPolicy
+from .ratelimit import RateLimiter
+from .concurrency import AdaptiveConcurrencyLimiter
+from .mirror import DocumentMirror
+from .cache import ResponseCache
+from .coalesce import RequestCoalescer
+from .idempotency import IdempotencyLedger
+from .codec import JSONCodec, get_codec
+from .endpoints.async_documents import AsyncDocumentsEndpoint
+from .endpoints.async_accounts import AsyncAccountsEndpoint
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - optional dependency
+    httpx = None
+
+
+DEFAULT_MAX_CONNECTIONS = 100
+DEFAULT_MAX_KEEPALIVE_CONNECTIONS = 20
+DEFAULT_KEEPALIVE_EXPIRY = 60.0
+
+
+class AsyncKoyweClient:
+    """Asyncio client for interacting with the Koywe API"""
+    
+    def __init__(
+        self,
+        client_id: str,
+        client_secret: str,
+        username: str,
+        password: str,
+        base_url: str = "https://api-billing.koywe.com/V1",
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        max_keepalive_connections: int = DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry: Optional[float] = DEFAULT_KEEPALIVE_EXPIRY,
+        timeout: float = 30.0,
+        retry_policy: Optional[RetryPolicy] = _DEFAULT_RETRY_POLICY,
+        rate_limiter: Optional[RateLimiter] = None,
+        concurrency_limiter: Optional[AdaptiveConcurrencyLimiter] = None,
+        mirror: Optional[DocumentMirror] = None,
+        cache: Optional[ResponseCache] = None,
+        coalesce_requests: bool = False,
+        idempotency_ledger: Optional[IdempotencyLedger] = None,
+        json_codec: Optional[Union[str, JSONCodec]] = None
+    ):
+        """
+        Initialize the asynchronous Koywe API client
+        
+        The client authenticates lazily on the first request; await
+        authenticate() to do it up front.
+        
+        Args:
+            client_id: Your Koywe client ID
+            client_secret: Your Koywe client secret
+            username: Your API username
+            password: Your API password
+            base_url: Base URL for the API (default: production)
+            max_connections: Maximum concurrent connections in the pool (default: 100)
+            max_keepalive_connections: Idle connections kept open (default: 20)
+            keepalive_expiry: Seconds an idle connection may be reused (default: 60)
+            timeout: Request timeout in seconds (default: 30)
+            retry_policy: Retry policy for failed requests, or None to send every
+                request once (default: RetryPolicy())
+            rate_limiter: Client-side request rate limiter (default: None)
+            concurrency_limiter: Adaptive cap on in-flight requests (default: None)
+            mirror: Local document mirror kept current by document writes (default: None)
+            cache: Read cache for single documents and accounts (default: None)
+            coalesce_requests: Let concurrent identical GET requests share one
+                network call (default: False)
+            idempotency_ledger: Ledger recording the outcome of document
+                creations by idempotency key, so that a create is not posted
+                twice (default: None)
+            json_codec: JSON codec for request and response bodies, or its name:
+                "orjson", "ujson" or "json" (default: the fastest one installed)
+        """
+        if httpx is None:
+            raise ImportError(
+                "AsyncKoyweClient requires httpx. "
+                "Install it with: pip install koywe-api-client[async]"
+            )
+            
+        self.base_url = base_url.rstrip('/')
+        self.retry_policy = RetryPolicy() if retry_policy is _DEFAULT_RETRY_POLICY else retry_policy
+        self.rate_limiter = rate_limiter
+        self.concurrency_limiter = concurrency_limiter
+        self.mirror = mirror
+        self.cache = cache
+        self.coalescer = RequestCoalescer() if coalesce_requests else None
+        self.idempotency_ledger = idempotency_ledger
+        self.json_codec = get_codec(json_codec)
+        
+        # Shared connection pool for authentication and all endpoints
+        self.session = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry
+            ),
+            timeout=timeout
+        )
+        
+        # Initialize authentication handler
+        self.auth_handler = AsyncAuthHandler(
+            client_id=client_id,
+            client_secret=client_secret,
+            username=username,
+            password=password,
+            base_url=self.base_url,
+            session=self.session
+        )
+        
+        # Initialize endpoint handlers
+        self.documents = AsyncDocumentsEndpoint(self)
+        self.accounts = AsyncAccountsEndpoint(self)
+    
+    async def authenticate(self) -> None:
+        """Authenticate with the Koywe API"""
+        await self.auth_handler.authenticate()
+    
+    def is_authenticated(self) -> bool:
+        """Check if the client is currently authenticated"""
+        return self.auth_handler.is_authenticated
+    
+    def clear_authentication(self) -> None:
+        """Clear stored authentication tokens"""
+        self.auth_handler.clear_tokens()
+    
+    async def aclose(self) -> None:
+        """Close the underlying connection pool"""
+        await self.session.aclose()
+    
+    async def __aenter__(self) -> 'AsyncKoyweClient':
+        return self
+    
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.aclose()
+    
+    @classmethod
+    def from_environment(cls, **kwargs) -> 'AsyncKoyweClient':
+        """
+        Create a client instance using environment variables
+        
+        Reads the same KOYWE_* variables as KoyweClient.from_environment.
+        
+        Args:
+            **kwargs: Additional client options (pooling, etc.)
+            
+        Returns:
+            AsyncKoyweClient instance
+        """
+        return cls(**_environment_settings(), **kwargs)
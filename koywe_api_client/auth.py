@@ -2,14 +2,17 @@
 Authentication handler for Koywe API
 """
 
+import threading
 import time
 from typing import Optional, Dict, Any
 import requests
 from .exceptions import AuthenticationError, NetworkError
+from .session import create_session
+from .token_store import TokenStore
 
 
-class AuthHandler:
-    """Handles authentication with the Koywe API"""
+class BaseAuthHandler:
+    """Token state and payload handling shared by the sync and async handlers"""
     
     def __init__(self, client_id: str, client_secret: str, username: str, password: str, base_url: str):
         self.client_id = client_id
@@ -21,8 +24,20 @@ class AuthHandler:
         self._access_token: Optional[str] = None
         self._refresh_token: Optional[str] = None
         self._token_expires_at: Optional[float] = None
+        self._token_issued_at: Optional[float] = None
+        self._token_lifetime: Optional[float] = None
         self._token_type: str = "Bearer"
     
+    @property
+    def token_key(self) -> str:
+        """Key under which clients with the same credentials share their token"""
+        return f"{self.base_url}|{self.client_id}|{self.username}"
+    
+    @property
+    def auth_url(self) -> str:
+        """URL of the token endpoint"""
+        return f"{self.base_url}/auth"
+    
     @property
     def is_authenticated(self) -> bool:
         """Check if we have a valid access token"""
@@ -32,52 +47,62 @@ class AuthHandler:
             time.time() < self._token_expires_at
         )
     
-    def get_auth_headers(self) -> Dict[str, str]:
-        """Get authorization headers for API requests"""
-        if not self.is_authenticated:
-            self.authenticate()
+    def get_refresh_time(self, fraction: float) -> Optional[float]:
+        """
+        Get the time at which the token reaches the given fraction of its lifetime
         
+        Args:
+            fraction: Fraction of the token lifetime, between 0 and 1
+            
+        Returns:
+            Unix timestamp, never later than the early expiry, or None without a token
+        """
+        if self._token_issued_at is None or self._token_expires_at is None:
+            return None
+        return min(self._token_issued_at + self._token_lifetime * fraction, self._token_expires_at)
+    
+    def _build_auth_headers(self) -> Dict[str, str]:
+        """Build the authorization headers from the current token"""
         return {
             "Authorization": f"{self._token_type} {self._access_token}"
         }
     
-    def authenticate(self) -> None:
-        """Authenticate with the Koywe API and obtain access token"""
-        auth_url = f"{self.base_url}/auth"
-        
-        payload = {
+    def _password_grant_payload(self) -> Dict[str, Any]:
+        """Build the payload for a password grant"""
+        return {
             "grant_type": "password",
             "client_id": self.client_id,
             "client_secret": self.client_secret,
             "username": self.username,
             "password": self.password
         }
-        
-        headers = {
-            "Content-Type": "application/json"
+    
+    def _refresh_grant_payload(self) -> Dict[str, Any]:
+        """Build the payload for a refresh token grant"""
+        return {
+            "grant_type": "refresh_token",
+            "refresh_token": self._refresh_token,
+            "client_id": self.client_id,
+            "client_secret": self.client_secret
         }
-        
-        try:
-            response = requests.post(auth_url, json=payload, headers=headers, timeout=30)
-            
-            if response.status_code == 200:
-                data = response.json()
-                self._process_auth_response(data)
-            elif response.status_code == 401:
-                raise AuthenticationError(
-                    "Invalid credentials provided",
-                    status_code=response.status_code,
-                    response_data=response.json() if response.content else {}
-                )
-            else:
-                raise AuthenticationError(
-                    f"Authentication failed with status {response.status_code}",
-                    status_code=response.status_code,
-                    response_data=response.json() if response.content else {}
-                )
-                
-        except requests.exceptions.RequestException as e:
-            raise NetworkError(f"Network error during authentication: {str(e)}")
+    
+    def _handle_auth_response(self, response) -> None:
+        """Store the tokens from a password grant response or raise on failure"""
+        if response.status_code == 200:
+            data = response.json()
+            self._process_auth_response(data)
+        elif response.status_code == 401:
+            raise AuthenticationError(
+                "Invalid credentials provided",
+                status_code=response.status_code,
+                response_data=response.json() if response.content else {}
+            )
+        else:
+            raise AuthenticationError(
+                f"Authentication failed with status {response.status_code}",
+                status_code=response.status_code,
+                response_data=response.json() if response.content else {}
+            )
     
     def _process_auth_response(self, data: Dict[str, Any]) -> None:
         """Process the authentication response and store tokens"""
@@ -87,48 +112,203 @@ class AuthHandler:
         
         # Calculate expiration time
         expires_in = data.get("expires_in", 3600)  # Default to 1 hour
-        self._token_expires_at = time.time() + expires_in - 60  # Refresh 1 minute early
+        self._token_issued_at = time.time()
+        self._token_lifetime = expires_in
+        self._token_expires_at = self._token_issued_at + expires_in - 60  # Refresh 1 minute early
         
         if not self._access_token:
             raise AuthenticationError("No access token received from authentication response")
     
-    def refresh_access_token(self) -> None:
-        """Refresh the access token using the refresh token"""
-        if not self._refresh_token:
-            # If no refresh token, re-authenticate
-            self.authenticate()
+    def clear_tokens(self) -> None:
+        """Clear stored authentication tokens"""
+        self._access_token = None
+        self._refresh_token = None
+        self._token_expires_at = None
+        self._token_issued_at = None
+        self._token_lifetime = None
+
+
+class AuthHandler(BaseAuthHandler):
+    """Handles authentication with the Koywe API"""
+    
+    def __init__(
+        self,
+        client_id: str,
+        client_secret: str,
+        username: str,
+        password: str,
+        base_url: str,
+        session: Optional[requests.Session] = None,
+        token_store: Optional[TokenStore] = None
+    ):
+        super().__init__(client_id, client_secret, username, password, base_url)
+        self.session = session or create_session()
+        self.token_store = token_store
+        
+        # Guards token acquisition so only one thread talks to /auth at a time
+        self._lock = threading.Lock()
+    
+    def get_auth_headers(self) -> Dict[str, str]:
+        """Get authorization headers for API requests"""
+        if not self.is_authenticated:
+            # Single flight: one thread authenticates, the others wait and reuse its token
+            with self._lock:
+                if not self.is_authenticated:
+                    self._acquire_token()
+                    
+        return self._build_auth_headers()
+    
+    def ensure_authenticated(self) -> None:
+        """Obtain a token unless a valid one is held locally or in the token store"""
+        self.get_auth_headers()
+    
+    def authenticate(self) -> None:
+        """Authenticate with the Koywe API and obtain access token"""
+        with self._lock:
+            if self.token_store is None:
+                self._authenticate()
+                return
+            
+            with self.token_store.lock(self.token_key):
+                self._authenticate()
+                self._save_shared_token()
+    
+    def refresh_access_token(self, stale_headers: Optional[Dict[str, str]] = None) -> None:
+        """
+        Refresh the access token using the refresh token
+        
+        Args:
+            stale_headers: Authorization headers that were rejected; when the
+                token has changed since, another thread already refreshed it
+                and no request is made
+        """
+        with self._lock:
+            if stale_headers is not None and self.is_authenticated and self._build_auth_headers() != stale_headers:
+                return
+            
+            if self.token_store is None:
+                self._refresh_access_token()
+                return
+            
+            with self.token_store.lock(self.token_key):
+                # Another process may have refreshed the shared token already
+                if self._load_shared_token(stale_headers=stale_headers):
+                    return
+                self._refresh_access_token()
+                self._save_shared_token()
+    
+    def discard_tokens(self, stale_headers: Dict[str, str]) -> None:
+        """
+        Clear the stored tokens after a request was rejected with them
+        
+        Args:
+            stale_headers: Authorization headers that were rejected; when the
+                token has changed since, another thread already replaced it
+                and it is kept
+        """
+        with self._lock:
+            if self._build_auth_headers() == stale_headers:
+                self.clear_tokens()
+    
+    def _acquire_token(self) -> None:
+        """Adopt a valid shared token or run the password grant; the caller must hold the token lock"""
+        if self.token_store is None:
+            self._authenticate()
             return
         
-        auth_url = f"{self.base_url}/auth"
+        with self.token_store.lock(self.token_key):
+            if self._load_shared_token():
+                return
+            self._authenticate()
+            self._save_shared_token()
+    
+    def _load_shared_token(self, stale_headers: Optional[Dict[str, str]] = None) -> bool:
+        """
+        Adopt the token from the token store
         
-        payload = {
-            "grant_type": "refresh_token",
+        Args:
+            stale_headers: Authorization headers known to be rejected
+            
+        Returns:
+            True if a valid token other than the rejected one was adopted
+        """
+        record = self.token_store.load(self.token_key)
+        if not record:
+            return False
+        
+        # Refresh tokens may rotate, so always continue from the newest one
+        if record.get("refresh_token"):
+            self._refresh_token = record["refresh_token"]
+            
+        if not record.get("access_token") or time.time() >= record.get("expires_at", 0):
+            return False
+        
+        headers = {"Authorization": f"{record.get('token_type', 'Bearer')} {record['access_token']}"}
+        if stale_headers is not None and headers == stale_headers:
+            return False
+        
+        self._access_token = record["access_token"]
+        self._token_type = record.get("token_type", "Bearer")
+        self._token_expires_at = record["expires_at"]
+        self._token_issued_at = record.get("issued_at", time.time())
+        self._token_lifetime = record.get("lifetime", self._token_expires_at + 60 - self._token_issued_at)
+        return True
+    
+    def _save_shared_token(self) -> None:
+        """Publish the current token to the token store"""
+        self.token_store.save(self.token_key, {
+            "access_token": self._access_token,
             "refresh_token": self._refresh_token,
-            "client_id": self.client_id,
-            "client_secret": self.client_secret
+            "token_type": self._token_type,
+            "issued_at": self._token_issued_at,
+            "lifetime": self._token_lifetime,
+            "expires_at": self._token_expires_at
+        })
+    
+    def _authenticate(self) -> None:
+        """Run the password grant; the caller must hold the token lock"""
+        headers = {
+            "Content-Type": "application/json"
         }
         
+        try:
+            response = self.session.post(
+                self.auth_url,
+                json=self._password_grant_payload(),
+                headers=headers,
+                timeout=30
+            )
+            self._handle_auth_response(response)
+            
+        except requests.exceptions.RequestException as e:
+            raise NetworkError(f"Network error during authentication: {str(e)}")
+    
+    def _refresh_access_token(self) -> None:
+        """Run the refresh token grant; the caller must hold the token lock"""
+        if not self._refresh_token:
+            # If no refresh token, re-authenticate
+            self._authenticate()
+            return
+        
         headers = {
             "Content-Type": "application/json"
         }
         
         try:
-            response = requests.post(auth_url, json=payload, headers=headers, timeout=30)
+            response = self.session.post(
+                self.auth_url,
+                json=self._refresh_grant_payload(),
+                headers=headers,
+                timeout=30
+            )
             
             if response.status_code == 200:
                 data = response.json()
                 self._process_auth_response(data)
             else:
                 # If refresh fails, try full authentication
-                self.authenticate()
+                self._authenticate()
                 
         except requests.exceptions.RequestException:
             # If refresh fails, try full authentication
-            self.authenticate()
-    
-    def clear_tokens(self) -> None:
-        """Clear stored authentication tokens"""
-        self._access_token = None
-        self._refresh_token = None
-        self._token_expires_at = None
-
+            self._authenticate()
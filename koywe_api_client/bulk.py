@@ -0,0 +1,187 @@
+"""
+Bounded-parallelism helpers for bulk API operations
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterable, Iterator, List, Optional
+
+
+class BulkResult:
+    """Outcome of one item of a bulk operation"""
+    
+    def __init__(self, index: int, item: Any, result: Any = None, error: Optional[Exception] = None):
+        self.index = index
+        self.item = item
+        self.result = result
+        self.error = error
+    
+    @property
+    def ok(self) -> bool:
+        """Check if the item succeeded"""
+        return self.error is None
+    
+    def __repr__(self) -> str:
+        if self.ok:
+            return f"BulkResult(index={self.index}, ok=True)"
+        return f"BulkResult(index={self.index}, error={self.error!r})"
+
+
+ProgressCallback = Callable[[int, BulkResult], None]
+
+
+def iter_bulk(
+    func: Callable[[Any], Any],
+    items: Iterable[Any],
+    max_workers: int = 8,
+    fail_fast: bool = False
+) -> Iterator[BulkResult]:
+    """
+    Apply func to every item over a bounded thread pool, yielding results as they complete
+    
+    Items are pulled lazily, so at most max_workers of them are in flight
+    and arbitrarily long iterables can be processed.
+    
+    Args:
+        func: Function called with each item
+        items: Items to process
+        max_workers: Maximum number of concurrent calls (default: 8)
+        fail_fast: Stop submitting new items after the first failure; only the
+            items already started are reported (default: False)
+            
+    Yields:
+        BulkResult for every processed item, in completion order
+    """
+    iterator = enumerate(items)
+    pending = {}
+    stop = False
+    
+    def submit_next(executor: ThreadPoolExecutor) -> bool:
+        for index, item in iterator:
+            pending[executor.submit(func, item)] = (index, item)
+            return True
+        return False
+    
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        try:
+            while len(pending) < max_workers and submit_next(executor):
+                pass
+            
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index, item = pending.pop(future)
+                    try:
+                        result = BulkResult(index, item, result=future.result())
+                    except Exception as e:
+                        result = BulkResult(index, item, error=e)
+                        stop = stop or fail_fast
+                    yield result
+                    
+                while not stop and len(pending) < max_workers and submit_next(executor):
+                    pass
+        finally:
+            # The consumer may stop early; drop the work not started yet
+            for future in pending:
+                future.cancel()
+
+
+def run_bulk(
+    func: Callable[[Any], Any],
+    items: Iterable[Any],
+    max_workers: int = 8,
+    ordered: bool = True,
+    fail_fast: bool = False,
+    progress_callback: Optional[ProgressCallback] = None
+) -> List[BulkResult]:
+    """
+    Apply func to every item over a bounded thread pool
+    
+    Args:
+        func: Function called with each item
+        items: Items to process
+        max_workers: Maximum number of concurrent calls (default: 8)
+        ordered: Return results in input order instead of completion order (default: True)
+        fail_fast: Stop submitting new items after the first failure; only the
+            items already started are reported (default: False)
+        progress_callback: Called with (completed_count, result) after each item
+        
+    Returns:
+        List of BulkResult, one per processed item
+    """
+    results: List[BulkResult] = []
+    for result in iter_bulk(func, items, max_workers=max_workers, fail_fast=fail_fast):
+        results.append(result)
+        if progress_callback is not None:
+            progress_callback(len(results), result)
+            
+    if ordered:
+        results.sort(key=lambda result: result.index)
+    return results
+
+
+async def aiter_bulk(
+    func: Callable[[Any], Awaitable[Any]],
+    items: Iterable[Any],
+    max_concurrency: int = 8,
+    fail_fast: bool = False
+) -> AsyncIterator[BulkResult]:
+    """
+    Await func for every item with at most max_concurrency in flight, yielding results as they complete
+    
+    See iter_bulk for the meaning of the arguments.
+    """
+    iterator = enumerate(items)
+    pending = {}
+    stop = False
+    
+    def submit_next() -> bool:
+        for index, item in iterator:
+            pending[asyncio.ensure_future(func(item))] = (index, item)
+            return True
+        return False
+    
+    try:
+        while len(pending) < max_concurrency and submit_next():
+            pass
+        
+        while pending:
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                index, item = pending.pop(task)
+                try:
+                    result = BulkResult(index, item, result=task.result())
+                except Exception as e:
+                    result = BulkResult(index, item, error=e)
+                    stop = stop or fail_fast
+                yield result
+                
+            while not stop and len(pending) < max_concurrency and submit_next():
+                pass
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+async def run_bulk_async(
+    func: Callable[[Any], Awaitable[Any]],
+    items: Iterable[Any],
+    max_concurrency: int = 8,
+    ordered: bool = True,
+    fail_fast: bool = False,
+    progress_callback: Optional[ProgressCallback] = None
+) -> List[BulkResult]:
+    """
+    Await func for every item with at most max_concurrency in flight
+    
+    See run_bulk for the meaning of the arguments.
+    """
+    results: List[BulkResult] = []
+    async for result in aiter_bulk(func, items, max_concurrency=max_concurrency, fail_fast=fail_fast):
+        results.append(result)
+        if progress_callback is not None:
+            progress_callback(len(results), result)
+            
+    if ordered:
+        results.sort(key=lambda result: result.index)
+    return results
@@ -0,0 +1,411 @@
+"""
+Response caching for Koywe API reads
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple, Mapping
+from urllib.parse import urlencode
+
+
+class CacheBackend:
+    """
+    Base class for cache storage
+    
+    Backends store opaque bytes with a time to live, so one backend can be
+    shared by several clients and, depending on the backend, processes.
+    """
+    
+    def get(self, key: str) -> Optional[bytes]:
+        """Get the value stored under key, if present and not expired"""
+        raise NotImplementedError
+    
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        """Store value under key for ttl seconds"""
+        raise NotImplementedError
+    
+    def delete(self, key: str) -> None:
+        """Remove the value stored under key"""
+        raise NotImplementedError
+    
+    def delete_prefix(self, prefix: str) -> None:
+        """Remove every value whose key starts with prefix"""
+        raise NotImplementedError
+    
+    def clear(self) -> None:
+        """Remove every value"""
+        raise NotImplementedError
+    
+    def stats(self) -> Dict[str, Any]:
+        """Get backend statistics for monitoring"""
+        return {}
+
+
+class MemoryCache(CacheBackend):
+    """In-process LRU cache bounded by entry count and total size"""
+    
+    def __init__(self, max_entries: int = 1024, max_bytes: Optional[int] = 16 * 1024 * 1024):
+        """
+        Initialize the cache
+        
+        Args:
+            max_entries: Maximum number of entries (default: 1024)
+            max_bytes: Maximum total size of the stored values (default: 16 MiB)
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._bytes = 0
+        self._evictions = 0
+        self._lock = threading.Lock()
+    
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return value
+    
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        if self.max_bytes is not None and len(value) > self.max_bytes:
+            return
+        
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._bytes += len(value)
+            
+            while len(self._entries) > self.max_entries or (
+                self.max_bytes is not None and self._bytes > self.max_bytes
+            ):
+                self._remove(next(iter(self._entries)))
+                self._evictions += 1
+    
+    def delete(self, key: str) -> None:
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+    
+    def delete_prefix(self, prefix: str) -> None:
+        with self._lock:
+            for key in [key for key in self._entries if key.startswith(prefix)]:
+                self._remove(key)
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+    
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"entries": len(self._entries), "bytes": self._bytes, "evictions": self._evictions}
+    
+    def _remove(self, key: str) -> None:
+        """Drop an entry; the caller must hold the lock"""
+        _, value = self._entries.pop(key)
+        self._bytes -= len(value)
+
+
+class SQLiteCache(CacheBackend):
+    """LRU cache in a SQLite file, shared by every process opening the same path"""
+    
+    def __init__(self, path: str, max_entries: int = 10000):
+        """
+        Initialize the cache
+        
+        Args:
+            path: SQLite database file; created if missing
+            max_entries: Maximum number of entries (default: 10000)
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            self._connection.execute("CREATE INDEX IF NOT EXISTS idx_cache_accessed_at ON cache(accessed_at)")
+    
+    def get(self, key: str) -> Optional[bytes]:
+        now = time.time()
+        with self._lock, self._connection:
+            row = self._connection.execute(
+                "SELECT value FROM cache WHERE key = ? AND expires_at > ?", (key, now)
+            ).fetchone()
+            if row is None:
+                return None
+            self._connection.execute("UPDATE cache SET accessed_at = ? WHERE key = ?", (now, key))
+            return bytes(row[0])
+    
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        now = time.time()
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO cache (key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, value, now + ttl, now)
+            )
+            self._connection.execute("DELETE FROM cache WHERE expires_at <= ?", (now,))
+            self._connection.execute(
+                "DELETE FROM cache WHERE key IN ("
+                "SELECT key FROM cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+    
+    def delete(self, key: str) -> None:
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM cache WHERE key = ?", (key,))
+    
+    def delete_prefix(self, prefix: str) -> None:
+        with self._lock, self._connection:
+            self._connection.execute(
+                "DELETE FROM cache WHERE substr(key, 1, ?) = ?", (len(prefix), prefix)
+            )
+    
+    def clear(self) -> None:
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM cache")
+    
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries, size = self._connection.execute(
+                "SELECT COUNT(*), COALESCE(SUM(LENGTH(value)), 0) FROM cache"
+            ).fetchone()
+        return {"entries": entries, "bytes": size}
+
+
+class CacheEntry:
+    """A cached response with the validators needed to revalidate it"""
+    
+    def __init__(
+        self,
+        body: Dict[str, Any],
+        fresh_until: float,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None
+    ):
+        self.body = body
+        self.fresh_until = fresh_until
+        self.etag = etag
+        self.last_modified = last_modified
+    
+    @property
+    def is_fresh(self) -> bool:
+        """Check if the entry may be used without asking the API"""
+        return time.time() < self.fresh_until
+    
+    @property
+    def has_validators(self) -> bool:
+        """Check if the entry can be revalidated with a conditional request"""
+        return bool(self.etag or self.last_modified)
+    
+    def conditional_headers(self) -> Dict[str, str]:
+        """Get the If-None-Match/If-Modified-Since headers revalidating this entry"""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+    
+    def to_bytes(self) -> bytes:
+        return json.dumps({
+            "body": self.body,
+            "fresh_until": self.fresh_until,
+            "etag": self.etag,
+            "last_modified": self.last_modified
+        }).encode("utf-8")
+    
+    @classmethod
+    def from_bytes(cls, value: bytes) -> "CacheEntry":
+        entry = json.loads(value)
+        return cls(entry["body"], entry["fresh_until"], entry.get("etag"), entry.get("last_modified"))
+
+
+class ResponseCache:
+    """
+    Caches GET responses of single resources, e.g. documents/12 or accounts/3
+    
+    Entries are fresh for a per-resource TTL and are dropped for a whole
+    resource whenever the client writes to it. Entries whose response
+    carried an ETag or Last-Modified header are kept for stale_ttl seconds
+    more, so that once stale they are revalidated with a conditional
+    request instead of being downloaded again. List responses are not
+    cached, so iteration and sync always see the current pages.
+    """
+    
+    def __init__(
+        self,
+        backend: Optional[CacheBackend] = None,
+        ttl: float = 60.0,
+        resource_ttls: Optional[Dict[str, float]] = None,
+        stale_ttl: float = 3600.0
+    ):
+        """
+        Initialize the response cache
+        
+        Args:
+            backend: Where responses are stored (default: MemoryCache())
+            ttl: Seconds a response stays fresh (default: 60)
+            resource_ttls: Per resource TTL, e.g. {"accounts": 600}; a TTL of 0
+                disables caching for that resource
+            stale_ttl: Seconds a stale response with validators is kept for
+                revalidation (default: 3600)
+        """
+        self.backend = backend or MemoryCache()
+        self.ttl = ttl
+        self.resource_ttls = dict(resource_ttls or {})
+        self.stale_ttl = stale_ttl
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def resource_for(endpoint: str) -> str:
+        """Get the resource an endpoint path belongs to, e.g. documents/12 -> documents"""
+        return endpoint.lstrip('/').split('?')[0].split('/')[0]
+    
+    def ttl_for(self, endpoint: str) -> float:
+        """Get the TTL for responses of endpoint, 0 when they are not cached"""
+        path = endpoint.strip('/').split('?')[0]
+        if '/' not in path:
+            return 0.0
+        return self.resource_ttls.get(self.resource_for(endpoint), self.ttl)
+    
+    def key_for(
+        self,
+        endpoint: str,
+        params: Optional[Dict[str, Any]] = None,
+        scope: Optional[str] = None
+    ) -> Optional[str]:
+        """
+        Build the cache key of a GET request, or None if its response is not cached
+        
+        Args:
+            endpoint: API endpoint
+            params: Query parameters
+            scope: Identifies the API and credentials the response is read
+                with, e.g. the auth handler's token_key, so that clients with
+                different tenants sharing a backend never see each other's
+                responses (default: None)
+        """
+        if self.ttl_for(endpoint) <= 0:
+            return None
+        
+        key = endpoint.strip('/')
+        if params:
+            key += "?" + urlencode(sorted(params.items()))
+        return self._scoped(key, scope)
+    
+    @staticmethod
+    def _scoped(key: str, scope: Optional[str]) -> str:
+        return f"{scope}|{key}" if scope is not None else key
+    
+    @staticmethod
+    def _path_of(key: str) -> str:
+        """Get the endpoint part of a cache key; query strings encode "|" so it only separates the scope"""
+        return key.rpartition("|")[2]
+    
+    def lookup(self, key: str) -> Optional[CacheEntry]:
+        """
+        Get the cached entry for key, fresh or stale
+        
+        Fresh entries count as hits, missing or stale ones as misses.
+        """
+        value = self.backend.get(key)
+        entry = CacheEntry.from_bytes(value) if value is not None else None
+        with self._lock:
+            if entry is not None and entry.is_fresh:
+                self.hits += 1
+            else:
+                self.misses += 1
+        return entry
+    
+    def store(self, key: str, body: Dict[str, Any], headers: Optional[Mapping[str, str]] = None) -> None:
+        """
+        Store a response body with the validators of its headers
+        
+        Args:
+            key: Cache key from key_for()
+            body: Parsed response body
+            headers: Response headers, used for ETag and Last-Modified
+        """
+        headers = headers or {}
+        ttl = self.ttl_for(self._path_of(key))
+        entry = CacheEntry(body, time.time() + ttl, headers.get("ETag"), headers.get("Last-Modified"))
+        self.backend.set(key, entry.to_bytes(), ttl + (self.stale_ttl if entry.has_validators else 0))
+    
+    def revalidate(self, key: str, headers: Optional[Mapping[str, str]] = None) -> Optional[Dict[str, Any]]:
+        """
+        Mark the entry for key fresh again after a 304 Not Modified response
+        
+        Args:
+            key: Cache key from key_for()
+            headers: Headers of the 304 response, which may update the validators
+            
+        Returns:
+            The cached body, or None if the entry is gone
+        """
+        value = self.backend.get(key)
+        if value is None:
+            return None
+        
+        entry = CacheEntry.from_bytes(value)
+        headers = headers or {}
+        self.store(key, entry.body, {
+            "ETag": headers.get("ETag") or entry.etag,
+            "Last-Modified": headers.get("Last-Modified") or entry.last_modified
+        })
+        with self._lock:
+            self.revalidations += 1
+        return entry.body
+    
+    def get(
+        self,
+        endpoint: str,
+        params: Optional[Dict[str, Any]] = None,
+        scope: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Get the cached response of a GET request, if fresh"""
+        key = self.key_for(endpoint, params, scope)
+        entry = self.lookup(key) if key is not None else None
+        return entry.body if entry is not None and entry.is_fresh else None
+    
+    def set(
+        self,
+        endpoint: str,
+        params: Optional[Dict[str, Any]],
+        response: Dict[str, Any],
+        scope: Optional[str] = None
+    ) -> None:
+        """Store the response of a GET request"""
+        key = self.key_for(endpoint, params, scope)
+        if key is not None:
+            self.store(key, response)
+    
+    def invalidate(self, endpoint: str, scope: Optional[str] = None) -> None:
+        """Drop every cached response of the resource endpoint belongs to within scope"""
+        self.backend.delete_prefix(self._scoped(f"{self.resource_for(endpoint)}/", scope))
+    
+    def clear(self) -> None:
+        """Drop every cached response"""
+        self.backend.clear()
+    
+    def stats(self) -> Dict[str, Any]:
+        """Get hit/miss/revalidation counters and backend statistics for monitoring"""
+        with self._lock:
+            stats = {"hits": self.hits, "misses": self.misses, "revalidations": self.revalidations}
+        stats.update(self.backend.stats())
+        return stats
@@ -2,9 +2,54 @@
 Main Koywe API client
 """
 
-from typing import Optional
+from typing import Any, Optional, Dict, Union
 from .auth import AuthHandler
+from .retry import RetryPolicy
+from .ratelimit import RateLimiter
+from .concurrency import AdaptiveConcurrencyLimiter
+from .mirror import DocumentMirror
+from .cache import ResponseCache
+from .coalesce import RequestCoalescer
+from .idempotency import IdempotencyLedger
+from .codec import JSONCodec, get_codec
+from .refresher import TokenRefresher
+from .token_store import TokenStore
 from .endpoints import DocumentsEndpoint, AccountsEndpoint
+from .session import (
+    create_session,
+    DEFAULT_POOL_CONNECTIONS,
+    DEFAULT_POOL_MAXSIZE,
+    DEFAULT_KEEPALIVE_EXPIRY
+)
+
+
+# Default of the retry_policy argument, telling "not given" apart from None
+_DEFAULT_RETRY_POLICY: Any = object()
+
+
+def _environment_settings() -> Dict[str, str]:
+    """Read the client credentials from the KOYWE_* environment variables"""
+    import os
+    
+    client_id = os.getenv('KOYWE_CLIENT_ID')
+    client_secret = os.getenv('KOYWE_CLIENT_SECRET')
+    username = os.getenv('KOYWE_USERNAME')
+    password = os.getenv('KOYWE_PASSWORD')
+    base_url = os.getenv('KOYWE_BASE_URL', 'https://api-billing.koywe.com/V1')
+    
+    if not all([client_id, client_secret, username, password]):
+        raise ValueError(
+            "Missing required environment variables. Please set: "
+            "KOYWE_CLIENT_ID, KOYWE_CLIENT_SECRET, KOYWE_USERNAME, KOYWE_PASSWORD"
+        )
+        
+    return {
+        "client_id": client_id,
+        "client_secret": client_secret,
+        "username": username,
+        "password": password,
+        "base_url": base_url
+    }
 
 
 class KoyweClient:
@@ -17,7 +62,21 @@ class KoyweClient:
         username: str,
         password: str,
         base_url: str = "https://api-billing.koywe.com/V1",
-        auto_authenticate: bool = True
+        auto_authenticate: bool = True,
+        pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        keepalive_expiry: Optional[float] = DEFAULT_KEEPALIVE_EXPIRY,
+        retry_policy: Optional[RetryPolicy] = _DEFAULT_RETRY_POLICY,
+        background_refresh: bool = False,
+        refresh_fraction: float = 0.75,
+        token_store: Optional[TokenStore] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        concurrency_limiter: Optional[AdaptiveConcurrencyLimiter] = None,
+        mirror: Optional[DocumentMirror] = None,
+        cache: Optional[ResponseCache] = None,
+        coalesce_requests: bool = False,
+        idempotency_ledger: Optional[IdempotencyLedger] = None,
+        json_codec: Optional[Union[str, JSONCodec]] = None
     ):
         """
         Initialize the Koywe API client
@@ -29,8 +88,44 @@ class KoyweClient:
             password: Your API password
             base_url: Base URL for the API (default: production)
             auto_authenticate: Whether to authenticate immediately (default: True)
+            pool_connections: Number of per-host connection pools to keep (default: 10)
+            pool_maxsize: Maximum keep-alive connections per host (default: 10)
+            keepalive_expiry: Seconds an idle connection may be reused (default: 60)
+            retry_policy: Retry policy for failed requests, or None to send every
+                request once (default: RetryPolicy())
+            rate_limiter: Client-side request rate limiter (default: None)
+            concurrency_limiter: Adaptive cap on in-flight requests (default: None)
+            mirror: Local document mirror kept current by document writes (default: None)
+            cache: Read cache for single documents and accounts (default: None)
+            coalesce_requests: Let concurrent identical GET requests share one
+                network call (default: False)
+            idempotency_ledger: Ledger recording the outcome of document
+                creations by idempotency key, so that a create is not posted
+                twice (default: None)
+            json_codec: JSON codec for request and response bodies, or its name:
+                "orjson", "ujson" or "json" (default: the fastest one installed)
+            background_refresh: Renew the token in a background thread (default: False)
+            refresh_fraction: Fraction of the token lifetime after which the
+                background thread renews it (default: 0.75)
+            token_store: Store for sharing tokens with other clients and
+                processes using the same credentials (default: None)
         """
         self.base_url = base_url.rstrip('/')
+        self.retry_policy = RetryPolicy() if retry_policy is _DEFAULT_RETRY_POLICY else retry_policy
+        self.rate_limiter = rate_limiter
+        self.concurrency_limiter = concurrency_limiter
+        self.mirror = mirror
+        self.cache = cache
+        self.coalescer = RequestCoalescer() if coalesce_requests else None
+        self.idempotency_ledger = idempotency_ledger
+        self.json_codec = get_codec(json_codec)
+        
+        # Shared connection pool for authentication and all endpoints
+        self.session = create_session(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            keepalive_expiry=keepalive_expiry
+        )
         
         # Initialize authentication handler
         self.auth_handler = AuthHandler(
@@ -38,16 +133,24 @@ class KoyweClient:
             client_secret=client_secret,
             username=username,
             password=password,
-            base_url=self.base_url
+            base_url=self.base_url,
+            session=self.session,
+            token_store=token_store
         )
         
         # Initialize endpoint handlers
         self.documents = DocumentsEndpoint(self)
         self.accounts = AccountsEndpoint(self)
         
-        # Authenticate if requested
+        # Authenticate if requested, reusing a shared token when one is stored
         if auto_authenticate:
-            self.authenticate()
+            self.auth_handler.ensure_authenticated()
+            
+        # Keep the token fresh off the request path if requested
+        self.token_refresher: Optional[TokenRefresher] = None
+        if background_refresh:
+            self.token_refresher = TokenRefresher(self.auth_handler, refresh_fraction=refresh_fraction)
+            self.token_refresher.start()
     
     def authenticate(self) -> None:
         """Authenticate with the Koywe API"""
@@ -61,8 +164,20 @@ class KoyweClient:
         """Clear stored authentication tokens"""
         self.auth_handler.clear_tokens()
     
+    def close(self) -> None:
+        """Stop the background token refresher and close the connection pool"""
+        if self.token_refresher is not None:
+            self.token_refresher.stop()
+        self.session.close()
+    
+    def __enter__(self) -> 'KoyweClient':
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+    
     @classmethod
-    def from_environment(cls, auto_authenticate: bool = True) -> 'KoyweClient':
+    def from_environment(cls, auto_authenticate: bool = True, **kwargs) -> 'KoyweClient':
         """
         Create a client instance using environment variables
         
@@ -75,30 +190,14 @@ class KoyweClient:
         
         Args:
             auto_authenticate: Whether to authenticate immediately
+            **kwargs: Additional client options (pooling, etc.)
             
         Returns:
             KoyweClient instance
         """
-        import os
-        
-        client_id = os.getenv('KOYWE_CLIENT_ID')
-        client_secret = os.getenv('KOYWE_CLIENT_SECRET')
-        username = os.getenv('KOYWE_USERNAME')
-        password = os.getenv('KOYWE_PASSWORD')
-        base_url = os.getenv('KOYWE_BASE_URL', 'https://api-billing.koywe.com/V1')
-        
-        if not all([client_id, client_secret, username, password]):
-            raise ValueError(
-                "Missing required environment variables. Please set: "
-                "KOYWE_CLIENT_ID, KOYWE_CLIENT_SECRET, KOYWE_USERNAME, KOYWE_PASSWORD"
-            )
-        
         return cls(
-            client_id=client_id,
-            client_secret=client_secret,
-            username=username,
-            password=password,
-            base_url=base_url,
-            auto_authenticate=auto_authenticate
+            auto_authenticate=auto_authenticate,
+            **_environment_settings(),
+            **kwargs
         )
 
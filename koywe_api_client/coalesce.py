@@ -0,0 +1,177 @@
+"""
+Coalescing of concurrent identical requests
+"""
+
+import asyncio
+import copy
+import threading
+from typing import Dict, Any, Optional, Callable, Awaitable, Tuple, TypeVar
+from urllib.parse import urlencode
+
+
+T = TypeVar("T")
+
+
+class _Call:
+    """A request in flight, awaited by every caller that asked for it"""
+    
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+
+
+class _AsyncCall:
+    """A request in flight on an event loop, run as a task of its own"""
+    
+    def __init__(self, task: "asyncio.Future"):
+        self.task = task
+        self.result: Any = None
+        self.waiters = 0
+        # Callers still awaiting the task, the leader included
+        self.awaiting = 1
+
+
+class RequestCoalescer:
+    """
+    Lets concurrent identical requests share one network call
+    
+    The first caller for a key makes the call; callers arriving while it
+    is in flight wait for it and receive a copy of its result, or the same
+    exception. Threads are coalesced with each other, and so are asyncio
+    tasks; an asyncio call runs as a task of its own, so that cancelling
+    one caller does not cancel it for the others. A coalescer belongs to a single client, since results are
+    shared without regard to credentials.
+    """
+    
+    def __init__(self):
+        self._calls: Dict[str, _Call] = {}
+        self._async_calls: Dict[Tuple["asyncio.AbstractEventLoop", str], _AsyncCall] = {}
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.coalesced = 0
+    
+    @staticmethod
+    def key_for(endpoint: str, params: Optional[Dict[str, Any]] = None) -> str:
+        """Build the key identifying a GET request"""
+        key = endpoint.strip('/')
+        if params:
+            key += "?" + urlencode(sorted(params.items()))
+        return key
+    
+    def stats(self) -> Dict[str, int]:
+        """Get the number of network calls made and of calls saved by coalescing"""
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "coalesced": self.coalesced,
+                "in_flight": len(self._calls) + len(self._async_calls)
+            }
+    
+    def do(self, key: str, func: Callable[[], T]) -> T:
+        """
+        Call func, or wait for the identical call already in flight
+        
+        Args:
+            key: Identifies the request, e.g. from key_for()
+            func: Makes the request
+            
+        Returns:
+            The result of the call
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.calls += 1
+            else:
+                call.waiters += 1
+                self.coalesced += 1
+                
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            # Each caller gets its own copy, so one may modify it safely
+            return copy.deepcopy(call.result)
+        
+        result = None
+        try:
+            result = func()
+            return result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+                # No caller can join once the call is removed, so this count is final
+                waiters = call.waiters
+            if waiters and call.error is None:
+                call.result = copy.deepcopy(result)
+            call.done.set()
+    
+    async def do_async(self, key: str, func: Callable[[], Awaitable[T]]) -> T:
+        """
+        Await func(), or wait for the identical call already in flight
+        
+        Args:
+            key: Identifies the request, e.g. from key_for()
+            func: Returns an awaitable making the request
+            
+        Returns:
+            The result of the call
+        """
+        loop = asyncio.get_running_loop()
+        # Tasks cannot be awaited across event loops, so calls are coalesced per loop
+        slot = (loop, key)
+        with self._lock:
+            call = self._async_calls.get(slot)
+            if call is not None:
+                call.waiters += 1
+                call.awaiting += 1
+                self.coalesced += 1
+                
+        leader = call is None
+        if leader:
+            # Only tasks of this loop use the slot, and none runs before the next await
+            call = _AsyncCall(asyncio.ensure_future(func()))
+            call.task.add_done_callback(lambda task: self._finish_async(slot, call))
+            with self._lock:
+                self._async_calls[slot] = call
+                self.calls += 1
+                
+        # The call runs as its own task, so cancelling one caller leaves the others waiting
+        try:
+            result = await asyncio.shield(call.task)
+        except asyncio.CancelledError:
+            if not call.task.done():
+                call.awaiting -= 1
+                if not call.awaiting:
+                    # Nobody waits for the call any more; later callers start a new one
+                    self._remove_async(slot, call)
+                    call.task.cancel()
+            raise
+        
+        if leader:
+            return result
+        # Each caller gets its own copy, so one may modify it safely
+        return copy.deepcopy(call.result)
+    
+    def _finish_async(self, slot: Tuple["asyncio.AbstractEventLoop", str], call: _AsyncCall) -> None:
+        """Remove a finished call, keeping a copy of its result for the callers that joined it"""
+        self._remove_async(slot, call)
+        # No caller can join once the call is removed, so this count is final
+        waiters = call.waiters
+        if call.task.cancelled():
+            return
+        # Retrieve the exception even when nobody awaits the call any more
+        if call.task.exception() is None and waiters:
+            call.result = copy.deepcopy(call.task.result())
+    
+    def _remove_async(self, slot: Tuple["asyncio.AbstractEventLoop", str], call: _AsyncCall) -> None:
+        with self._lock:
+            if self._async_calls.get(slot) is call:
+                del self._async_calls[slot]
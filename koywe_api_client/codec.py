@@ -0,0 +1,156 @@
+"""
+Pluggable JSON codecs for request and response bodies
+"""
+
+import json
+import re
+import secrets
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Any, Optional, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+try:
+    import ujson
+except ImportError:  # pragma: no cover - optional dependency
+    ujson = None
+
+
+# The json module writes Decimal values as strings starting with this mark,
+# which are then unquoted into numbers; the random part keeps data from
+# producing it
+_NUMBER_MARK = f"\x00{secrets.token_hex(8)}:"
+_MARKED_NUMBER = re.compile('"' + re.escape("\\u0000" + _NUMBER_MARK[1:]) + '([^"]*)"')
+
+
+def decimal_number(value: Decimal) -> str:
+    """
+    Write a Decimal as a JSON number in plain notation, e.g. 10.10
+    
+    The number keeps the exact digits of the Decimal, which a float would
+    round.
+    
+    Raises:
+        ValueError: If the value is NaN or infinite, which JSON cannot represent
+    """
+    if not value.is_finite():
+        raise ValueError(f"Decimal {value} is not a valid JSON number")
+    return format(value, "f")
+
+
+def encode_default(value: Any) -> Any:
+    """Convert dates, datetimes and times, which JSON has no type for, to ISO 8601 strings"""
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return _NUMBER_MARK + decimal_number(value)
+    return encode_default(value)
+
+
+def _orjson_default(value: Any) -> Any:
+    if isinstance(value, Decimal) and hasattr(orjson, "Fragment"):
+        return orjson.Fragment(decimal_number(value))
+    return encode_default(value)
+
+
+class JSONCodec:
+    """Codec using the standard library json module"""
+    
+    name = "json"
+    
+    def dumps(self, obj: Any) -> bytes:
+        """Encode an object to UTF-8 JSON bytes, writing Decimal values as exact numbers"""
+        text = json.dumps(obj, default=_json_default, ensure_ascii=False, separators=(",", ":"))
+        if _NUMBER_MARK[1:] in text:
+            text = _MARKED_NUMBER.sub(r"\1", text)
+        return text.encode("utf-8")
+    
+    def loads(self, data: Union[bytes, str]) -> Any:
+        """Decode JSON bytes or text, raising ValueError when it is invalid"""
+        return json.loads(data)
+    
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}()"
+
+
+class OrjsonCodec(JSONCodec):
+    """Codec using orjson"""
+    
+    name = "orjson"
+    
+    def __init__(self):
+        if orjson is None:
+            raise ImportError("OrjsonCodec requires orjson. Install it with: pip install orjson")
+    
+    def dumps(self, obj: Any) -> bytes:
+        try:
+            return orjson.dumps(obj, default=_orjson_default, option=orjson.OPT_NON_STR_KEYS)
+        except orjson.JSONEncodeError:
+            if hasattr(orjson, "Fragment"):
+                raise
+            # orjson before 3.9 cannot write a Decimal as a number; the json module can
+            return super().dumps(obj)
+    
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return orjson.loads(data)
+
+
+class UjsonCodec(JSONCodec):
+    """
+    Codec using ujson
+    
+    ujson converts Decimal values to floats itself, so amounts with more
+    significant digits than a float holds are rounded; use orjson or json
+    for those.
+    """
+    
+    name = "ujson"
+    
+    def __init__(self):
+        if ujson is None:
+            raise ImportError("UjsonCodec requires ujson. Install it with: pip install ujson")
+    
+    def dumps(self, obj: Any) -> bytes:
+        return ujson.dumps(obj, default=encode_default, ensure_ascii=False).encode("utf-8")
+    
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return ujson.loads(data)
+
+
+CODECS = {
+    "orjson": OrjsonCodec,
+    "ujson": UjsonCodec,
+    "json": JSONCodec
+}
+
+
+def get_codec(codec: Optional[Union[str, JSONCodec]] = None) -> JSONCodec:
+    """
+    Get a JSON codec
+    
+    Args:
+        codec: A codec instance, or the name of one: "orjson", "ujson" or
+            "json" (default: the fastest one installed)
+            
+    Returns:
+        The codec
+    """
+    if isinstance(codec, JSONCodec):
+        return codec
+    if codec is None:
+        if orjson is not None:
+            return OrjsonCodec()
+        if ujson is not None:
+            return UjsonCodec()
+        return JSONCodec()
+    if codec not in CODECS:
+        raise ValueError(f"Unknown JSON codec {codec!r}; expected one of {', '.join(CODECS)}")
+    return CODECS[codec]()
@@ -0,0 +1,165 @@
+"""
+Adaptive (AIMD) concurrency limiting for Koywe API requests
+"""
+
+import asyncio
+import threading
+import time
+from collections import deque
+from typing import Dict, Any, Optional
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    Caps the number of in-flight requests and adapts the cap to the API
+    
+    The limit grows additively while latency stays near the best observed
+    latency, and is cut multiplicatively when the API signals overload
+    (429, 5xx or timeouts). One limiter may be shared by threads and by
+    asyncio tasks on any number of event loops.
+    """
+    
+    def __init__(
+        self,
+        initial_limit: int = 8,
+        min_limit: int = 1,
+        max_limit: int = 64,
+        backoff_ratio: float = 0.5,
+        latency_tolerance: float = 2.0
+    ):
+        """
+        Initialize the limiter
+        
+        Args:
+            initial_limit: In-flight requests allowed at start (default: 8)
+            min_limit: Lower bound for the limit (default: 1)
+            max_limit: Upper bound for the limit (default: 64)
+            backoff_ratio: Factor applied to the limit on overload (default: 0.5)
+            latency_tolerance: Latency, as a multiple of the best observed one,
+                up to which the limit keeps growing (default: 2.0)
+        """
+        if not 1 <= min_limit <= initial_limit <= max_limit:
+            raise ValueError("Expected 1 <= min_limit <= initial_limit <= max_limit")
+        if not 0 < backoff_ratio < 1:
+            raise ValueError("backoff_ratio must be between 0 and 1")
+        
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff_ratio = backoff_ratio
+        self.latency_tolerance = latency_tolerance
+        
+        self._limit = float(initial_limit)
+        self._in_flight = 0
+        self._min_latency: Optional[float] = None
+        self._last_backoff = 0.0
+        self._successes = 0
+        self._overloads = 0
+        
+        self._lock = threading.Lock()
+        self._condition = threading.Condition(self._lock)
+        self._async_waiters = deque()
+    
+    @property
+    def limit(self) -> int:
+        """Current number of requests allowed in flight"""
+        return int(self._limit)
+    
+    @property
+    def in_flight(self) -> int:
+        """Number of requests currently in flight"""
+        return self._in_flight
+    
+    def stats(self) -> Dict[str, Any]:
+        """Get a snapshot of the limiter state for monitoring"""
+        with self._lock:
+            return {
+                "limit": int(self._limit),
+                "in_flight": self._in_flight,
+                "min_latency": self._min_latency,
+                "successes": self._successes,
+                "overloads": self._overloads
+            }
+    
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until a request may be sent
+        
+        Args:
+            timeout: Maximum seconds to wait (default: no limit)
+            
+        Returns:
+            True if a slot was taken, False on timeout
+        """
+        with self._condition:
+            if not self._condition.wait_for(lambda: self._in_flight < int(self._limit), timeout):
+                return False
+            self._in_flight += 1
+            return True
+    
+    async def acquire_async(self) -> None:
+        """Wait without blocking the event loop until a request may be sent"""
+        loop = asyncio.get_running_loop()
+        
+        while True:
+            with self._lock:
+                if self._in_flight < int(self._limit):
+                    self._in_flight += 1
+                    return
+                waiter = loop.create_future()
+                self._async_waiters.append((loop, waiter))
+                
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                # Pass a wake-up this task may have consumed on to another waiter
+                with self._lock:
+                    self._notify()
+                raise
+    
+    def release(self, latency: float, overloaded: bool = False) -> None:
+        """
+        Give back a slot and feed the outcome of the request into the limit
+        
+        Args:
+            latency: Seconds the request took
+            overloaded: Whether the API signalled overload (429, 5xx, timeout)
+        """
+        with self._lock:
+            in_flight = self._in_flight
+            self._in_flight -= 1
+            
+            if overloaded:
+                self._overloads += 1
+                now = time.monotonic()
+                # Cut at most once per round trip, since one burst fails many requests
+                if now - self._last_backoff > (self._min_latency or 0.0):
+                    self._limit = max(self.min_limit, self._limit * self.backoff_ratio)
+                    self._last_backoff = now
+            else:
+                self._successes += 1
+                if self._min_latency is None or latency < self._min_latency:
+                    self._min_latency = latency
+                    
+                latency_stable = latency <= self._min_latency * self.latency_tolerance
+                # Only grow when the current limit is actually being used
+                if latency_stable and in_flight * 2 >= int(self._limit):
+                    self._limit = min(self.max_limit, self._limit + 1 / self._limit)
+                    
+            self._notify()
+    
+    def _notify(self) -> None:
+        """Wake waiters for the free slots; the caller must hold the lock"""
+        self._condition.notify_all()
+        
+        free = int(self._limit) - self._in_flight
+        while free > 0 and self._async_waiters:
+            loop, waiter = self._async_waiters.popleft()
+            if waiter.done():
+                continue
+            loop.call_soon_threadsafe(self._wake, waiter)
+            free -= 1
+    
+    @staticmethod
+    def _wake(waiter: "asyncio.Future") -> None:
+        if not waiter.done():
+            waiter.set_result(None)
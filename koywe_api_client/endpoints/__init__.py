@@ -4,6 +4,13 @@ API endpoint modules
 
 from .documents import DocumentsEndpoint
 from .accounts import AccountsEndpoint
+from .async_documents import AsyncDocumentsEndpoint
+from .async_accounts import AsyncAccountsEndpoint
 
-__all__ = ["DocumentsEndpoint", "AccountsEndpoint"]
+__all__ = [
+    "DocumentsEndpoint",
+    "AccountsEndpoint",
+    "AsyncDocumentsEndpoint",
+    "AsyncAccountsEndpoint"
+]
 
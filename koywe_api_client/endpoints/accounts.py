@@ -60,7 +60,31 @@ class AccountsEndpoint(BaseEndpoint):
         Returns:
             Dict containing created account details
         """
+        account_data = self._build_business_account_data(
+            business_name=business_name,
+            tax_id=tax_id,
+            address=address,
+            city=city,
+            country_id=country_id,
+            email=email,
+            phone=phone,
+            additional_info=additional_info
+        )
         
+        return self.create(account_data)
+    
+    @staticmethod
+    def _build_business_account_data(
+        business_name: str,
+        tax_id: str,
+        address: str,
+        city: str,
+        country_id: int,
+        email: str,
+        phone: Optional[str] = None,
+        additional_info: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Build the account payload for a business account"""
         account_data = {
             "name": business_name,
             "tax_id": tax_id,
@@ -75,6 +99,6 @@ class AccountsEndpoint(BaseEndpoint):
         
         if additional_info:
             account_data.update(additional_info)
-        
-        return self.create(account_data)
+            
+        return account_data
 
@@ -0,0 +1,67 @@
+"""
+Asynchronous accounts endpoint
+"""
+
+from typing import Dict, Any, Optional
+from .async_base import AsyncBaseEndpoint
+from .accounts import AccountsEndpoint
+
+
+class AsyncAccountsEndpoint(AsyncBaseEndpoint):
+    """Handles account operations for the asynchronous client"""
+    
+    async def get(self, account_id: int) -> Dict[str, Any]:
+        """
+        Get a specific account by ID
+        
+        Args:
+            account_id: The account ID
+            
+        Returns:
+            Dict containing account details
+        """
+        return await super().get(f"accounts/{account_id}")
+    
+    async def create(self, account_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Create a new account
+        
+        Args:
+            account_data: Account data including name, address, tax info, etc.
+            
+        Returns:
+            Dict containing created account details
+        """
+        return await self.post("accounts", data=account_data)
+    
+    async def create_business_account(
+        self,
+        business_name: str,
+        tax_id: str,
+        address: str,
+        city: str,
+        country_id: int,
+        email: str,
+        phone: Optional[str] = None,
+        additional_info: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Helper method to create a business account
+        
+        See AccountsEndpoint.create_business_account for the arguments.
+        
+        Returns:
+            Dict containing created account details
+        """
+        account_data = AccountsEndpoint._build_business_account_data(
+            business_name=business_name,
+            tax_id=tax_id,
+            address=address,
+            city=city,
+            country_id=country_id,
+            email=email,
+            phone=phone,
+            additional_info=additional_info
+        )
+        
+        return await self.create(account_data)
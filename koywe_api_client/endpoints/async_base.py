@@ -0,0 +1,254 @@
+"""
+Base endpoint class for the asynchronous client
+"""
+
+import asyncio
+import inspect
+import time
+from typing import Dict, Any, Optional, List, Callable, AsyncIterator, Union
+from .base import BaseEndpoint
+from ..exceptions import KoyweAPIError, NetworkError, RequestTimeoutError
+from ..pagination import list_metadata, page_items
+from ..retry import RetryAttempt
+from ..streaming import ItemStreamParser
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - optional dependency
+    httpx = None
+
+
+class AsyncBaseEndpoint(BaseEndpoint):
+    """Base class for all asynchronous API endpoints"""
+    
+    async def _make_request(
+        self,
+        method: str,
+        endpoint: str,
+        data: Optional[Dict[str, Any]] = None,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        cache_key: Optional[str] = None,
+        recover: Optional[Callable[[], Any]] = None,
+        stream: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Make an authenticated HTTP request to the API, retrying per the client's retry policy
+        
+        See BaseEndpoint._make_request; recover may also be a coroutine function.
+        """
+        
+        attempts: List[RetryAttempt] = []
+        attempt = 1
+        # Only a request whose earlier attempts are checked before a retry is safe to send again
+        idempotent = recover is not None
+        
+        while True:
+            try:
+                return await self._send(
+                    method, endpoint, data=data, params=params, headers=headers, cache_key=cache_key, stream=stream
+                )
+            except KoyweAPIError as e:
+                delay = self._get_retry_delay(method, e, attempt, attempts, idempotent=idempotent)
+                if delay is None:
+                    raise
+            
+            await asyncio.sleep(delay)
+            attempt += 1
+            
+            if recover is not None:
+                recovered = recover()
+                if inspect.isawaitable(recovered):
+                    recovered = await recovered
+                if recovered is not None:
+                    return recovered
+    
+    async def _send(
+        self,
+        method: str,
+        endpoint: str,
+        data: Optional[Dict[str, Any]] = None,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        cache_key: Optional[str] = None,
+        stream: bool = False
+    ) -> Union[Dict[str, Any], "httpx.Response"]:
+        """
+        Make a single authenticated HTTP request attempt
+        
+        See BaseEndpoint._send.
+        """
+        
+        # Get authentication headers
+        auth_headers = await self.auth_handler.get_auth_headers()
+        request_headers = self._build_headers(auth_headers, headers)
+        
+        response = await self._perform_request(method, endpoint, data, params, request_headers, stream=stream)
+        
+        if response.status_code == 401:
+            # The token was revoked or expired early; refresh it and replay
+            if stream:
+                await response.aclose()
+            await self.auth_handler.refresh_access_token(stale_headers=auth_headers)
+            auth_headers = await self.auth_handler.get_auth_headers()
+            request_headers = self._build_headers(auth_headers, headers)
+            response = await self._perform_request(method, endpoint, data, params, request_headers, stream=stream)
+            if response.status_code == 401:
+                # Rejected again: drop the token unless another task replaced it meanwhile
+                await self.auth_handler.discard_tokens(auth_headers)
+                
+        if response.status_code == 304 and cache_key is not None:
+            cached = self.client.cache.revalidate(cache_key, response.headers)
+            if cached is not None:
+                return cached
+            # The entry expired or was evicted while the request was in flight
+            request_headers = self._build_headers(auth_headers, self._unconditional(headers))
+            response = await self._perform_request(method, endpoint, data, params, request_headers, stream=stream)
+            
+        if stream:
+            if response.status_code == 200:
+                return response
+            # Read the body of an error response before handling it
+            await response.aread()
+        return self._handle_response(response, cache_key=cache_key)
+    
+    async def _perform_request(
+        self,
+        method: str,
+        endpoint: str,
+        data: Optional[Dict[str, Any]],
+        params: Optional[Dict[str, Any]],
+        headers: Dict[str, str],
+        stream: bool = False
+    ) -> "httpx.Response":
+        """Send the HTTP request under the configured rate and concurrency limits"""
+        if self.client.rate_limiter is not None:
+            # Wait for budget rather than send a request bound to get a 429
+            await self.client.rate_limiter.acquire_async(endpoint)
+            
+        limiter = self.client.concurrency_limiter
+        if limiter is None:
+            return await self._transport(method, endpoint, data, params, headers, stream=stream)
+        
+        await limiter.acquire_async()
+        started = time.monotonic()
+        overloaded = False
+        try:
+            response = await self._transport(method, endpoint, data, params, headers, stream=stream)
+            overloaded = response.status_code == 429 or response.status_code >= 500
+            return response
+        except RequestTimeoutError:
+            overloaded = True
+            raise
+        finally:
+            limiter.release(time.monotonic() - started, overloaded=overloaded)
+    
+    async def _transport(
+        self,
+        method: str,
+        endpoint: str,
+        data: Optional[Dict[str, Any]],
+        params: Optional[Dict[str, Any]],
+        headers: Dict[str, str],
+        stream: bool = False
+    ) -> "httpx.Response":
+        """Send the HTTP request, translating transport failures into NetworkError"""
+        try:
+            request = self.session.build_request(
+                method=method,
+                url=self._build_url(endpoint),
+                content=self.client.json_codec.dumps(data) if data is not None else None,
+                params=params,
+                headers=headers
+            )
+            return await self.session.send(request, stream=stream)
+        
+        except httpx.TimeoutException:
+            raise RequestTimeoutError("Request timed out")
+        except httpx.NetworkError:
+            raise NetworkError("Connection error occurred")
+        except httpx.HTTPError as e:
+            raise NetworkError(f"Network error: {str(e)}")
+    
+    async def _iter_list_items(
+        self,
+        endpoint: str,
+        params: Optional[Dict[str, Any]] = None,
+        chunk_size: int = 64 * 1024,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        GET a list endpoint and yield the items of its data array as the body arrives
+        
+        See BaseEndpoint._iter_list_items.
+        """
+        response = await self._make_request("GET", endpoint, params=params, stream=True)
+        if isinstance(response, dict):
+            # A success other than 200, already read
+            if metadata is not None:
+                metadata.update(list_metadata(response))
+            for item in page_items(response):
+                yield item
+            return
+        
+        parser = ItemStreamParser()
+        try:
+            async for chunk in response.aiter_bytes(chunk_size):
+                for item in parser.feed(chunk):
+                    yield item
+            for item in parser.close():
+                yield item
+            if metadata is not None:
+                metadata.update(parser.metadata)
+        except httpx.TimeoutException:
+            raise RequestTimeoutError("Request timed out")
+        except httpx.HTTPError as e:
+            raise NetworkError(f"Network error: {str(e)}")
+        except ValueError as e:
+            raise KoyweAPIError(f"Invalid JSON response: {str(e)}", status_code=response.status_code)
+        finally:
+            await response.aclose()
+    
+    async def get(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Make a GET request
+        
+        The request is answered or revalidated from the client's response
+        cache when possible, and shares the network call of an identical
+        request already in flight when the client coalesces requests.
+        """
+        cache = self.client.cache
+        cache_key = cache.key_for(endpoint, params, scope=self.auth_handler.token_key) if cache is not None else None
+        headers = None
+        if cache_key is not None:
+            entry = cache.lookup(cache_key)
+            if entry is not None and entry.is_fresh:
+                return entry.body
+            # Revalidate a stale entry instead of downloading it again
+            headers = entry.conditional_headers() if entry is not None else None
+        
+        def request():
+            return self._make_request("GET", endpoint, params=params, headers=headers, cache_key=cache_key)
+        
+        coalescer = self.client.coalescer
+        if coalescer is None:
+            return await request()
+        return await coalescer.do_async(coalescer.key_for(endpoint, params), request)
+    
+    async def post(self, endpoint: str, data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Make a POST request"""
+        result = await self._make_request("POST", endpoint, data=data)
+        self._invalidate_cache(endpoint)
+        return result
+    
+    async def put(self, endpoint: str, data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Make a PUT request"""
+        result = await self._make_request("PUT", endpoint, data=data)
+        self._invalidate_cache(endpoint)
+        return result
+    
+    async def delete(self, endpoint: str) -> Dict[str, Any]:
+        """Make a DELETE request"""
+        result = await self._make_request("DELETE", endpoint)
+        self._invalidate_cache(endpoint)
+        return result
@@ -0,0 +1,376 @@
+"""
+Asynchronous documents endpoint
+"""
+
+import asyncio
+import functools
+import inspect
+from typing import Dict, Any, Optional, List, Iterable, AsyncIterator, Tuple, Union, Callable
+from .async_base import AsyncBaseEndpoint
+from .documents import DocumentsEndpoint
+from ..bulk import BulkResult, ProgressCallback, aiter_bulk, run_bulk_async
+from ..exceptions import KoyweAPIError
+from ..idempotency import IDEMPOTENCY_HEADER, LEDGER, LOOKUP, create_steps
+from ..pagination import aiter_pages, aiter_pages_parallel, is_last_page, page_items
+
+
+class AsyncDocumentsEndpoint(AsyncBaseEndpoint):
+    """Handles document/invoice operations for the asynchronous client"""
+    
+    async def list(
+        self,
+        page: int = 1,
+        limit: int = 10,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Get a paginated list of documents
+        
+        Use iter_page() to process the documents as the response arrives.
+        
+        Args:
+            page: Page number (default: 1)
+            limit: Number of items per page (default: 10)
+            filters: Additional filters to apply
+            
+        Returns:
+            Dict containing documents list and pagination info
+        """
+        params = DocumentsEndpoint._build_list_params(page, limit, filters)
+        return await super().get("documents", params=params)
+    
+    async def iter_page(
+        self,
+        page: int = 1,
+        limit: int = 10,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Iterate over the documents of one page as the response arrives
+        
+        See DocumentsEndpoint.iter_page for the arguments.
+        
+        Yields:
+            Document dicts, one at a time
+        """
+        params = DocumentsEndpoint._build_list_params(page, limit, filters)
+        async for document in self._iter_list_items("documents", params=params):
+            yield document
+    
+    async def iter_all(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        page_size: int = 100,
+        prefetch: int = 1,
+        stream: bool = False
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Iterate over all documents, fetching upcoming pages as background tasks
+        
+        See DocumentsEndpoint.iter_all for the arguments.
+        
+        Yields:
+            Document dicts, one at a time
+        """
+        if stream:
+            page = 1
+            items_seen = 0
+            while True:
+                params = DocumentsEndpoint._build_list_params(page, page_size, filters)
+                metadata: Dict[str, Any] = {}
+                count = 0
+                async for document in self._iter_list_items("documents", params=params, metadata=metadata):
+                    count += 1
+                    yield document
+                items_seen += count
+                if is_last_page(metadata, page, page_size, items_seen, item_count=count):
+                    return
+                page += 1
+                
+        pages = aiter_pages(
+            lambda page: self.list(page=page, limit=page_size, filters=filters),
+            page_size,
+            prefetch=prefetch
+        )
+        async for response in pages:
+            for document in page_items(response):
+                yield document
+    
+    async def fetch_all(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        page_size: int = 100,
+        max_concurrency: int = 4
+    ) -> List[Dict[str, Any]]:
+        """
+        Fetch all documents, requesting pages concurrently
+        
+        See DocumentsEndpoint.fetch_all for the arguments.
+        
+        Returns:
+            List of all documents, in page order
+        """
+        pages = aiter_pages_parallel(
+            lambda page: self.list(page=page, limit=page_size, filters=filters),
+            page_size,
+            max_concurrency=max_concurrency
+        )
+        return [document async for response in pages for document in page_items(response)]
+    
+    async def get(self, document_id: int) -> Dict[str, Any]:
+        """
+        Get a specific document by ID
+        
+        Args:
+            document_id: The document ID
+            
+        Returns:
+            Dict containing document details
+        """
+        return await super().get(f"documents/{document_id}")
+    
+    async def iter_many(
+        self,
+        document_ids: Iterable[int],
+        max_concurrency: int = 8
+    ) -> AsyncIterator[Tuple[int, Union[Dict[str, Any], KoyweAPIError]]]:
+        """
+        Fetch many documents concurrently, yielding each as soon as it arrives
+        
+        See DocumentsEndpoint.iter_many for the arguments.
+        """
+        unique_ids = dict.fromkeys(document_ids)
+        async for result in aiter_bulk(self.get, unique_ids, max_concurrency=max_concurrency):
+            yield result.item, result.result if result.ok else result.error
+    
+    async def get_many(
+        self,
+        document_ids: Iterable[int],
+        max_concurrency: int = 8
+    ) -> Dict[int, Union[Dict[str, Any], KoyweAPIError]]:
+        """
+        Fetch many documents concurrently
+        
+        Use iter_many() to process documents as they arrive.
+        
+        Args:
+            document_ids: The document IDs; duplicates are fetched once
+            max_concurrency: Maximum number of concurrent requests (default: 8)
+            
+        Returns:
+            Dict mapping each document ID, in input order, to its document or
+            to the KoyweAPIError its fetch raised
+        """
+        unique_ids = list(dict.fromkeys(document_ids))
+        results = {
+            document_id: result
+            async for document_id, result in self.iter_many(unique_ids, max_concurrency=max_concurrency)
+        }
+        return {document_id: results[document_id] for document_id in unique_ids}
+    
+    async def create(
+        self,
+        document_data: Dict[str, Any],
+        generate_stamp: Optional[int] = None,
+        idempotency_key: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Create a new document/invoice
+        
+        See DocumentsEndpoint.create for the idempotency handling.
+        
+        Args:
+            document_data: Document data including header, details, totals, etc.
+            generate_stamp: Optional parameter to generate stamp
+            idempotency_key: Key identifying this document (default: derived
+                from the business reference when the client has an
+                idempotency ledger with a reference function)
+                
+        Returns:
+            Dict containing created document details
+        """
+        endpoint = DocumentsEndpoint._build_create_endpoint(generate_stamp)
+        if idempotency_key is None and self.client.idempotency_ledger is None:
+            result = await self.post(endpoint, data=document_data)
+        else:
+            result = await self._create_idempotent(endpoint, document_data, idempotency_key)
+            
+        if self.client.mirror is not None:
+            self.client.mirror.upsert(result)
+        return result
+    
+    async def _create_idempotent(
+        self,
+        endpoint: str,
+        document_data: Dict[str, Any],
+        idempotency_key: Optional[str]
+    ) -> Dict[str, Any]:
+        """Post a document with an idempotency key, consulting the ledger first"""
+        ledger = self.client.idempotency_ledger
+        if ledger is None:
+            return await self._post_idempotent(endpoint, document_data, idempotency_key)
+        
+        key = idempotency_key or ledger.key_for(endpoint, document_data)
+        if key is None:
+            return await self.post(endpoint, data=document_data)
+        
+        loop = asyncio.get_running_loop()
+        steps = create_steps(ledger, key, endpoint)
+        result: Any = None
+        error: Optional[KoyweAPIError] = None
+        while True:
+            try:
+                step = steps.throw(error) if error is not None else steps.send(result)
+            except StopIteration as stop:
+                return stop.value
+            
+            result, error = None, None
+            try:
+                if step[0] == LEDGER:
+                    # SQLite calls block, so they run in the loop's thread pool
+                    result = await loop.run_in_executor(None, functools.partial(step[1], *step[2:]))
+                elif step[0] == LOOKUP:
+                    result = await self._lookup(key, document_data)
+                else:
+                    recover = (lambda: self._lookup(key, document_data)) if step[1] else None
+                    result = await self._post_idempotent(endpoint, document_data, key, recover=recover)
+            except KoyweAPIError as e:
+                error = e
+    
+    async def _post_idempotent(
+        self,
+        endpoint: str,
+        document_data: Dict[str, Any],
+        key: str,
+        recover: Optional[Callable[[], Any]] = None
+    ) -> Dict[str, Any]:
+        """Post a document with the Idempotency-Key header, retried only when recover checks for it first"""
+        result = await self._make_request(
+            "POST", endpoint, data=document_data, headers={IDEMPOTENCY_HEADER: key}, recover=recover
+        )
+        self._invalidate_cache(endpoint)
+        return result
+    
+    async def _lookup(self, key: str, document_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Ask the ledger's lookup whether a document was created for this key"""
+        lookup = self.client.idempotency_ledger.lookup
+        if inspect.iscoroutinefunction(lookup):
+            return await lookup(key, document_data)
+        # A plain function may block, so it runs in the loop's thread pool
+        existing = await asyncio.get_running_loop().run_in_executor(None, lookup, key, document_data)
+        if inspect.isawaitable(existing):
+            existing = await existing
+        return existing
+    
+    async def update(self, document_id: int, document_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Update a specific document
+        
+        Args:
+            document_id: The document ID
+            document_data: Updated document data
+            
+        Returns:
+            Dict containing updated document details
+        """
+        result = await self.put(f"documents/{document_id}", data=document_data)
+        if self.client.mirror is not None:
+            self.client.mirror.merge(document_id, {**document_data, **(result or {})})
+        return result
+    
+    async def delete(self, document_id: int) -> Dict[str, Any]:
+        """
+        Delete a specific document
+        
+        Args:
+            document_id: The document ID
+            
+        Returns:
+            Dict containing deletion confirmation
+        """
+        result = await super().delete(f"documents/{document_id}")
+        if self.client.mirror is not None:
+            self.client.mirror.delete(document_id)
+        return result
+    
+    async def create_invoice(
+        self,
+        issuer_info: Dict[str, Any],
+        receiver_info: Dict[str, Any],
+        line_items: List[Dict[str, Any]],
+        currency_id: int = 1,
+        document_type_id: int = 1,
+        account_id: int = 1,
+        additional_options: Optional[Dict[str, Any]] = None,
+        idempotency_key: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Helper method to create a standard invoice
+        
+        See DocumentsEndpoint.create_invoice for the arguments.
+        
+        Returns:
+            Dict containing created invoice details
+        """
+        document_data = DocumentsEndpoint.build_invoice_data(
+            issuer_info=issuer_info,
+            receiver_info=receiver_info,
+            line_items=line_items,
+            currency_id=currency_id,
+            document_type_id=document_type_id,
+            account_id=account_id,
+            additional_options=additional_options
+        )
+        
+        return await self.create(document_data, idempotency_key=idempotency_key)
+    
+    async def create_many(
+        self,
+        documents: Iterable[Dict[str, Any]],
+        generate_stamp: Optional[int] = None,
+        max_concurrency: int = 8,
+        ordered: bool = True,
+        fail_fast: bool = False,
+        progress_callback: Optional[ProgressCallback] = None
+    ) -> List[BulkResult]:
+        """
+        Create many documents concurrently
+        
+        See DocumentsEndpoint.create_many for the arguments.
+        
+        Returns:
+            List of BulkResult holding the created document or the error per item
+        """
+        return await run_bulk_async(
+            lambda document_data: self.create(document_data, generate_stamp=generate_stamp),
+            documents,
+            max_concurrency=max_concurrency,
+            ordered=ordered,
+            fail_fast=fail_fast,
+            progress_callback=progress_callback
+        )
+    
+    async def create_invoices_bulk(
+        self,
+        invoices: Iterable[Dict[str, Any]],
+        max_concurrency: int = 8,
+        ordered: bool = True,
+        fail_fast: bool = False,
+        progress_callback: Optional[ProgressCallback] = None
+    ) -> List[BulkResult]:
+        """
+        Create many standard invoices concurrently
+        
+        See DocumentsEndpoint.create_invoices_bulk for the arguments.
+        
+        Returns:
+            List of BulkResult holding the created invoice or the error per item
+        """
+        return await run_bulk_async(
+            lambda invoice: self.create_invoice(**invoice),
+            invoices,
+            max_concurrency=max_concurrency,
+            ordered=ordered,
+            fail_fast=fail_fast,
+            progress_callback=progress_callback
+        )
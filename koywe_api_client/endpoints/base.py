@@ -2,7 +2,8 @@
 Base endpoint class with common functionality
 """
 
-from typing import Dict, Any, Optional, List, Union
+import time
+from typing import Dict, Any, Optional, List, Union, Callable, Iterator
 import requests
 from ..exceptions import (
     KoyweAPIError, 
@@ -11,8 +12,12 @@ from ..exceptions import (
     NotFoundError, 
     RateLimitError, 
     NetworkError,
+    RequestTimeoutError,
     ServerError
 )
+from ..pagination import list_metadata, page_items
+from ..retry import RetryAttempt
+from ..streaming import ItemStreamParser
 
 
 class BaseEndpoint:
@@ -22,6 +27,7 @@ class BaseEndpoint:
         self.client = client
         self.base_url = client.base_url
         self.auth_handler = client.auth_handler
+        self.session = client.session
     
     def _make_request(
         self, 
@@ -29,51 +35,267 @@ class BaseEndpoint:
         endpoint: str, 
         data: Optional[Dict[str, Any]] = None,
         params: Optional[Dict[str, Any]] = None,
-        headers: Optional[Dict[str, str]] = None
+        headers: Optional[Dict[str, str]] = None,
+        cache_key: Optional[str] = None,
+        recover: Optional[Callable[[], Optional[Dict[str, Any]]]] = None,
+        stream: bool = False
     ) -> Dict[str, Any]:
-        """Make an authenticated HTTP request to the API"""
+        """
+        Make an authenticated HTTP request to the API, retrying per the client's retry policy
+        
+        With recover, the request is retried whatever its method: before
+        each retry recover checks whether an earlier attempt did succeed and
+        returns its result, which is then returned instead of sending the
+        request again.
+        With stream, a 200 response is returned unread (see _send).
+        """
         
-        url = f"{self.base_url}/{endpoint.lstrip('/')}"
+        attempts: List[RetryAttempt] = []
+        attempt = 1
+        # Only a request whose earlier attempts are checked before a retry is safe to send again
+        idempotent = recover is not None
+        
+        while True:
+            try:
+                return self._send(
+                    method, endpoint, data=data, params=params, headers=headers, cache_key=cache_key, stream=stream
+                )
+            except KoyweAPIError as e:
+                delay = self._get_retry_delay(method, e, attempt, attempts, idempotent=idempotent)
+                if delay is None:
+                    raise
+            
+            time.sleep(delay)
+            attempt += 1
+            
+            if recover is not None:
+                recovered = recover()
+                if recovered is not None:
+                    return recovered
+    
+    def _send(
+        self, 
+        method: str, 
+        endpoint: str, 
+        data: Optional[Dict[str, Any]] = None,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        cache_key: Optional[str] = None,
+        stream: bool = False
+    ) -> Union[Dict[str, Any], requests.Response]:
+        """
+        Make a single authenticated HTTP request attempt
+        
+        A 401 response refreshes the access token and replays the request
+        exactly once before it is reported as an AuthenticationError. A 304
+        answering a revalidation is served from the cache, or the resource
+        is requested again without validators if the entry is gone. With
+        stream, a 200 response is returned before its body is read; the
+        caller must consume and close it.
+        """
         
         # Get authentication headers
         auth_headers = self.auth_handler.get_auth_headers()
+        request_headers = self._build_headers(auth_headers, headers)
         
-        # Merge headers
-        request_headers = {
-            "Content-Type": "application/json",
-            **auth_headers
-        }
-        if headers:
-            request_headers.update(headers)
+        response = self._perform_request(method, endpoint, data, params, request_headers, stream=stream)
+        
+        if response.status_code == 401:
+            # The token was revoked or expired early; refresh it and replay
+            if stream:
+                response.close()
+            self.auth_handler.refresh_access_token(stale_headers=auth_headers)
+            auth_headers = self.auth_handler.get_auth_headers()
+            request_headers = self._build_headers(auth_headers, headers)
+            response = self._perform_request(method, endpoint, data, params, request_headers, stream=stream)
+            if response.status_code == 401:
+                # Rejected again: drop the token unless another thread replaced it meanwhile
+                self.auth_handler.discard_tokens(auth_headers)
+                
+        if response.status_code == 304 and cache_key is not None:
+            cached = self.client.cache.revalidate(cache_key, response.headers)
+            if cached is not None:
+                return cached
+            # The entry expired or was evicted while the request was in flight
+            request_headers = self._build_headers(auth_headers, self._unconditional(headers))
+            response = self._perform_request(method, endpoint, data, params, request_headers, stream=stream)
+            
+        if stream and response.status_code == 200:
+            return response
+        return self._handle_response(response, cache_key=cache_key)
+    
+    def _perform_request(
+        self,
+        method: str,
+        endpoint: str,
+        data: Optional[Dict[str, Any]],
+        params: Optional[Dict[str, Any]],
+        headers: Dict[str, str],
+        stream: bool = False
+    ) -> requests.Response:
+        """
+        Send the HTTP request under the configured rate and concurrency limits
+        
+        A streamed response counts against the concurrency limit until its
+        headers arrive, not while its body is read.
+        """
+        if self.client.rate_limiter is not None:
+            # Wait for budget rather than send a request bound to get a 429
+            self.client.rate_limiter.acquire(endpoint)
+            
+        limiter = self.client.concurrency_limiter
+        if limiter is None:
+            return self._transport(method, endpoint, data, params, headers, stream=stream)
         
+        limiter.acquire()
+        started = time.monotonic()
+        overloaded = False
+        try:
+            response = self._transport(method, endpoint, data, params, headers, stream=stream)
+            overloaded = response.status_code == 429 or response.status_code >= 500
+            return response
+        except RequestTimeoutError:
+            overloaded = True
+            raise
+        finally:
+            limiter.release(time.monotonic() - started, overloaded=overloaded)
+    
+    def _transport(
+        self,
+        method: str,
+        endpoint: str,
+        data: Optional[Dict[str, Any]],
+        params: Optional[Dict[str, Any]],
+        headers: Dict[str, str],
+        stream: bool = False
+    ) -> requests.Response:
+        """Send the HTTP request, translating transport failures into NetworkError"""
         try:
-            response = requests.request(
+            return self.session.request(
                 method=method,
-                url=url,
-                json=data,
+                url=self._build_url(endpoint),
+                data=self.client.json_codec.dumps(data) if data is not None else None,
                 params=params,
-                headers=request_headers,
-                timeout=30
+                headers=headers,
+                timeout=30,
+                stream=stream
             )
             
-            return self._handle_response(response)
-            
         except requests.exceptions.Timeout:
-            raise NetworkError("Request timed out")
+            raise RequestTimeoutError("Request timed out")
         except requests.exceptions.ConnectionError:
             raise NetworkError("Connection error occurred")
         except requests.exceptions.RequestException as e:
             raise NetworkError(f"Network error: {str(e)}")
     
-    def _handle_response(self, response: requests.Response) -> Dict[str, Any]:
-        """Handle API response and raise appropriate exceptions"""
+    def _iter_list_items(
+        self,
+        endpoint: str,
+        params: Optional[Dict[str, Any]] = None,
+        chunk_size: int = 64 * 1024,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        GET a list endpoint and yield the items of its data array as the body arrives
+        
+        The response is parsed incrementally, so only one item is held in
+        memory at a time. The request is retried like any GET until its
+        body starts to arrive; it bypasses the response cache and request
+        coalescing. A metadata dict passed in receives the response's other
+        top-level keys, such as its pagination metadata, once the body was
+        read.
+        """
+        response = self._make_request("GET", endpoint, params=params, stream=True)
+        if isinstance(response, dict):
+            # A success other than 200, already read
+            if metadata is not None:
+                metadata.update(list_metadata(response))
+            yield from page_items(response)
+            return
         
+        parser = ItemStreamParser()
         try:
-            response_data = response.json() if response.content else {}
+            for chunk in response.iter_content(chunk_size=chunk_size):
+                yield from parser.feed(chunk)
+            yield from parser.close()
+            if metadata is not None:
+                metadata.update(parser.metadata)
+        except requests.exceptions.Timeout:
+            raise RequestTimeoutError("Request timed out")
+        except requests.exceptions.RequestException as e:
+            raise NetworkError(f"Network error: {str(e)}")
+        except ValueError as e:
+            raise KoyweAPIError(f"Invalid JSON response: {str(e)}", status_code=response.status_code)
+        finally:
+            response.close()
+    
+    def _get_retry_delay(
+        self,
+        method: str,
+        error: KoyweAPIError,
+        attempt: int,
+        attempts: List[RetryAttempt],
+        idempotent: bool = False
+    ) -> Optional[float]:
+        """
+        Decide whether a failed attempt is retried
+        
+        Returns the delay before the next attempt, or None when the error
+        should be raised. Either way the attempt is recorded on the error.
+        """
+        policy = self.client.retry_policy
+        
+        if policy is None or not policy.should_retry(method, error, attempt, idempotent=idempotent):
+            attempts.append(RetryAttempt(attempt, error))
+            error.attempts = list(attempts)
+            return None
+        
+        delay = policy.get_delay(attempt, error)
+        attempts.append(RetryAttempt(attempt, error, delay))
+        return delay
+    
+    def _build_url(self, endpoint: str) -> str:
+        """Build the absolute URL for an endpoint path"""
+        return f"{self.base_url}/{endpoint.lstrip('/')}"
+    
+    @staticmethod
+    def _unconditional(headers: Optional[Dict[str, str]]) -> Dict[str, str]:
+        """Drop the validators a revalidation added to the request headers"""
+        return {
+            name: value for name, value in (headers or {}).items()
+            if name not in ("If-None-Match", "If-Modified-Since")
+        }
+    
+    def _build_headers(
+        self,
+        auth_headers: Dict[str, str],
+        headers: Optional[Dict[str, str]] = None
+    ) -> Dict[str, str]:
+        """Merge the default, authentication and caller supplied headers"""
+        request_headers = {
+            "Content-Type": "application/json",
+            **auth_headers
+        }
+        if headers:
+            request_headers.update(headers)
+        return request_headers
+    
+    def _handle_response(self, response, cache_key: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Handle API response and raise appropriate exceptions
+        
+        With a cache_key, a successful response is stored in the client's
+        response cache.
+        """
+        
+        try:
+            response_data = self.client.json_codec.loads(response.content) if response.content else {}
         except ValueError:
             response_data = {}
         
         if response.status_code == 200 or response.status_code == 201:
+            if cache_key is not None:
+                self.client.cache.store(cache_key, response_data, response.headers)
             return response_data
         elif response.status_code == 400:
             raise ValidationError(
@@ -82,8 +304,7 @@ class BaseEndpoint:
                 response_data=response_data
             )
         elif response.status_code == 401:
-            # Try to refresh token and retry once
-            self.auth_handler.clear_tokens()
+            # The request was already replayed with a refreshed token
             raise AuthenticationError(
                 "Authentication failed",
                 status_code=response.status_code,
@@ -99,13 +320,15 @@ class BaseEndpoint:
             raise RateLimitError(
                 "Rate limit exceeded",
                 status_code=response.status_code,
-                response_data=response_data
+                response_data=response_data,
+                headers=response.headers
             )
         elif 500 <= response.status_code < 600:
             raise ServerError(
                 f"Server error: {response.status_code}",
                 status_code=response.status_code,
-                response_data=response_data
+                response_data=response_data,
+                headers=response.headers
             )
         else:
             raise KoyweAPIError(
@@ -115,18 +338,50 @@ class BaseEndpoint:
             )
     
     def get(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-        """Make a GET request"""
-        return self._make_request("GET", endpoint, params=params)
+        """
+        Make a GET request
+        
+        The request is answered or revalidated from the client's response
+        cache when possible, and shares the network call of an identical
+        request already in flight when the client coalesces requests.
+        """
+        cache = self.client.cache
+        cache_key = cache.key_for(endpoint, params, scope=self.auth_handler.token_key) if cache is not None else None
+        headers = None
+        if cache_key is not None:
+            entry = cache.lookup(cache_key)
+            if entry is not None and entry.is_fresh:
+                return entry.body
+            # Revalidate a stale entry instead of downloading it again
+            headers = entry.conditional_headers() if entry is not None else None
+        
+        def request():
+            return self._make_request("GET", endpoint, params=params, headers=headers, cache_key=cache_key)
+        
+        coalescer = self.client.coalescer
+        if coalescer is None:
+            return request()
+        return coalescer.do(coalescer.key_for(endpoint, params), request)
     
     def post(self, endpoint: str, data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Make a POST request"""
-        return self._make_request("POST", endpoint, data=data)
+        result = self._make_request("POST", endpoint, data=data)
+        self._invalidate_cache(endpoint)
+        return result
     
     def put(self, endpoint: str, data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Make a PUT request"""
-        return self._make_request("PUT", endpoint, data=data)
+        result = self._make_request("PUT", endpoint, data=data)
+        self._invalidate_cache(endpoint)
+        return result
     
     def delete(self, endpoint: str) -> Dict[str, Any]:
         """Make a DELETE request"""
-        return self._make_request("DELETE", endpoint)
-
+        result = self._make_request("DELETE", endpoint)
+        self._invalidate_cache(endpoint)
+        return result
+    
+    def _invalidate_cache(self, endpoint: str) -> None:
+        """Drop cached responses of the resource a write went to"""
+        if self.client.cache is not None:
+            self.client.cache.invalidate(endpoint, scope=self.auth_handler.token_key)
@@ -2,8 +2,12 @@
 Documents endpoint for managing invoices and documents
 """
 
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Iterable, Iterator, Tuple, Union, Callable
 from .base import BaseEndpoint
+from ..bulk import BulkResult, ProgressCallback, iter_bulk, run_bulk
+from ..exceptions import KoyweAPIError
+from ..idempotency import IDEMPOTENCY_HEADER, LEDGER, LOOKUP, create_steps
+from ..pagination import is_last_page, iter_pages, iter_pages_parallel, page_items
 
 
 class DocumentsEndpoint(BaseEndpoint):
@@ -13,8 +17,9 @@ class DocumentsEndpoint(BaseEndpoint):
         self, 
         page: int = 1, 
         limit: int = 10, 
-        filters: Optional[Dict[str, Any]] = None
-    ) -> Dict[str, Any]:
+        filters: Optional[Dict[str, Any]] = None,
+        stream: bool = False
+    ) -> Union[Dict[str, Any], Iterator[Dict[str, Any]]]:
         """
         Get a paginated list of documents
         
@@ -22,19 +27,117 @@ class DocumentsEndpoint(BaseEndpoint):
             page: Page number (default: 1)
             limit: Number of items per page (default: 10)
             filters: Additional filters to apply
-            
+            stream: Return an iterator of the page's documents, parsed as the
+                response arrives, instead of the whole response (default: False)
+                
         Returns:
             Dict containing documents list and pagination info
         """
-        params = {
-            "page": page,
-            "limit": limit
-        }
+        if stream:
+            return self.iter_page(page=page, limit=limit, filters=filters)
         
-        if filters:
-            params.update(filters)
+        params = self._build_list_params(page, limit, filters)
+        return super().get("documents", params=params)
+    
+    def iter_page(
+        self,
+        page: int = 1,
+        limit: int = 10,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over the documents of one page as the response arrives
+        
+        The response body is parsed incrementally, so memory holds one
+        document at a time rather than the whole page, which makes large
+        limits practical. Streamed pages bypass the response cache and
+        request coalescing.
+        
+        Args:
+            page: Page number (default: 1)
+            limit: Number of items per page (default: 10)
+            filters: Additional filters to apply
+            
+        Yields:
+            Document dicts, one at a time
+        """
+        params = self._build_list_params(page, limit, filters)
+        return self._iter_list_items("documents", params=params)
+    
+    def iter_all(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        page_size: int = 100,
+        prefetch: int = 1,
+        stream: bool = False
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over all documents, fetching upcoming pages in the background
         
-        return self.get("documents", params=params)
+        Args:
+            filters: Additional filters to apply
+            page_size: Number of items per page (default: 100)
+            prefetch: Number of pages to fetch ahead of the one being consumed (default: 1)
+            stream: Parse each page incrementally like iter_page() instead of
+                prefetching whole pages; pages are then fetched one after the
+                other, each ending the iteration when its pagination metadata
+                says it is the last, and prefetch is ignored (default: False)
+                
+        Yields:
+            Document dicts, one at a time
+        """
+        if stream:
+            page = 1
+            items_seen = 0
+            while True:
+                params = self._build_list_params(page, page_size, filters)
+                metadata: Dict[str, Any] = {}
+                count = 0
+                for document in self._iter_list_items("documents", params=params, metadata=metadata):
+                    count += 1
+                    yield document
+                items_seen += count
+                if is_last_page(metadata, page, page_size, items_seen, item_count=count):
+                    return
+                page += 1
+        
+        pages = iter_pages(
+            lambda page: self.list(page=page, limit=page_size, filters=filters),
+            page_size,
+            prefetch=prefetch
+        )
+        for response in pages:
+            yield from page_items(response)
+    
+    def fetch_all(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        page_size: int = 100,
+        max_workers: int = 4
+    ) -> List[Dict[str, Any]]:
+        """
+        Fetch all documents, requesting pages in parallel
+        
+        The total page count is read from the first response and the other
+        pages are fetched over a bounded worker pool, going through the
+        client's rate and concurrency limiters. A failed page is retried on
+        its own under the client's retry policy instead of restarting the
+        export.
+        
+        Args:
+            filters: Additional filters to apply
+            page_size: Number of items per page (default: 100)
+            max_workers: Maximum number of pages fetched concurrently (default: 4)
+            
+        Returns:
+            List of all documents, in page order
+        """
+        pages = iter_pages_parallel(
+            lambda page: self.list(page=page, limit=page_size, filters=filters),
+            page_size,
+            max_workers=max_workers
+        )
+        return [document for response in pages for document in page_items(response)]
     
     def get(self, document_id: int) -> Dict[str, Any]:
         """
@@ -48,26 +151,146 @@ class DocumentsEndpoint(BaseEndpoint):
         """
         return super().get(f"documents/{document_id}")
     
+    def iter_many(
+        self,
+        document_ids: Iterable[int],
+        max_concurrency: int = 8
+    ) -> Iterator[Tuple[int, Union[Dict[str, Any], KoyweAPIError]]]:
+        """
+        Fetch many documents in parallel, yielding each as soon as it arrives
+        
+        Duplicate IDs are fetched once.
+        
+        Args:
+            document_ids: The document IDs
+            max_concurrency: Maximum number of concurrent requests (default: 8)
+            
+        Yields:
+            (document_id, document) pairs, or (document_id, error) for a
+            failed fetch, in completion order
+        """
+        unique_ids = dict.fromkeys(document_ids)
+        for result in iter_bulk(self.get, unique_ids, max_workers=max_concurrency):
+            yield result.item, result.result if result.ok else result.error
+    
+    def get_many(
+        self,
+        document_ids: Iterable[int],
+        max_concurrency: int = 8,
+        stream: bool = False
+    ) -> Union[
+        Dict[int, Union[Dict[str, Any], KoyweAPIError]],
+        Iterator[Tuple[int, Union[Dict[str, Any], KoyweAPIError]]]
+    ]:
+        """
+        Fetch many documents in parallel over the client's connection pool
+        
+        Args:
+            document_ids: The document IDs; duplicates are fetched once
+            max_concurrency: Maximum number of concurrent requests (default: 8)
+            stream: Return an iterator of (document_id, result) pairs in
+                completion order instead of a dict (default: False)
+                
+        Returns:
+            Dict mapping each document ID, in input order, to its document or
+            to the KoyweAPIError its fetch raised
+        """
+        if stream:
+            return self.iter_many(document_ids, max_concurrency=max_concurrency)
+        
+        unique_ids = list(dict.fromkeys(document_ids))
+        results = dict(self.iter_many(unique_ids, max_concurrency=max_concurrency))
+        return {document_id: results[document_id] for document_id in unique_ids}
+    
     def create(
         self, 
         document_data: Dict[str, Any], 
-        generate_stamp: Optional[int] = None
+        generate_stamp: Optional[int] = None,
+        idempotency_key: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Create a new document/invoice
         
+        With an idempotency key the request carries an Idempotency-Key
+        header. When the client has an idempotency ledger, a key it knows as
+        created returns the recorded document instead of posting again, and
+        a key whose earlier request has an unknown outcome is only posted
+        again after the ledger's lookup found no document for it. Creates
+        are only retried when such a lookup is configured.
+        
         Args:
             document_data: Document data including header, details, totals, etc.
             generate_stamp: Optional parameter to generate stamp
-            
+            idempotency_key: Key identifying this document (default: derived
+                from the business reference when the client has an
+                idempotency ledger with a reference function)
+                
         Returns:
             Dict containing created document details
+            
+        Raises:
+            PendingCreateError: If an earlier create with this key may have
+                succeeded and the ledger has no lookup to check it
         """
-        endpoint = "documents"
-        if generate_stamp is not None:
-            endpoint += f"?generate_stamp={generate_stamp}"
+        endpoint = self._build_create_endpoint(generate_stamp)
+        if idempotency_key is None and self.client.idempotency_ledger is None:
+            result = self.post(endpoint, data=document_data)
+        else:
+            result = self._create_idempotent(endpoint, document_data, idempotency_key)
+            
+        if self.client.mirror is not None:
+            self.client.mirror.upsert(result)
+        return result
+    
+    def _create_idempotent(
+        self,
+        endpoint: str,
+        document_data: Dict[str, Any],
+        idempotency_key: Optional[str]
+    ) -> Dict[str, Any]:
+        """Post a document with an idempotency key, consulting the ledger first"""
+        ledger = self.client.idempotency_ledger
+        if ledger is None:
+            return self._post_idempotent(endpoint, document_data, idempotency_key)
+        
+        key = idempotency_key or ledger.key_for(endpoint, document_data)
+        if key is None:
+            return self.post(endpoint, data=document_data)
         
-        return self.post(endpoint, data=document_data)
+        steps = create_steps(ledger, key, endpoint)
+        result: Any = None
+        error: Optional[KoyweAPIError] = None
+        while True:
+            try:
+                step = steps.throw(error) if error is not None else steps.send(result)
+            except StopIteration as stop:
+                return stop.value
+            
+            result, error = None, None
+            try:
+                if step[0] == LEDGER:
+                    result = step[1](*step[2:])
+                elif step[0] == LOOKUP:
+                    result = ledger.lookup(key, document_data)
+                else:
+                    recover = (lambda: ledger.lookup(key, document_data)) if step[1] else None
+                    result = self._post_idempotent(endpoint, document_data, key, recover=recover)
+            except KoyweAPIError as e:
+                error = e
+    
+    def _post_idempotent(
+        self,
+        endpoint: str,
+        document_data: Dict[str, Any],
+        key: str,
+        recover: Optional[Callable[[], Optional[Dict[str, Any]]]] = None
+    ) -> Dict[str, Any]:
+        """Post a document with the Idempotency-Key header, retried only when recover checks for it first"""
+        result = self._make_request(
+            "POST", endpoint, data=document_data, headers={IDEMPOTENCY_HEADER: key}, recover=recover
+        )
+        self._invalidate_cache(endpoint)
+        return result
     
     def update(self, document_id: int, document_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -80,7 +303,10 @@ class DocumentsEndpoint(BaseEndpoint):
         Returns:
             Dict containing updated document details
         """
-        return self.put(f"documents/{document_id}", data=document_data)
+        result = self.put(f"documents/{document_id}", data=document_data)
+        if self.client.mirror is not None:
+            self.client.mirror.merge(document_id, {**document_data, **(result or {})})
+        return result
     
     def delete(self, document_id: int) -> Dict[str, Any]:
         """
@@ -92,7 +318,10 @@ class DocumentsEndpoint(BaseEndpoint):
         Returns:
             Dict containing deletion confirmation
         """
-        return super().delete(f"documents/{document_id}")
+        result = super().delete(f"documents/{document_id}")
+        if self.client.mirror is not None:
+            self.client.mirror.delete(document_id)
+        return result
     
     def create_invoice(
         self,
@@ -102,7 +331,8 @@ class DocumentsEndpoint(BaseEndpoint):
         currency_id: int = 1,
         document_type_id: int = 1,
         account_id: int = 1,
-        additional_options: Optional[Dict[str, Any]] = None
+        additional_options: Optional[Dict[str, Any]] = None,
+        idempotency_key: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Helper method to create a standard invoice
@@ -115,10 +345,110 @@ class DocumentsEndpoint(BaseEndpoint):
             document_type_id: Document type ID (default: 1)
             account_id: Account ID (default: 1)
             additional_options: Additional options for the invoice
+            idempotency_key: Key identifying this invoice, see create()
             
         Returns:
             Dict containing created invoice details
         """
+        document_data = self.build_invoice_data(
+            issuer_info=issuer_info,
+            receiver_info=receiver_info,
+            line_items=line_items,
+            currency_id=currency_id,
+            document_type_id=document_type_id,
+            account_id=account_id,
+            additional_options=additional_options
+        )
+        
+        return self.create(document_data, idempotency_key=idempotency_key)
+    
+    def create_many(
+        self,
+        documents: Iterable[Dict[str, Any]],
+        generate_stamp: Optional[int] = None,
+        max_workers: int = 8,
+        ordered: bool = True,
+        fail_fast: bool = False,
+        progress_callback: Optional[ProgressCallback] = None
+    ) -> List[BulkResult]:
+        """
+        Create many documents in parallel over the client's connection pool
+        
+        Args:
+            documents: Iterable of document data dicts as accepted by create()
+            generate_stamp: Optional parameter to generate stamp
+            max_workers: Maximum number of concurrent requests (default: 8)
+            ordered: Return results in input order instead of completion order (default: True)
+            fail_fast: Stop submitting after the first failure (default: False)
+            progress_callback: Called with (completed_count, result) after each document
+            
+        Returns:
+            List of BulkResult holding the created document or the error per item
+        """
+        return run_bulk(
+            lambda document_data: self.create(document_data, generate_stamp=generate_stamp),
+            documents,
+            max_workers=max_workers,
+            ordered=ordered,
+            fail_fast=fail_fast,
+            progress_callback=progress_callback
+        )
+    
+    def create_invoices_bulk(
+        self,
+        invoices: Iterable[Dict[str, Any]],
+        max_workers: int = 8,
+        ordered: bool = True,
+        fail_fast: bool = False,
+        progress_callback: Optional[ProgressCallback] = None
+    ) -> List[BulkResult]:
+        """
+        Create many standard invoices in parallel
+        
+        Args:
+            invoices: Iterable of dicts with the keyword arguments of create_invoice()
+            max_workers: Maximum number of concurrent requests (default: 8)
+            ordered: Return results in input order instead of completion order (default: True)
+            fail_fast: Stop submitting after the first failure (default: False)
+            progress_callback: Called with (completed_count, result) after each invoice
+            
+        Returns:
+            List of BulkResult holding the created invoice or the error per item
+        """
+        return run_bulk(
+            lambda invoice: self.create_invoice(**invoice),
+            invoices,
+            max_workers=max_workers,
+            ordered=ordered,
+            fail_fast=fail_fast,
+            progress_callback=progress_callback
+        )
+    
+    @staticmethod
+    def build_invoice_data(
+        issuer_info: Dict[str, Any],
+        receiver_info: Dict[str, Any],
+        line_items: List[Dict[str, Any]],
+        currency_id: int = 1,
+        document_type_id: int = 1,
+        account_id: int = 1,
+        additional_options: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Build the document payload for a standard invoice
+        
+        Args:
+            issuer_info: Issuer information (address, tax_id, etc.)
+            receiver_info: Receiver information (address, tax_id, etc.)
+            line_items: List of invoice line items
+            currency_id: Currency ID (default: 1)
+            document_type_id: Document type ID (default: 1)
+            account_id: Account ID (default: 1)
+            additional_options: Additional options for the invoice
+            
+        Returns:
+            Dict containing the document data accepted by create()
+        """
         
         # Calculate totals
         subtotal = sum(item.get('total', 0) for item in line_items)
@@ -130,7 +460,7 @@ class DocumentsEndpoint(BaseEndpoint):
         document_data = {
             "header": {
                 "document_type_id": document_type_id,
-                "issue_date": self._get_current_date(),
+                "issue_date": DocumentsEndpoint._get_current_date(),
                 "currency_id": currency_id,
                 "account_id": account_id,
                 **issuer_info,
@@ -147,10 +477,36 @@ class DocumentsEndpoint(BaseEndpoint):
         # Add additional options if provided
         if additional_options:
             document_data.update(additional_options)
+            
+        return document_data
+    
+    @staticmethod
+    def _build_list_params(
+        page: int,
+        limit: int,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Build the query parameters for a document listing"""
+        params = {
+            "page": page,
+            "limit": limit
+        }
         
-        return self.create(document_data)
+        if filters:
+            params.update(filters)
+            
+        return params
+    
+    @staticmethod
+    def _build_create_endpoint(generate_stamp: Optional[int] = None) -> str:
+        """Build the endpoint path used to create a document"""
+        endpoint = "documents"
+        if generate_stamp is not None:
+            endpoint += f"?generate_stamp={generate_stamp}"
+        return endpoint
     
-    def _get_current_date(self) -> str:
+    @staticmethod
+    def _get_current_date() -> str:
         """Get current date in YYYY-MM-DD format"""
         from datetime import datetime
         return datetime.now().strftime("%Y-%m-%d")
@@ -2,15 +2,28 @@
 Custom exceptions for Koywe API client
 """
 
+from requests.structures import CaseInsensitiveDict
+
 
 class KoyweAPIError(Exception):
     """Base exception for all Koywe API errors"""
     
-    def __init__(self, message: str, status_code: int = None, response_data: dict = None):
+    def __init__(
+        self,
+        message: str,
+        status_code: int = None,
+        response_data: dict = None,
+        headers: dict = None
+    ):
         super().__init__(message)
         self.message = message
         self.status_code = status_code
         self.response_data = response_data or {}
+        # Header names are case-insensitive, whatever casing the server used
+        self.headers = CaseInsensitiveDict(headers or {})
+        
+        # Attempts made before giving up, filled in by the retry policy
+        self.attempts = []
 
 
 class AuthenticationError(KoyweAPIError):
@@ -38,7 +51,16 @@ class NetworkError(KoyweAPIError):
     pass
 
 
+class RequestTimeoutError(NetworkError):
+    """Raised when a request times out"""
+    pass
+
+
 class ServerError(KoyweAPIError):
     """Raised when server returns 5xx errors"""
     pass
 
+
+class PendingCreateError(KoyweAPIError):
+    """Raised when an earlier create with the same idempotency key may have succeeded"""
+    pass
@@ -0,0 +1,240 @@
+"""
+Idempotency keys and a local ledger guarding document creation against duplicates
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from typing import Dict, Any, Optional, Callable, Generator, Tuple
+from .exceptions import KoyweAPIError, NetworkError, PendingCreateError
+
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+
+PENDING = "pending"
+SUCCEEDED = "succeeded"
+
+# Steps of a create guarded by the ledger, see create_steps
+LEDGER = "ledger"
+LOOKUP = "lookup"
+POST = "post"
+
+# Lookup finding a document an earlier attempt may have created
+ExistingLookup = Callable[[str, Dict[str, Any]], Optional[Dict[str, Any]]]
+# Business reference identifying a document, e.g. the order it bills
+ReferenceFunc = Callable[[Dict[str, Any]], Optional[Any]]
+
+
+def idempotency_key(endpoint: str, reference: Any) -> str:
+    """
+    Build a deterministic idempotency key from a business reference
+    
+    The same reference sent to the same endpoint gets the same key. Derive
+    it from what identifies the document in your system, such as an order
+    number, not from the payload: two legitimately identical invoices must
+    get different keys.
+    
+    Args:
+        endpoint: API endpoint path
+        reference: Business reference of the document, e.g. "order-1042"
+    """
+    canonical = json.dumps(
+        {"endpoint": endpoint, "reference": reference}, sort_keys=True, separators=(",", ":"), default=str
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def pending_create_message(key: str) -> str:
+    """Describe a pending key that cannot be checked before it is sent again"""
+    return (
+        f"An earlier create with idempotency key {key!r} may have succeeded. Give the "
+        "ledger a lookup to check for it, or resolve the key with complete() or forget()"
+    )
+
+
+class IdempotencyLedger:
+    """
+    SQLite record of idempotency keys and the outcome of their requests
+    
+    A key is recorded as pending before its request is sent and as
+    succeeded, with the response, once the API confirms it. A pending key
+    therefore marks a request whose outcome is unknown, e.g. after a
+    timeout or a crash. Such a request is only sent again after the lookup
+    found no document for it, so without a lookup it is not retried and a
+    pending key must be resolved with complete() or forget(). Keys whose
+    request was definitely rejected (4xx) are forgotten so that they can
+    be sent again.
+    """
+    
+    def __init__(
+        self,
+        path: str = ":memory:",
+        ttl: float = 7 * 24 * 3600,
+        lookup: Optional[ExistingLookup] = None,
+        reference: Optional[ReferenceFunc] = None
+    ):
+        """
+        Initialize the ledger
+        
+        Args:
+            path: SQLite database file; created if missing (default: in memory)
+            ttl: Seconds a key is remembered (default: 7 days)
+            lookup: Called with (key, document_data) for a pending key; returns
+                the existing document if the earlier attempt created it. For the
+                asyncio client it may be a coroutine function (default: None)
+            reference: Called with document_data; returns the business
+                reference the key of a create without an explicit key is
+                derived from, or None to send it without a key (default: None)
+        """
+        self.path = path
+        self.ttl = ttl
+        self.lookup = lookup
+        self.reference = reference
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        with self._lock, self._connection:
+            if path != ":memory:":
+                self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS idempotency ("
+                "key TEXT PRIMARY KEY, endpoint TEXT NOT NULL, status TEXT NOT NULL, "
+                "response TEXT, created_at REAL NOT NULL, updated_at REAL NOT NULL)"
+            )
+    
+    def key_for(self, endpoint: str, data: Optional[Dict[str, Any]]) -> Optional[str]:
+        """Derive the idempotency key of a request from its business reference, None without one"""
+        if self.reference is None:
+            return None
+        reference = self.reference(data or {})
+        return idempotency_key(endpoint, reference) if reference is not None else None
+    
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the record of a key
+        
+        Returns:
+            Dict with status ("pending" or "succeeded"), endpoint and, once
+            succeeded, the response; None for unknown or expired keys
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT endpoint, status, response FROM idempotency WHERE key = ? AND created_at > ?",
+                (key, time.time() - self.ttl)
+            ).fetchone()
+        if row is None:
+            return None
+        
+        endpoint, status, response = row
+        return {
+            "key": key,
+            "endpoint": endpoint,
+            "status": status,
+            "response": json.loads(response) if response is not None else None
+        }
+    
+    def begin(self, key: str, endpoint: str) -> None:
+        """Record that a request with this key is about to be sent"""
+        now = time.time()
+        with self._lock, self._connection:
+            # An expired record of the key starts over
+            self._connection.execute(
+                "DELETE FROM idempotency WHERE key = ? AND created_at <= ?", (key, now - self.ttl)
+            )
+            self._connection.execute(
+                "INSERT INTO idempotency (key, endpoint, status, response, created_at, updated_at) "
+                "VALUES (?, ?, ?, NULL, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET updated_at = excluded.updated_at",
+                (key, endpoint, PENDING, now, now)
+            )
+    
+    def complete(self, key: str, response: Dict[str, Any]) -> None:
+        """Record the confirmed response of the request with this key"""
+        with self._lock, self._connection:
+            self._connection.execute(
+                "UPDATE idempotency SET status = ?, response = ?, updated_at = ? WHERE key = ?",
+                (SUCCEEDED, json.dumps(response), time.time(), key)
+            )
+    
+    def fail(self, key: str, error: KoyweAPIError) -> None:
+        """
+        Record a failed request with this key
+        
+        A definite rejection, including a 429 refused before processing,
+        forgets the key; after a network error, a 5xx, a timeout or a
+        conflict the outcome is unknown and the key stays pending.
+        """
+        if isinstance(error, NetworkError) or error.status_code is None:
+            return
+        if 400 <= error.status_code < 500 and error.status_code not in (408, 409):
+            self.forget(key)
+    
+    def forget(self, key: str) -> None:
+        """Remove a key from the ledger"""
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM idempotency WHERE key = ?", (key,))
+    
+    def purge(self) -> int:
+        """Remove expired keys, returning how many were removed"""
+        with self._lock, self._connection:
+            cursor = self._connection.execute(
+                "DELETE FROM idempotency WHERE created_at <= ?", (time.time() - self.ttl,)
+            )
+            return cursor.rowcount
+    
+    def close(self) -> None:
+        """Close the database connection"""
+        with self._lock:
+            self._connection.close()
+
+
+def create_steps(ledger: IdempotencyLedger, key: str, endpoint: str) -> Generator[Tuple, Any, Dict[str, Any]]:
+    """
+    Decide the steps of a document create guarded by the ledger
+    
+    The sync and asyncio endpoints both run this generator, performing each
+    step it yields and sending back the step's result, or throwing in the
+    KoyweAPIError the step raised. The steps are:
+    
+    - (LEDGER, method, *args): call a method of the ledger; the asyncio
+      client runs it off the event loop
+    - (LOOKUP,): ask the ledger's lookup for the document created with the
+      key, None if there is none
+    - (POST, retry): post the document with the key; with retry it may be
+      retried, checking the lookup before each retry
+      
+    Args:
+        ledger: The client's idempotency ledger
+        key: Idempotency key of the create
+        endpoint: Endpoint path the document is posted to
+        
+    Returns:
+        The created document, from the API or recorded by an earlier create
+        
+    Raises:
+        PendingCreateError: If an earlier create with the key may have
+            succeeded and the ledger has no lookup to check it
+    """
+    record = yield LEDGER, ledger.get, key
+    if record is not None:
+        if record["status"] == SUCCEEDED:
+            return record["response"]
+        
+        # The outcome of the earlier attempt is unknown
+        if ledger.lookup is None:
+            raise PendingCreateError(pending_create_message(key))
+        existing = yield LOOKUP,
+        if existing is not None:
+            yield LEDGER, ledger.complete, key, existing
+            return existing
+    
+    yield LEDGER, ledger.begin, key, endpoint
+    try:
+        result = yield POST, ledger.lookup is not None
+    except KoyweAPIError as e:
+        yield LEDGER, ledger.fail, key, e
+        raise
+    
+    yield LEDGER, ledger.complete, key, result
+    return result
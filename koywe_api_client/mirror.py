@@ -0,0 +1,290 @@
+"""
+Local SQLite mirror of Koywe documents for offline queries
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from typing import Dict, Any, Optional, List, Iterable
+from .models import Document
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    document_id INTEGER PRIMARY KEY,
+    account_id INTEGER,
+    document_type_id INTEGER,
+    currency_id INTEGER,
+    issue_date TEXT,
+    subtotal REAL,
+    tax REAL,
+    total REAL,
+    data TEXT NOT NULL,
+    mirrored_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS document_details (
+    document_id INTEGER NOT NULL REFERENCES documents(document_id) ON DELETE CASCADE,
+    line INTEGER NOT NULL,
+    product_name TEXT,
+    description TEXT,
+    quantity REAL,
+    unit_price REAL,
+    total REAL,
+    PRIMARY KEY (document_id, line)
+);
+CREATE INDEX IF NOT EXISTS idx_documents_account_id ON documents(account_id);
+CREATE INDEX IF NOT EXISTS idx_documents_issue_date ON documents(issue_date);
+CREATE INDEX IF NOT EXISTS idx_documents_currency_id ON documents(currency_id);
+CREATE INDEX IF NOT EXISTS idx_documents_document_type_id ON documents(document_type_id);
+"""
+
+
+class DocumentMirror:
+    """
+    Keeps a local copy of documents in SQLite
+    
+    Header fields used for filtering (account, issue date, currency and
+    document type) and the line items are stored in indexed columns, the
+    full document as JSON. Fill the mirror with fill() and pass it to the
+    client as mirror= to keep it current with create/update/delete calls
+    made through the client.
+    """
+    
+    GROUP_COLUMNS = frozenset({"account_id", "document_type_id", "currency_id", "issue_date"})
+    
+    def __init__(self, path: str = ":memory:"):
+        """
+        Initialize the mirror
+        
+        Args:
+            path: SQLite database file; created if missing (default: in memory)
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.row_factory = sqlite3.Row
+        with self._lock, self._connection:
+            if path != ":memory:":
+                self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA foreign_keys=ON")
+            self._connection.executescript(_SCHEMA)
+    
+    def close(self) -> None:
+        """Close the database connection"""
+        with self._lock:
+            self._connection.close()
+    
+    def fill(
+        self,
+        client,
+        filters: Optional[Dict[str, Any]] = None,
+        page_size: int = 100,
+        prefetch: int = 1
+    ) -> int:
+        """
+        Copy documents from the API into the mirror, one transaction per page
+        
+        Args:
+            client: KoyweClient instance
+            filters: Additional filters to apply
+            page_size: Number of items per page (default: 100)
+            prefetch: Number of pages to fetch ahead (default: 1)
+            
+        Returns:
+            Number of documents mirrored
+        """
+        count = 0
+        batch: List[Dict[str, Any]] = []
+        for document in client.documents.iter_all(filters=filters, page_size=page_size, prefetch=prefetch):
+            batch.append(document)
+            if len(batch) >= page_size:
+                count += self.upsert_many(batch)
+                batch = []
+        return count + self.upsert_many(batch)
+    
+    def upsert(self, document: Dict[str, Any]) -> bool:
+        """
+        Insert or replace a document
+        
+        Args:
+            document: Document data as returned by the API
+            
+        Returns:
+            True if the document was stored, False if it had no document_id
+        """
+        return self.upsert_many([document]) == 1
+    
+    def upsert_many(self, documents: Iterable[Dict[str, Any]]) -> int:
+        """Insert or replace documents in a single transaction, returning how many were stored"""
+        count = 0
+        with self._lock, self._connection:
+            for data in documents:
+                document = Document(data)
+                if document.document_id is None:
+                    continue
+                self._write(document, data)
+                count += 1
+        return count
+    
+    def merge(self, document_id: int, changes: Dict[str, Any]) -> None:
+        """
+        Apply a partial update to a mirrored document
+        
+        Top-level keys of changes replace those of the stored document; a
+        document that is not mirrored yet is stored as given.
+        
+        Args:
+            document_id: The document ID
+            changes: Updated document data
+        """
+        with self._lock, self._connection:
+            row = self._connection.execute(
+                "SELECT data FROM documents WHERE document_id = ?", (document_id,)
+            ).fetchone()
+            data = json.loads(row["data"]) if row else {}
+            data.update(changes)
+            data["document_id"] = document_id
+            self._write(Document(data), data)
+    
+    def delete(self, document_id: int) -> None:
+        """Remove a document from the mirror"""
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM documents WHERE document_id = ?", (document_id,))
+    
+    def _write(self, document: Document, data: Dict[str, Any]) -> None:
+        """Store a parsed document; the caller must hold the lock and a transaction"""
+        header = document.header
+        issue_date = header.issue_date.date().isoformat() if header.issue_date else header.to_dict().get('issue_date')
+        
+        self._connection.execute(
+            "INSERT OR REPLACE INTO documents (document_id, account_id, document_type_id, currency_id, "
+            "issue_date, subtotal, tax, total, data, mirrored_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                document.document_id, header.account_id, header.document_type_id, header.currency_id,
+                issue_date, document.subtotal, document.tax, document.total, json.dumps(data), time.time()
+            )
+        )
+        self._connection.execute("DELETE FROM document_details WHERE document_id = ?", (document.document_id,))
+        self._connection.executemany(
+            "INSERT INTO document_details (document_id, line, product_name, description, quantity, unit_price, total) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [
+                (document.document_id, line, detail.product_name, detail.description,
+                 detail.quantity, detail.unit_price, detail.total)
+                for line, detail in enumerate(document.details)
+            ]
+        )
+    
+    @staticmethod
+    def _where(
+        account_id: Optional[int] = None,
+        document_type_id: Optional[int] = None,
+        currency_id: Optional[int] = None,
+        issue_date_from: Optional[str] = None,
+        issue_date_to: Optional[str] = None
+    ) -> tuple:
+        """Build the WHERE clause and its parameters for the query filters"""
+        clauses = []
+        params: List[Any] = []
+        for column, value in (
+            ("account_id", account_id),
+            ("document_type_id", document_type_id),
+            ("currency_id", currency_id)
+        ):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if issue_date_from is not None:
+            clauses.append("issue_date >= ?")
+            params.append(issue_date_from)
+        if issue_date_to is not None:
+            clauses.append("issue_date <= ?")
+            params.append(issue_date_to)
+            
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        return where, params
+    
+    def get(self, document_id: int) -> Optional[Dict[str, Any]]:
+        """Get a mirrored document by ID, if present"""
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT data FROM documents WHERE document_id = ?", (document_id,)
+            ).fetchone()
+        return json.loads(row["data"]) if row else None
+    
+    def query(
+        self,
+        account_id: Optional[int] = None,
+        document_type_id: Optional[int] = None,
+        currency_id: Optional[int] = None,
+        issue_date_from: Optional[str] = None,
+        issue_date_to: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: int = 0
+    ) -> List[Dict[str, Any]]:
+        """
+        Find mirrored documents
+        
+        Args:
+            account_id: Only documents of this account
+            document_type_id: Only documents of this type
+            currency_id: Only documents in this currency
+            issue_date_from: Only documents issued on or after this date (YYYY-MM-DD)
+            issue_date_to: Only documents issued on or before this date (YYYY-MM-DD)
+            limit: Maximum number of documents to return (default: all)
+            offset: Number of matching documents to skip (default: 0)
+            
+        Returns:
+            List of document dicts ordered by issue date and document ID
+        """
+        where, params = self._where(account_id, document_type_id, currency_id, issue_date_from, issue_date_to)
+        sql = f"SELECT data FROM documents{where} ORDER BY issue_date, document_id LIMIT ? OFFSET ?"
+        params.extend([limit if limit is not None else -1, offset])
+        
+        with self._lock:
+            rows = self._connection.execute(sql, params).fetchall()
+        return [json.loads(row["data"]) for row in rows]
+    
+    def totals(
+        self,
+        group_by: Optional[str] = None,
+        account_id: Optional[int] = None,
+        document_type_id: Optional[int] = None,
+        currency_id: Optional[int] = None,
+        issue_date_from: Optional[str] = None,
+        issue_date_to: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Aggregate document totals locally
+        
+        Args:
+            group_by: Column to group by: account_id, document_type_id,
+                currency_id or issue_date (default: no grouping)
+            account_id: Only documents of this account
+            document_type_id: Only documents of this type
+            currency_id: Only documents in this currency
+            issue_date_from: Only documents issued on or after this date (YYYY-MM-DD)
+            issue_date_to: Only documents issued on or before this date (YYYY-MM-DD)
+            
+        Returns:
+            List of dicts with count, subtotal, tax and total, plus the
+            group_by column when grouping
+        """
+        if group_by is not None and group_by not in self.GROUP_COLUMNS:
+            raise ValueError(f"Cannot group by {group_by!r}")
+        
+        where, params = self._where(account_id, document_type_id, currency_id, issue_date_from, issue_date_to)
+        select = "COUNT(*) AS count, SUM(subtotal) AS subtotal, SUM(tax) AS tax, SUM(total) AS total"
+        if group_by is not None:
+            sql = f"SELECT {group_by}, {select} FROM documents{where} GROUP BY {group_by} ORDER BY {group_by}"
+        else:
+            sql = f"SELECT {select} FROM documents{where}"
+            
+        with self._lock:
+            rows = self._connection.execute(sql, params).fetchall()
+        return [dict(row) for row in rows]
+    
+    def count(self, **filters: Any) -> int:
+        """Count mirrored documents matching the query filters"""
+        return self.totals(**filters)[0]["count"]
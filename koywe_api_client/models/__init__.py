@@ -4,6 +4,7 @@ Data models for Koywe API objects
 
 from .document import Document, DocumentHeader, DocumentDetail
 from .account import Account
+from .batch import DocumentBatch
 
-__all__ = ["Document", "DocumentHeader", "DocumentDetail", "Account"]
+__all__ = ["Document", "DocumentHeader", "DocumentDetail", "Account", "DocumentBatch"]
 
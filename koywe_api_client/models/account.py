@@ -2,37 +2,47 @@
 Account model class
 """
 
-from typing import Dict, Any, Optional
-from .base import BaseModel
+from typing import Optional
+from .base import BaseModel, Field
 
 
 class Account(BaseModel):
     """Represents an account"""
     
-    def __init__(self, data: Dict[str, Any]):
-        super().__init__(data)
-        
-        # Basic account properties
-        self.account_id: Optional[int] = data.get('account_id') or data.get('id')
-        self.name: Optional[str] = data.get('name')
-        self.tax_id: Optional[str] = data.get('tax_id')
-        self.email: Optional[str] = data.get('email')
-        self.phone: Optional[str] = data.get('phone')
-        
-        # Address information
-        self.address: Optional[str] = data.get('address')
-        self.city: Optional[str] = data.get('city')
-        self.state: Optional[str] = data.get('state')
-        self.country_id: Optional[int] = data.get('country_id')
-        self.postal_code: Optional[str] = data.get('postal_code')
-        
-        # Business information
-        self.business_type: Optional[str] = data.get('business_type')
-        self.industry: Optional[str] = data.get('industry')
-        
-        # Status
-        self.is_active: bool = data.get('is_active', True)
-        self.is_verified: bool = data.get('is_verified', False)
+    __slots__ = ()
+    
+    # Basic account properties
+    name: Optional[str] = Field()
+    tax_id: Optional[str] = Field()
+    email: Optional[str] = Field()
+    phone: Optional[str] = Field()
+    
+    # Address information
+    address: Optional[str] = Field()
+    city: Optional[str] = Field()
+    state: Optional[str] = Field()
+    country_id: Optional[int] = Field()
+    postal_code: Optional[str] = Field()
+    
+    # Business information
+    business_type: Optional[str] = Field()
+    industry: Optional[str] = Field()
+    
+    # Status
+    is_active: bool = Field(default=True)
+    is_verified: bool = Field(default=False)
+    
+    @property
+    def account_id(self) -> Optional[int]:
+        """Account ID, which the API reports as either account_id or id"""
+        overrides = self._overrides
+        if overrides is not None and 'account_id' in overrides:
+            return overrides['account_id']
+        return self._data.get('account_id') or self._data.get('id')
+    
+    @account_id.setter
+    def account_id(self, value: Optional[int]) -> None:
+        self._set_override('account_id', value)
     
     def __str__(self) -> str:
         return f"Account(id={self.account_id}, name='{self.name}')"
@@ -2,21 +2,142 @@
 Base model class for all Koywe API objects
 """
 
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Callable
 from datetime import datetime
 
 
+class Field:
+    """
+    Model attribute backed by a key of the model's raw data
+    
+    Reading the attribute looks the value up in the raw data, so it is not
+    stored a second time on the instance. A path of several keys reads a
+    nested value. Assigning the attribute stores the value in the model's
+    overrides and leaves the raw data untouched.
+    """
+    
+    __slots__ = ("path", "default", "name")
+    
+    def __init__(self, *path: str, default: Any = None):
+        """
+        Initialize the field
+        
+        Args:
+            *path: Keys leading to the value (default: the attribute name)
+            default: Value returned when a key is missing (default: None)
+        """
+        self.path = path
+        self.default = default
+        self.name: Optional[str] = None
+    
+    def __set_name__(self, owner, name: str) -> None:
+        self.name = name
+        if not self.path:
+            self.path = (name,)
+    
+    def __get__(self, instance, owner=None) -> Any:
+        if instance is None:
+            return self
+        overrides = instance._overrides
+        if overrides is not None and self.name in overrides:
+            return overrides[self.name]
+        value = instance._data
+        for key in self.path:
+            try:
+                value = value[key]
+            except (KeyError, TypeError):
+                return self.default
+        return value
+    
+    def __set__(self, instance, value: Any) -> None:
+        instance._set_override(self.name, value)
+
+
+class lazy_property:
+    """
+    Attribute computed on first access and cached
+    
+    Works like functools.cached_property for classes with __slots__: the
+    value is cached in the slot named after the attribute with a leading
+    underscore, which the class must declare.
+    """
+    
+    def __init__(self, func: Callable[[Any], Any]):
+        self.func = func
+        self.slot = None
+        self.__doc__ = func.__doc__
+    
+    def __set_name__(self, owner, name: str) -> None:
+        self.slot = owner.__dict__[f"_{name}"]
+    
+    def __get__(self, instance, owner=None) -> Any:
+        if instance is None:
+            return self
+        try:
+            return self.slot.__get__(instance, owner)
+        except AttributeError:
+            value = self.func(instance)
+            self.slot.__set__(instance, value)
+            return value
+    
+    def __set__(self, instance, value: Any) -> None:
+        self.slot.__set__(instance, value)
+
+
 class BaseModel:
-    """Base class for all API models"""
+    """
+    Base class for all API models
+    
+    Models keep the raw API data as their only store: typed attributes are
+    Field descriptors reading from it, and any other key of the raw data
+    can be read as an attribute too. Subclasses declare __slots__ so that
+    instances carry no per-instance __dict__. Assigned attributes go to a
+    small overrides dict, created on first assignment, so that the raw data
+    the model was built from is never modified.
+    """
+    
+    __slots__ = ("_data", "_overrides")
     
     def __init__(self, data: Dict[str, Any]):
         self._data = data
-        self._parse_data()
+        self._overrides: Optional[Dict[str, Any]] = None
+    
+    def __getattr__(self, name: str) -> Any:
+        # Only reached when no slot or descriptor matches: expose overrides and the raw keys
+        if name.startswith("__") or name in ("_data", "_overrides"):
+            raise AttributeError(name)
+        overrides = self._overrides
+        if overrides is not None and name in overrides:
+            return overrides[name]
+        try:
+            return self._data[name]
+        except KeyError:
+            raise AttributeError(
+                f"'{self.__class__.__name__}' object has no attribute '{name}'"
+            ) from None
+    
+    def __setattr__(self, name: str, value: Any) -> None:
+        # Slots, fields and properties handle their own assignment
+        if hasattr(getattr(type(self), name, None), "__set__"):
+            object.__setattr__(self, name, value)
+        else:
+            self._set_override(name, value)
+    
+    def _set_override(self, name: str, value: Any) -> None:
+        if self._overrides is None:
+            self._overrides = {}
+        self._overrides[name] = value
     
-    def _parse_data(self) -> None:
-        """Parse the raw data into model attributes"""
-        for key, value in self._data.items():
-            setattr(self, key, value)
+    def __dir__(self):
+        keys = set(self._data) | set(self._overrides or ())
+        return sorted(set(super().__dir__()) | {key for key in keys if isinstance(key, str)})
+    
+    def __getstate__(self) -> Dict[str, Any]:
+        return {"_data": self._data, "_overrides": self._overrides}
+    
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__init__(state["_data"])
+        self._overrides = state.get("_overrides")
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert the model back to a dictionary"""
@@ -35,20 +156,15 @@ class BaseModel:
         if not date_str:
             return None
         
-        # Try different date formats
-        formats = [
-            "%Y-%m-%d",
-            "%Y-%m-%dT%H:%M:%S",
-            "%Y-%m-%dT%H:%M:%S.%f",
-            "%Y-%m-%dT%H:%M:%SZ",
-            "%Y-%m-%dT%H:%M:%S.%fZ"
-        ]
-        
-        for fmt in formats:
-            try:
-                return datetime.strptime(date_str, fmt)
-            except ValueError:
-                continue
-        
-        return None
-
+        # Pick the one format the string can match instead of trying each in turn
+        if "T" not in date_str:
+            fmt = "%Y-%m-%d"
+        else:
+            fmt = "%Y-%m-%dT%H:%M:%S.%f" if "." in date_str else "%Y-%m-%dT%H:%M:%S"
+            if date_str.endswith("Z"):
+                fmt += "Z"
+                
+        try:
+            return datetime.strptime(date_str, fmt)
+        except ValueError:
+            return None
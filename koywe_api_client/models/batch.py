@@ -0,0 +1,332 @@
+"""
+Columnar document batch backed by NumPy arrays
+"""
+
+from typing import Dict, Any, List, Optional, Iterable, Union, Sequence
+from .base import BaseModel
+from .document import Document
+from ..pagination import page_items
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+
+# Integer columns use -1 for a missing value, amounts NaN and dates NaT
+ID_COLUMNS = ("document_id", "account_id", "currency_id", "document_type_id")
+AMOUNT_COLUMNS = ("subtotal", "tax", "total")
+DATE_COLUMN = "issue_date"
+COLUMNS = ID_COLUMNS + AMOUNT_COLUMNS + (DATE_COLUMN,)
+
+MISSING_ID = -1
+
+
+def _header_value(data: Dict[str, Any], key: str) -> Any:
+    header = data.get('header')
+    return header.get(key) if isinstance(header, dict) else None
+
+
+def _totals_value(data: Dict[str, Any], key: str) -> Any:
+    totals = data.get('totals')
+    return totals.get(key) if isinstance(totals, dict) else None
+
+
+# Where each column is read from in a document's raw data
+_EXTRACTORS = {
+    "document_id": lambda data: data.get('document_id'),
+    "account_id": lambda data: _header_value(data, 'account_id'),
+    "currency_id": lambda data: _header_value(data, 'currency_id'),
+    "document_type_id": lambda data: _header_value(data, 'document_type_id'),
+    "subtotal": lambda data: _totals_value(data, 'subtotal'),
+    "tax": lambda data: _totals_value(data, 'tax'),
+    "total": lambda data: _totals_value(data, 'total'),
+    "issue_date": lambda data: _header_value(data, 'issue_date')
+}
+
+
+def _parse_dates(values: List[Any]) -> "np.ndarray":
+    """Convert date strings to datetime64[s], with NaT for missing or invalid ones"""
+    strings = [value.rstrip("Z") if isinstance(value, str) and value else "NaT" for value in values]
+    try:
+        return np.array(strings, dtype="datetime64[s]")
+    except ValueError:
+        # Fall back to the model's parser for the strings NumPy rejects
+        parsed = [BaseModel._parse_datetime(value) if isinstance(value, str) else None for value in values]
+        return np.array(
+            [np.datetime64(value, "s") if value is not None else np.datetime64("NaT", "s") for value in parsed],
+            dtype="datetime64[s]"
+        )
+
+
+class DocumentBatch:
+    """
+    Columnar batch of documents for fast local analytics
+    
+    The numeric fields of the documents (document_id, account_id,
+    currency_id, document_type_id, subtotal, tax, total) and issue_date are
+    held in NumPy arrays, so filtering, grouping and summing a whole month
+    of documents are vectorized. Missing ids are stored as -1, missing
+    amounts as NaN and missing dates as NaT. The raw documents are kept
+    alongside the columns for conversion back to Document objects.
+    
+    Requires numpy: pip install koywe-api-client[analytics]
+    """
+    
+    GROUP_COLUMNS = ID_COLUMNS[1:] + (DATE_COLUMN,)
+    
+    def __init__(self, columns: Dict[str, "np.ndarray"], documents: Optional[List[Dict[str, Any]]] = None):
+        """
+        Initialize the batch from its columns
+        
+        Args:
+            columns: Arrays of equal length for every column in COLUMNS
+            documents: Raw document data of each row (default: None)
+        """
+        if np is None:
+            raise ImportError(
+                "DocumentBatch requires numpy. "
+                "Install it with: pip install koywe-api-client[analytics]"
+            )
+            
+        missing = [name for name in COLUMNS if name not in columns]
+        if missing:
+            raise ValueError(f"Missing columns: {', '.join(missing)}")
+        lengths = {len(columns[name]) for name in COLUMNS}
+        if len(lengths) > 1:
+            raise ValueError("All columns must have the same length")
+        if documents is not None and len(documents) != len(columns["document_id"]):
+            raise ValueError("documents must have one entry per row")
+        
+        self.columns = {name: columns[name] for name in COLUMNS}
+        # An object array, so that selecting rows does not loop in Python
+        if documents is not None and not isinstance(documents, np.ndarray):
+            array = np.empty(len(documents), dtype=object)
+            array[:] = documents
+            documents = array
+        self._documents = documents
+    
+    @classmethod
+    def from_documents(cls, documents: Iterable[Union[Document, Dict[str, Any]]]) -> "DocumentBatch":
+        """
+        Build a batch from documents
+        
+        Args:
+            documents: Document objects or raw document dicts as returned by the API
+        """
+        if np is None:
+            raise ImportError(
+                "DocumentBatch requires numpy. "
+                "Install it with: pip install koywe-api-client[analytics]"
+            )
+            
+        rows = [document.to_dict() if isinstance(document, BaseModel) else document for document in documents]
+        columns = {}
+        for name in ID_COLUMNS:
+            extract = _EXTRACTORS[name]
+            values = (extract(row) for row in rows)
+            columns[name] = np.fromiter(
+                (MISSING_ID if value is None else value for value in values), dtype=np.int64, count=len(rows)
+            )
+        for name in AMOUNT_COLUMNS:
+            extract = _EXTRACTORS[name]
+            values = (extract(row) for row in rows)
+            columns[name] = np.fromiter(
+                (np.nan if value is None else value for value in values), dtype=np.float64, count=len(rows)
+            )
+        columns[DATE_COLUMN] = _parse_dates([_EXTRACTORS[DATE_COLUMN](row) for row in rows])
+        return cls(columns, rows)
+    
+    @classmethod
+    def from_pages(cls, pages: Iterable[Any]) -> "DocumentBatch":
+        """
+        Build a batch from documents.list responses
+        
+        Args:
+            pages: List responses, e.g. from documents.list() calls
+        """
+        return cls.from_documents(item for page in pages for item in page_items(page))
+    
+    @classmethod
+    def concat(cls, batches: Sequence["DocumentBatch"]) -> "DocumentBatch":
+        """Join batches into one"""
+        if not batches:
+            return cls.from_documents([])
+        columns = {name: np.concatenate([batch.columns[name] for batch in batches]) for name in COLUMNS}
+        if all(batch._documents is not None for batch in batches):
+            documents = np.concatenate([batch._documents for batch in batches])
+        else:
+            documents = None
+        return cls(columns, documents)
+    
+    def __len__(self) -> int:
+        return len(self.columns["document_id"])
+    
+    def __getitem__(self, key: Union[str, "np.ndarray", slice]) -> Union["np.ndarray", "DocumentBatch"]:
+        """Get a column by name, or the rows selected by a boolean mask, index array or slice"""
+        if isinstance(key, str):
+            return self.columns[key]
+        
+        columns = {name: column[key] for name, column in self.columns.items()}
+        documents = self._documents[key] if self._documents is not None else None
+        return DocumentBatch(columns, documents)
+    
+    def __repr__(self) -> str:
+        return f"DocumentBatch(rows={len(self)})"
+    
+    def mask(
+        self,
+        account_id: Optional[int] = None,
+        document_type_id: Optional[int] = None,
+        currency_id: Optional[int] = None,
+        issue_date_from: Optional[str] = None,
+        issue_date_to: Optional[str] = None
+    ) -> "np.ndarray":
+        """
+        Build the boolean mask of the rows matching the filters
+        
+        Args:
+            account_id: Only documents of this account
+            document_type_id: Only documents of this type
+            currency_id: Only documents in this currency
+            issue_date_from: Only documents issued on or after this date (YYYY-MM-DD)
+            issue_date_to: Only documents issued on or before this date (YYYY-MM-DD)
+        """
+        mask = np.ones(len(self), dtype=bool)
+        for name, value in (
+            ("account_id", account_id),
+            ("document_type_id", document_type_id),
+            ("currency_id", currency_id)
+        ):
+            if value is not None:
+                mask &= self.columns[name] == value
+                
+        # Compare at day precision so that issue_date_to includes its whole day
+        days = self.columns[DATE_COLUMN].astype("datetime64[D]")
+        if issue_date_from is not None:
+            mask &= days >= np.datetime64(issue_date_from, "D")
+        if issue_date_to is not None:
+            mask &= days <= np.datetime64(issue_date_to, "D")
+        return mask
+    
+    def filter(self, mask: Optional["np.ndarray"] = None, **filters: Any) -> "DocumentBatch":
+        """
+        Get the rows matching a boolean mask and the query filters of mask()
+        
+        Args:
+            mask: Boolean array selecting rows (default: all rows)
+            **filters: account_id, document_type_id, currency_id,
+                issue_date_from or issue_date_to
+        """
+        selected = self.mask(**filters)
+        if mask is not None:
+            selected &= mask
+        return self[selected]
+    
+    def sum(self, column: str = "total") -> float:
+        """Sum an amount column, ignoring missing values"""
+        return float(np.nansum(self.columns[column]))
+    
+    def totals(
+        self,
+        group_by: Optional[Union[str, Sequence[str]]] = None,
+        **filters: Any
+    ) -> List[Dict[str, Any]]:
+        """
+        Aggregate document totals
+        
+        Args:
+            group_by: Column or columns to group by: account_id,
+                document_type_id, currency_id or issue_date (default: no grouping)
+            **filters: Query filters as accepted by mask()
+            
+        Returns:
+            List of dicts with count, subtotal, tax and total, plus the
+            group_by columns when grouping, ordered by the group_by columns
+        """
+        keys = [group_by] if isinstance(group_by, str) else list(group_by or [])
+        for key in keys:
+            if key not in self.GROUP_COLUMNS:
+                raise ValueError(f"Cannot group by {key!r}")
+        
+        rows = self.mask(**filters) if filters else slice(None)
+        amounts = {name: self.columns[name][rows] for name in AMOUNT_COLUMNS}
+        
+        if not keys:
+            result = {"count": len(amounts["total"])}
+            result.update({name: float(np.nansum(column)) for name, column in amounts.items()})
+            return [result]
+        
+        # Number the distinct values of each key, combine the numbers into one
+        # group code per row, then sum per group code in a single pass
+        uniques = []
+        codes = np.zeros(len(amounts["total"]), dtype=np.int64)
+        for key in keys:
+            unique, inverse = np.unique(self._group_column(key)[rows], return_inverse=True)
+            uniques.append(unique)
+            codes = codes * len(unique) + inverse.ravel()
+        group_codes, group_index = np.unique(codes, return_inverse=True)
+        group_index = group_index.ravel()
+        
+        counts = np.bincount(group_index, minlength=len(group_codes))
+        sums = {
+            name: np.bincount(group_index, weights=np.nan_to_num(column), minlength=len(group_codes))
+            for name, column in amounts.items()
+        }
+        
+        results = []
+        for number, code in enumerate(group_codes.tolist()):
+            result = {}
+            for key, unique in reversed(list(zip(keys, uniques))):
+                code, position = divmod(code, len(unique))
+                result[key] = self._group_value(key, unique[position])
+            result = {key: result[key] for key in keys}
+            result["count"] = int(counts[number])
+            result.update({name: float(sums[name][number]) for name in AMOUNT_COLUMNS})
+            results.append(result)
+        return results
+    
+    def _group_column(self, key: str) -> "np.ndarray":
+        if key == DATE_COLUMN:
+            # Group by calendar day, like the mirror does
+            return self.columns[DATE_COLUMN].astype("datetime64[D]")
+        return self.columns[key]
+    
+    @staticmethod
+    def _group_value(key: str, value: Any) -> Any:
+        value = value.item()
+        if key == DATE_COLUMN:
+            return value.isoformat() if value is not None else None
+        return None if value == MISSING_ID else value
+    
+    def to_documents(self) -> List[Document]:
+        """
+        Convert the rows to Document objects
+        
+        Batches built from documents keep their raw data, which is converted
+        as is; otherwise documents are rebuilt from the columns alone.
+        """
+        if self._documents is not None:
+            return [Document(data) for data in self._documents.tolist()]
+        return [Document(self._row_data(index)) for index in range(len(self))]
+    
+    def _row_data(self, index: int) -> Dict[str, Any]:
+        def id_value(name):
+            value = int(self.columns[name][index])
+            return None if value == MISSING_ID else value
+        
+        def amount(name):
+            value = float(self.columns[name][index])
+            return None if np.isnan(value) else value
+        
+        issue_date = self.columns[DATE_COLUMN][index]
+        return {
+            "document_id": id_value("document_id"),
+            "header": {
+                "document_type_id": id_value("document_type_id"),
+                "issue_date": None if np.isnat(issue_date) else str(issue_date),
+                "currency_id": id_value("currency_id"),
+                "account_id": id_value("account_id")
+            },
+            "totals": {name: amount(name) for name in AMOUNT_COLUMNS}
+        }
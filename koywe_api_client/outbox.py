@@ -0,0 +1,445 @@
+"""
+Durable outbox for invoice submission
+"""
+
+import random
+import sqlite3
+import threading
+import time
+import uuid
+from collections import deque
+from typing import Dict, Any, Optional, List
+from .endpoints.documents import DocumentsEndpoint
+from .exceptions import KoyweAPIError
+
+
+QUEUED = "queued"
+IN_PROGRESS = "in_progress"
+DONE = "done"
+DEAD = "dead"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    document_data TEXT NOT NULL,
+    generate_stamp INTEGER,
+    idempotency_key TEXT NOT NULL UNIQUE,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL,
+    locked_at REAL,
+    last_error TEXT,
+    result TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_outbox_status_next_attempt ON outbox(status, next_attempt_at);
+"""
+
+
+class InvoiceOutbox:
+    """
+    Persistent queue of documents to create, drained by a pool of worker threads
+    
+    Documents are written to a SQLite database (WAL mode) before they are
+    submitted, so nothing queued is lost when the process stops. Workers
+    claim one item at a time, create it with its own idempotency key and
+    record the outcome. Failures the client's retry policy considers
+    retryable are retried with exponential backoff; other failures, and
+    items out of attempts, move to the dead-letter state.
+    
+    A failure after which the document may exist anyway, such as a timeout
+    or a 5xx, is only retried when the client's idempotency ledger has a
+    lookup, which checks the API for the document before it is posted
+    again. Without one such items are dead-lettered for a manual check.
+    Items a crashed process left in progress are claimed again once their
+    lease expires, under the same rule, so several processes can share one
+    database.
+    """
+    
+    def __init__(
+        self,
+        client,
+        path: str,
+        workers: int = 4,
+        max_attempts: int = 5,
+        base_delay: float = 1.0,
+        max_delay: float = 300.0,
+        lease_timeout: float = 300.0,
+        poll_interval: float = 1.0
+    ):
+        """
+        Initialize the outbox
+        
+        Args:
+            client: KoyweClient used to create the documents
+            path: SQLite database file; created if missing
+            workers: Number of worker threads (default: 4)
+            max_attempts: Attempts per item before it is dead-lettered (default: 5)
+            base_delay: Backoff delay in seconds after the first failure (default: 1)
+            max_delay: Upper bound for the backoff delay in seconds (default: 300)
+            lease_timeout: Seconds after which an item left in progress is
+                claimed again; must exceed the time a create can take,
+                retries included (default: 300)
+            poll_interval: Seconds idle workers wait before checking for due
+                items (default: 1)
+        """
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        
+        self.client = client
+        self.path = path
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.lease_timeout = lease_timeout
+        self.poll_interval = poll_interval
+        
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        with self._lock:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            self._connection.executescript(_SCHEMA)
+            
+        self._threads: List[threading.Thread] = []
+        self._stop_event = threading.Event()
+        self._wake = threading.Condition()
+        self._completed = deque()
+        self._succeeded = 0
+        self._failed_attempts = 0
+        self._dead_lettered = 0
+        self._started_at: Optional[float] = None
+        
+    # Queueing
+    
+    def enqueue(
+        self,
+        document_data: Dict[str, Any],
+        generate_stamp: Optional[int] = None,
+        idempotency_key: Optional[str] = None
+    ) -> int:
+        """
+        Queue a document for creation
+        
+        Args:
+            document_data: Document data as accepted by documents.create()
+            generate_stamp: Optional parameter to generate stamp
+            idempotency_key: Key identifying the document (default: a random key)
+            
+        Returns:
+            ID of the outbox item
+        """
+        now = time.time()
+        with self._lock:
+            cursor = self._connection.execute(
+                "INSERT INTO outbox (document_data, generate_stamp, idempotency_key, status, "
+                "next_attempt_at, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    self._encode(document_data), generate_stamp, idempotency_key or uuid.uuid4().hex,
+                    QUEUED, now, now, now
+                )
+            )
+            item_id = cursor.lastrowid
+        self._notify()
+        return item_id
+    
+    def enqueue_invoice(self, idempotency_key: Optional[str] = None, **invoice: Any) -> int:
+        """
+        Queue a standard invoice for creation
+        
+        Args:
+            idempotency_key: Key identifying the invoice (default: a random key)
+            **invoice: Keyword arguments of documents.create_invoice()
+            
+        Returns:
+            ID of the outbox item
+        """
+        return self.enqueue(DocumentsEndpoint.build_invoice_data(**invoice), idempotency_key=idempotency_key)
+    
+    # Workers
+    
+    def start(self) -> None:
+        """
+        Start the workers
+        
+        Items left in progress are not taken back here, since another
+        process may still be submitting them; they are claimed again once
+        their lease expires.
+        """
+        if self.is_running:
+            return
+        
+        self._stop_event.clear()
+        self._started_at = time.monotonic()
+        self._threads = [
+            threading.Thread(target=self._run, name=f"koywe-outbox-{index}", daemon=True)
+            for index in range(self.workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+    
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop the workers after their current item"""
+        self._stop_event.set()
+        self._notify()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+    
+    @property
+    def is_running(self) -> bool:
+        """Check if the workers are running"""
+        return any(thread.is_alive() for thread in self._threads)
+    
+    def drain(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until no item is queued or in progress
+        
+        Items waiting for a retry count as queued, so this also waits out
+        their backoff.
+        
+        Args:
+            timeout: Maximum seconds to wait (default: no limit)
+            
+        Returns:
+            True if the outbox was drained, False on timeout
+        """
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        while self.depth() > 0:
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(min(0.05, self.poll_interval))
+        return True
+    
+    def close(self) -> None:
+        """Stop the workers and close the database"""
+        self.stop()
+        with self._lock:
+            self._connection.close()
+    
+    def __enter__(self):
+        self.start()
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+    
+    def _encode(self, value: Any) -> str:
+        return self.client.json_codec.dumps(value).decode("utf-8")
+    
+    def _decode(self, value: Optional[str]) -> Any:
+        return self.client.json_codec.loads(value) if value is not None else None
+    
+    @property
+    def _can_verify(self) -> bool:
+        """Whether the API is checked for an item's document before it is posted again"""
+        ledger = self.client.idempotency_ledger
+        return ledger is not None and ledger.lookup is not None
+    
+    def _notify(self) -> None:
+        with self._wake:
+            self._wake.notify_all()
+    
+    def _run(self) -> None:
+        while not self._stop_event.is_set():
+            item = self._claim()
+            if item is None:
+                with self._wake:
+                    self._wake.wait(self.poll_interval)
+                continue
+            self._process(item)
+    
+    def _claim(self) -> Optional[Dict[str, Any]]:
+        """Atomically take the next due item, or one whose lease expired"""
+        now = time.time()
+        with self._lock:
+            self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._connection.execute(
+                    "SELECT id, document_data, generate_stamp, idempotency_key, attempts, status FROM outbox "
+                    "WHERE (status = ? AND next_attempt_at <= ?) OR (status = ? AND locked_at <= ?) "
+                    "ORDER BY next_attempt_at, id LIMIT 1",
+                    (QUEUED, now, IN_PROGRESS, now - self.lease_timeout)
+                ).fetchone()
+                if row is not None:
+                    self._connection.execute(
+                        "UPDATE outbox SET status = ?, locked_at = ?, updated_at = ? WHERE id = ?",
+                        (IN_PROGRESS, now, now, row[0])
+                    )
+                self._connection.execute("COMMIT")
+            except BaseException:
+                self._connection.execute("ROLLBACK")
+                raise
+        
+        if row is None:
+            return None
+        item_id, document_data, generate_stamp, key, attempts, status = row
+        return {
+            "id": item_id,
+            "document_data": self._decode(document_data),
+            "generate_stamp": generate_stamp,
+            "idempotency_key": key,
+            "attempts": attempts,
+            "interrupted": status == IN_PROGRESS
+        }
+    
+    def _process(self, item: Dict[str, Any]) -> None:
+        attempts = item["attempts"] + 1
+        if item["interrupted"] and not self._can_verify:
+            # The attempt that held the lease may have created the document
+            self._record_failure(item["id"], attempts, KoyweAPIError(
+                "Interrupted while being submitted; check whether the document exists before requeueing"
+            ))
+            return
+        if (item["attempts"] or item["interrupted"]) and self._can_verify:
+            # Mark the key pending, so that create() looks the document up before
+            # posting it again even if the ledger lost track of the earlier attempt
+            self.client.idempotency_ledger.begin(
+                item["idempotency_key"], DocumentsEndpoint._build_create_endpoint(item["generate_stamp"])
+            )
+            
+        try:
+            result = self.client.documents.create(
+                item["document_data"],
+                generate_stamp=item["generate_stamp"],
+                idempotency_key=item["idempotency_key"]
+            )
+        except Exception as e:
+            self._record_failure(item["id"], attempts, e)
+            return
+        
+        now = time.time()
+        with self._lock:
+            self._connection.execute(
+                "UPDATE outbox SET status = ?, attempts = ?, result = ?, last_error = NULL, "
+                "locked_at = NULL, updated_at = ? WHERE id = ?",
+                (DONE, attempts, self._encode(result), now, item["id"])
+            )
+            self._succeeded += 1
+            self._completed.append(time.monotonic())
+    
+    def _is_retryable(self, error: Exception) -> bool:
+        """Check if an item may be posted again after this failure"""
+        policy = self.client.retry_policy
+        if not isinstance(error, KoyweAPIError):
+            return False
+        if policy is not None and not policy.is_retryable("POST", error, idempotent=True):
+            return False
+        # A 429 was rejected before it was processed; after anything else the
+        # document may exist, and only a lookup can tell
+        return error.status_code == 429 or self._can_verify
+    
+    def _record_failure(self, item_id: int, attempts: int, error: Exception) -> None:
+        now = time.time()
+        if self._is_retryable(error) and attempts < self.max_attempts:
+            status = QUEUED
+            backoff = min(self.max_delay, self.base_delay * (2 ** (attempts - 1)))
+            next_attempt_at = now + random.uniform(backoff / 2, backoff)
+        else:
+            status = DEAD
+            next_attempt_at = now
+            
+        with self._lock:
+            self._connection.execute(
+                "UPDATE outbox SET status = ?, attempts = ?, next_attempt_at = ?, last_error = ?, "
+                "locked_at = NULL, updated_at = ? WHERE id = ?",
+                (status, attempts, next_attempt_at, f"{type(error).__name__}: {error}", now, item_id)
+            )
+            self._failed_attempts += 1
+            if status == DEAD:
+                self._dead_lettered += 1
+                
+    # Inspection
+    
+    def get(self, item_id: int) -> Optional[Dict[str, Any]]:
+        """Get an outbox item with its status, attempts, last error and result"""
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT id, status, attempts, idempotency_key, last_error, result, document_data "
+                "FROM outbox WHERE id = ?", (item_id,)
+            ).fetchone()
+        return self._item(row) if row is not None else None
+    
+    def dead_letters(self, limit: int = 100) -> List[Dict[str, Any]]:
+        """Get the items that could not be submitted"""
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT id, status, attempts, idempotency_key, last_error, result, document_data "
+                "FROM outbox WHERE status = ? ORDER BY id LIMIT ?", (DEAD, limit)
+            ).fetchall()
+        return [self._item(row) for row in rows]
+    
+    def requeue_dead(self, item_ids: Optional[List[int]] = None) -> int:
+        """
+        Give dead-lettered items a fresh set of attempts
+        
+        Args:
+            item_ids: Items to requeue (default: all dead-lettered items)
+            
+        Returns:
+            Number of items requeued
+        """
+        now = time.time()
+        sql = "UPDATE outbox SET status = ?, attempts = 0, next_attempt_at = ?, updated_at = ? WHERE status = ?"
+        params: List[Any] = [QUEUED, now, now, DEAD]
+        if item_ids is not None:
+            sql += f" AND id IN ({', '.join('?' for _ in item_ids)})"
+            params.extend(item_ids)
+            
+        with self._lock:
+            count = self._connection.execute(sql, params).rowcount
+        self._notify()
+        return count
+    
+    def depth(self) -> int:
+        """Number of items queued or in progress"""
+        with self._lock:
+            return self._connection.execute(
+                "SELECT COUNT(*) FROM outbox WHERE status IN (?, ?)", (QUEUED, IN_PROGRESS)
+            ).fetchone()[0]
+    
+    def metrics(self, window: float = 60.0) -> Dict[str, Any]:
+        """
+        Get queue depth and throughput figures for monitoring
+        
+        Args:
+            window: Seconds over which throughput is measured (default: 60)
+            
+        Returns:
+            Dict with the item count per status, depth, the successes, failed
+            attempts and dead letters of this process, and throughput in
+            documents per second
+        """
+        with self._lock:
+            counts = dict(self._connection.execute(
+                "SELECT status, COUNT(*) FROM outbox GROUP BY status"
+            ).fetchall())
+            
+            now = time.monotonic()
+            while self._completed and self._completed[0] < now - window:
+                self._completed.popleft()
+            elapsed = min(window, now - self._started_at) if self._started_at is not None else 0.0
+            
+            metrics = {status: counts.get(status, 0) for status in (QUEUED, IN_PROGRESS, DONE, DEAD)}
+            metrics.update({
+                "depth": metrics[QUEUED] + metrics[IN_PROGRESS],
+                "succeeded": self._succeeded,
+                "failed_attempts": self._failed_attempts,
+                "dead_lettered": self._dead_lettered,
+                "throughput": len(self._completed) / elapsed if elapsed > 0 else 0.0
+            })
+        return metrics
+    
+    def _item(self, row: tuple) -> Dict[str, Any]:
+        item_id, status, attempts, key, last_error, result, document_data = row
+        return {
+            "id": item_id,
+            "status": status,
+            "attempts": attempts,
+            "idempotency_key": key,
+            "last_error": last_error,
+            "result": self._decode(result),
+            "document_data": self._decode(document_data)
+        }
@@ -0,0 +1,331 @@
+"""
+Page iteration helpers for paginated Koywe API list endpoints
+"""
+
+import asyncio
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterator, List, Optional
+
+
+PageFetcher = Callable[[int], Dict[str, Any]]
+AsyncPageFetcher = Callable[[int], Awaitable[Dict[str, Any]]]
+
+
+def page_items(response: Any) -> List[Dict[str, Any]]:
+    """Get the items of a list response, which is either a list or a dict with a data list"""
+    if isinstance(response, list):
+        return response
+    if isinstance(response, dict):
+        return response.get("data") or []
+    return []
+
+
+def list_metadata(response: Any) -> Dict[str, Any]:
+    """Get the top-level keys of a list response other than its data list"""
+    if not isinstance(response, dict):
+        return {}
+    return {key: value for key, value in response.items() if key != "data"}
+
+
+def _pagination_meta(response: Any) -> Dict[str, Any]:
+    if not isinstance(response, dict):
+        return {}
+    meta = dict(response)
+    for key in ("meta", "pagination"):
+        if isinstance(response.get(key), dict):
+            meta.update(response[key])
+    return meta
+
+
+def _page_total(meta: Dict[str, Any]) -> Optional[int]:
+    for key in ("total_pages", "last_page", "pages"):
+        value = meta.get(key)
+        if isinstance(value, int):
+            return value
+    return None
+
+
+def _item_total(meta: Dict[str, Any]) -> Optional[int]:
+    for key in ("total", "total_count"):
+        value = meta.get(key)
+        if isinstance(value, int):
+            return value
+    return None
+
+
+def total_pages(response: Any, page_size: int) -> Optional[int]:
+    """
+    Get the total number of pages from the pagination metadata of a list response
+    
+    An item total is divided by the number of items the first page holds,
+    which is less than page_size when the server caps the page size.
+    
+    Args:
+        response: List response of the first page
+        page_size: Number of items requested per page
+        
+    Returns:
+        Total number of pages, or None if the response does not say
+    """
+    meta = _pagination_meta(response)
+    pages = _page_total(meta)
+    if pages is not None:
+        return pages
+    
+    total = _item_total(meta)
+    per_page = len(page_items(response)) or page_size
+    if total is not None and per_page > 0:
+        return -(-total // per_page)
+    return None
+
+
+def is_last_page(
+    response: Any,
+    page: int,
+    page_size: int,
+    items_seen: Optional[int] = None,
+    item_count: Optional[int] = None
+) -> bool:
+    """
+    Check whether a list response is the last page
+    
+    An empty page is the last one. Otherwise the pagination metadata
+    decides when the response has any: has_more, next, a page total, or an
+    item total reached by the items seen so far. This way a server capping
+    the page size below the requested one is still iterated to the end.
+    Without metadata a page shorter than page_size is the last one.
+    
+    Args:
+        response: List response of the page
+        page: Page number of the response
+        page_size: Number of items requested per page
+        items_seen: Number of items on this page and the ones before it
+            (default: page times the items on this page, which is never
+            more than the real number)
+        item_count: Number of items on the page, for a response whose
+            items were streamed rather than kept (default: the length of its
+            data list)
+    """
+    count = item_count if item_count is not None else len(page_items(response))
+    if not count:
+        return True
+    
+    meta = _pagination_meta(response)
+    if meta.get("has_more") is not None:
+        return not meta["has_more"]
+    if "next" in meta:
+        return not meta["next"]
+    
+    pages = _page_total(meta)
+    if pages is not None:
+        return page >= pages
+    total = _item_total(meta)
+    if total is not None:
+        return (items_seen if items_seen is not None else page * count) >= total
+    return count < page_size
+
+
+def iter_pages(
+    fetch_page: PageFetcher,
+    page_size: int,
+    prefetch: int = 1,
+    start_page: int = 1,
+    items_seen: int = 0
+) -> Iterator[Dict[str, Any]]:
+    """
+    Yield list responses page by page while fetching upcoming pages in the background
+    
+    At most prefetch pages are requested ahead of the one being consumed,
+    so memory stays bounded by prefetch + 1 pages. Pages requested past the
+    end are discarded.
+    
+    Args:
+        fetch_page: Function returning the list response for a page number
+        page_size: Number of items requested per page
+        prefetch: Number of upcoming pages to fetch ahead (default: 1)
+        start_page: First page number (default: 1)
+        items_seen: Number of items on the pages before start_page (default: 0)
+    """
+    executor = ThreadPoolExecutor(max_workers=max(1, prefetch))
+    pending = deque()
+    next_page = start_page
+    last_page: Optional[int] = None
+    
+    def fill() -> None:
+        nonlocal next_page
+        while len(pending) < prefetch + 1 and (last_page is None or next_page <= last_page):
+            pending.append((next_page, executor.submit(fetch_page, next_page)))
+            next_page += 1
+            
+    try:
+        fill()
+        while pending:
+            page, future = pending.popleft()
+            response = future.result()
+            if page == start_page:
+                last_page = total_pages(response, page_size)
+            items_seen += len(page_items(response))
+            
+            yield response
+            if is_last_page(response, page, page_size, items_seen):
+                return
+            if last_page is not None and page >= last_page:
+                # The page count was off, e.g. the page size changed; go on page by page
+                last_page = None
+            fill()
+    finally:
+        for _, future in pending:
+            future.cancel()
+        executor.shutdown(wait=False)
+
+
+async def aiter_pages(
+    fetch_page: AsyncPageFetcher,
+    page_size: int,
+    prefetch: int = 1,
+    start_page: int = 1,
+    items_seen: int = 0
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Asyncio version of iter_pages, fetching upcoming pages as tasks
+    
+    See iter_pages for the meaning of the arguments.
+    """
+    pending = deque()
+    next_page = start_page
+    last_page: Optional[int] = None
+    
+    def fill() -> None:
+        nonlocal next_page
+        while len(pending) < prefetch + 1 and (last_page is None or next_page <= last_page):
+            pending.append((next_page, asyncio.ensure_future(fetch_page(next_page))))
+            next_page += 1
+            
+    try:
+        fill()
+        while pending:
+            page, task = pending.popleft()
+            response = await task
+            if page == start_page:
+                last_page = total_pages(response, page_size)
+            items_seen += len(page_items(response))
+            
+            yield response
+            if is_last_page(response, page, page_size, items_seen):
+                return
+            if last_page is not None and page >= last_page:
+                # The page count was off, e.g. the page size changed; go on page by page
+                last_page = None
+            fill()
+    finally:
+        for _, task in pending:
+            if task.done() and not task.cancelled():
+                # Retrieve the outcome of a page fetched past the end
+                task.exception()
+            task.cancel()
+
+
+def iter_pages_parallel(
+    fetch_page: PageFetcher,
+    page_size: int,
+    max_workers: int = 4,
+    start_page: int = 1
+) -> Iterator[Dict[str, Any]]:
+    """
+    Yield list responses in page order while fetching the pages in parallel
+    
+    The total page count is read from the first response and the remaining
+    pages are spread over max_workers threads. At most 2 * max_workers pages
+    are fetched ahead of the one being consumed. Pages are not retried here;
+    fetch_page retries under the client's retry policy, so a failed page is
+    retried on its own without restarting the export. Without a page count
+    in the first response, or when the counted pages do not reach the end,
+    this goes on with iter_pages with max_workers pages prefetched.
+    
+    Args:
+        fetch_page: Function returning the list response for a page number
+        page_size: Number of items requested per page
+        max_workers: Maximum number of pages fetched concurrently (default: 4)
+        start_page: First page number (default: 1)
+    """
+    first = fetch_page(start_page)
+    items_seen = len(page_items(first))
+    yield first
+    if is_last_page(first, start_page, page_size, items_seen):
+        return
+    
+    last_page = total_pages(first, page_size) or start_page
+    pages = iter(range(start_page + 1, last_page + 1))
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    pending = deque()
+    
+    try:
+        for page in islice(pages, 2 * max_workers):
+            pending.append((page, executor.submit(fetch_page, page)))
+        while pending:
+            page, future = pending.popleft()
+            response = future.result()
+            for next_page in islice(pages, 1):
+                pending.append((next_page, executor.submit(fetch_page, next_page)))
+            items_seen += len(page_items(response))
+            yield response
+            if is_last_page(response, page, page_size, items_seen):
+                return
+    finally:
+        for _, future in pending:
+            future.cancel()
+        executor.shutdown(wait=False)
+        
+    yield from iter_pages(fetch_page, page_size, prefetch=max_workers, start_page=last_page + 1, items_seen=items_seen)
+
+
+async def aiter_pages_parallel(
+    fetch_page: AsyncPageFetcher,
+    page_size: int,
+    max_concurrency: int = 4,
+    start_page: int = 1
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Asyncio version of iter_pages_parallel, fetching the pages as tasks
+    
+    See iter_pages_parallel for the meaning of the arguments.
+    """
+    first = await fetch_page(start_page)
+    items_seen = len(page_items(first))
+    yield first
+    if is_last_page(first, start_page, page_size, items_seen):
+        return
+    
+    last_page = total_pages(first, page_size) or start_page
+    pages = iter(range(start_page + 1, last_page + 1))
+    pending = deque()
+    semaphore = asyncio.Semaphore(max_concurrency)
+    
+    async def fetch_bounded(page: int) -> Dict[str, Any]:
+        async with semaphore:
+            return await fetch_page(page)
+    
+    try:
+        for page in islice(pages, 2 * max_concurrency):
+            pending.append((page, asyncio.ensure_future(fetch_bounded(page))))
+        while pending:
+            page, task = pending.popleft()
+            response = await task
+            for next_page in islice(pages, 1):
+                pending.append((next_page, asyncio.ensure_future(fetch_bounded(next_page))))
+            items_seen += len(page_items(response))
+            yield response
+            if is_last_page(response, page, page_size, items_seen):
+                return
+    finally:
+        for _, task in pending:
+            if task.done() and not task.cancelled():
+                task.exception()
+            task.cancel()
+            
+    async for response in aiter_pages(
+        fetch_page, page_size, prefetch=max_concurrency, start_page=last_page + 1, items_seen=items_seen
+    ):
+        yield response
@@ -0,0 +1,145 @@
+"""
+Client-side token bucket rate limiting for Koywe API requests
+"""
+
+import asyncio
+import json
+import os
+import threading
+import time
+from typing import Dict, Optional, Tuple, List
+from .filelock import FileLock, write_atomic
+
+
+class TokenBucket:
+    """
+    In-process token bucket shared by all threads of a client
+    
+    Callers reserve a token and are told how long to wait for it, so the
+    same bucket serves blocking and asyncio callers alike.
+    """
+    
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        """
+        Initialize the bucket
+        
+        Args:
+            rate: Tokens added per second
+            burst: Bucket capacity (default: max(1, rate))
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1, int(rate))
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def reserve(self) -> float:
+        """Take a token, returning the seconds to wait before it may be used"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return max(0.0, -self._tokens / self.rate)
+
+
+class FileTokenBucket(TokenBucket):
+    """Token bucket kept in a file so that several processes share one budget"""
+    
+    def __init__(self, path: str, rate: float, burst: Optional[int] = None):
+        """
+        Initialize the bucket
+        
+        Args:
+            path: State file shared by the cooperating processes
+            rate: Tokens added per second
+            burst: Bucket capacity (default: max(1, rate))
+        """
+        super().__init__(rate, burst)
+        self.path = path
+    
+    def reserve(self) -> float:
+        with FileLock(f"{self.path}.lock"):
+            now = time.time()
+            tokens, updated = float(self.burst), now
+            try:
+                with open(self.path, "r", encoding="utf-8") as fh:
+                    state = json.load(fh)
+                tokens, updated = state["tokens"], state["updated"]
+            except (OSError, ValueError, KeyError):
+                pass
+            
+            tokens = min(self.burst, tokens + max(0.0, now - updated) * self.rate) - 1
+            write_atomic(self.path, json.dumps({"tokens": tokens, "updated": now}).encode("utf-8"))
+            return max(0.0, -tokens / self.rate)
+
+
+class RateLimiter:
+    """Limits request rate globally and, optionally, per endpoint resource"""
+    
+    def __init__(
+        self,
+        rate: Optional[float] = None,
+        burst: Optional[int] = None,
+        endpoint_limits: Optional[Dict[str, Tuple[float, Optional[int]]]] = None,
+        shared_directory: Optional[str] = None
+    ):
+        """
+        Initialize the rate limiter
+        
+        Args:
+            rate: Requests per second across all endpoints (default: unlimited)
+            burst: Requests allowed back to back (default: max(1, rate))
+            endpoint_limits: Per resource (rate, burst), e.g. {"documents": (5, 10)}
+            shared_directory: Keep the buckets in this directory so every
+                process using it stays under one budget (default: in-process)
+        """
+        self.shared_directory = shared_directory
+        if shared_directory:
+            os.makedirs(shared_directory, exist_ok=True)
+            
+        self._global = self._create_bucket("global", rate, burst) if rate else None
+        self._endpoints = {
+            resource: self._create_bucket(resource, resource_rate, resource_burst)
+            for resource, (resource_rate, resource_burst) in (endpoint_limits or {}).items()
+        }
+    
+    def _create_bucket(self, name: str, rate: float, burst: Optional[int]) -> TokenBucket:
+        if self.shared_directory:
+            return FileTokenBucket(os.path.join(self.shared_directory, f"{name}.bucket"), rate, burst)
+        return TokenBucket(rate, burst)
+    
+    @staticmethod
+    def resource_for(endpoint: str) -> str:
+        """Get the resource an endpoint path belongs to, e.g. documents/12 -> documents"""
+        return endpoint.lstrip('/').split('?')[0].split('/')[0]
+    
+    def _buckets_for(self, endpoint: str) -> List[TokenBucket]:
+        buckets = []
+        if self._global is not None:
+            buckets.append(self._global)
+        resource_bucket = self._endpoints.get(self.resource_for(endpoint))
+        if resource_bucket is not None:
+            buckets.append(resource_bucket)
+        return buckets
+    
+    def reserve(self, endpoint: str) -> float:
+        """Take a token for a request to endpoint, returning the seconds to wait"""
+        return max((bucket.reserve() for bucket in self._buckets_for(endpoint)), default=0.0)
+    
+    def acquire(self, endpoint: str) -> float:
+        """Block until a request to endpoint may be sent, returning the time waited"""
+        delay = self.reserve(endpoint)
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+    
+    async def acquire_async(self, endpoint: str) -> float:
+        """Wait without blocking the event loop until a request to endpoint may be sent"""
+        delay = self.reserve(endpoint)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return delay
@@ -0,0 +1,123 @@
+"""
+Background token refresher for the Koywe API client
+"""
+
+import threading
+import time
+from typing import Optional
+from .auth import AuthHandler
+
+
+class TokenRefresher:
+    """Renews the access token in a background thread before it expires"""
+    
+    def __init__(
+        self,
+        auth_handler: AuthHandler,
+        refresh_fraction: float = 0.75,
+        retry_delay: float = 5.0,
+        max_retry_delay: float = 60.0,
+        min_interval: float = 5.0
+    ):
+        """
+        Initialize the refresher
+        
+        Args:
+            auth_handler: Authentication handler whose token is kept fresh
+            refresh_fraction: Fraction of the token lifetime after which it is renewed (default: 0.75)
+            retry_delay: Seconds to wait after a failed refresh (default: 5)
+            max_retry_delay: Upper bound for the delay between failed refreshes (default: 60)
+            min_interval: Minimum seconds between two refreshes, so that tokens
+                which are already due when issued do not make the loop spin (default: 5)
+        """
+        if not 0 < refresh_fraction < 1:
+            raise ValueError("refresh_fraction must be between 0 and 1")
+        
+        self.auth_handler = auth_handler
+        self.refresh_fraction = refresh_fraction
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self.min_interval = min_interval
+        
+        self.refresh_count = 0
+        self.last_error: Optional[Exception] = None
+        
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    @property
+    def is_running(self) -> bool:
+        """Check if the background thread is alive"""
+        return self._thread is not None and self._thread.is_alive()
+    
+    def start(self) -> None:
+        """Start the background thread"""
+        if self.is_running:
+            return
+        
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._run,
+            name="koywe-token-refresher",
+            daemon=True
+        )
+        self._thread.start()
+    
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Stop the background thread and wait for it to exit
+        
+        Args:
+            timeout: Maximum seconds to wait for the thread (default: no limit)
+        """
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+    
+    def _seconds_until_refresh(self, minimum: float = 0.0) -> float:
+        """
+        Get the number of seconds to sleep before the next refresh
+        
+        Args:
+            minimum: Lower bound for the result (default: 0)
+        """
+        refresh_at = self.auth_handler.get_refresh_time(self.refresh_fraction)
+        if refresh_at is None:
+            return minimum
+        return max(minimum, refresh_at - time.time())
+    
+    def _backoff_delay(self, attempts: int) -> float:
+        """Get the delay after a failed or ineffective refresh"""
+        delay = min(self.max_retry_delay, self.retry_delay * (2 ** (attempts - 1)))
+        return max(self.min_interval, delay)
+    
+    def _run(self) -> None:
+        """Refresh loop; requests fall back to inline authentication if it ever stops"""
+        failures = 0
+        minimum = 0.0
+        
+        while not self._stop_event.wait(self._seconds_until_refresh(minimum)):
+            try:
+                if self.auth_handler.is_authenticated:
+                    stale_headers = self.auth_handler.get_auth_headers()
+                    self.auth_handler.refresh_access_token(stale_headers=stale_headers)
+                else:
+                    self.auth_handler.get_auth_headers()
+                    
+                self.refresh_count += 1
+                self.last_error = None
+                
+                refresh_at = self.auth_handler.get_refresh_time(self.refresh_fraction)
+                if refresh_at is not None and refresh_at > time.time():
+                    failures = 0
+                    minimum = self.min_interval
+                    continue
+                # The new token is due already, e.g. when expires_in is a
+                # minute or less; back off as after a failure
+                
+            except Exception as e:
+                self.last_error = e
+                
+            failures += 1
+            minimum = self._backoff_delay(failures)
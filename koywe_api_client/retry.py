@@ -0,0 +1,120 @@
+"""
+Retry policy with exponential backoff for Koywe API requests
+"""
+
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import Optional, Iterable
+from .exceptions import KoyweAPIError, NetworkError
+
+
+class RetryAttempt:
+    """Record of a single request attempt made under a retry policy"""
+    
+    def __init__(self, attempt: int, error: KoyweAPIError, delay: Optional[float] = None):
+        self.attempt = attempt
+        self.error = error
+        self.status_code = error.status_code
+        self.delay = delay
+    
+    def __repr__(self) -> str:
+        return (
+            f"RetryAttempt(attempt={self.attempt}, error={self.error.__class__.__name__}, "
+            f"status_code={self.status_code}, delay={self.delay})"
+        )
+
+
+class RetryPolicy:
+    """Decides which failed requests are retried and how long to wait in between"""
+    
+    DEFAULT_ALLOWED_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+    DEFAULT_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+    
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        base_delay: float = 0.5,
+        max_delay: float = 30.0,
+        jitter: bool = True,
+        respect_retry_after: bool = True,
+        allowed_methods: Optional[Iterable[str]] = None,
+        retry_statuses: Optional[Iterable[int]] = None
+    ):
+        """
+        Initialize the retry policy
+        
+        Args:
+            max_attempts: Total attempts per request, including the first (default: 3)
+            base_delay: Backoff delay in seconds before the second attempt (default: 0.5)
+            max_delay: Upper bound for any single delay in seconds (default: 30)
+            jitter: Use full jitter, i.e. a random delay up to the backoff (default: True)
+            respect_retry_after: Wait as long as the Retry-After header asks (default: True)
+            allowed_methods: HTTP methods that may be retried (default: idempotent verbs)
+            retry_statuses: Status codes that trigger a retry (default: 429, 500, 502-504)
+        """
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+        
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self.respect_retry_after = respect_retry_after
+        self.allowed_methods = frozenset(
+            method.upper() for method in (allowed_methods or self.DEFAULT_ALLOWED_METHODS)
+        )
+        self.retry_statuses = frozenset(retry_statuses or self.DEFAULT_RETRY_STATUSES)
+    
+    def is_retryable(self, method: str, error: KoyweAPIError, idempotent: bool = False) -> bool:
+        """
+        Check if a request with this method that failed with this error may be retried
+        
+        Idempotent requests, e.g. creates checked against the API before
+        each retry, may be retried whatever their method.
+        """
+        if method.upper() not in self.allowed_methods and not idempotent:
+            return False
+        if isinstance(error, NetworkError):
+            return True
+        return error.status_code in self.retry_statuses
+    
+    def should_retry(self, method: str, error: KoyweAPIError, attempt: int, idempotent: bool = False) -> bool:
+        """Check if another attempt should follow the given failed attempt"""
+        if attempt >= self.max_attempts or not self.is_retryable(method, error, idempotent=idempotent):
+            return False
+        
+        # Give up instead of hammering the API before the server asks us to
+        retry_after = self._get_retry_after(error)
+        return retry_after is None or retry_after <= self.max_delay
+    
+    def get_delay(self, attempt: int, error: Optional[KoyweAPIError] = None) -> float:
+        """Get the delay in seconds to wait after the given failed attempt"""
+        retry_after = self._get_retry_after(error) if error is not None else None
+        if retry_after is not None:
+            return retry_after
+        
+        backoff = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        if self.jitter:
+            return random.uniform(0, backoff)
+        return backoff
+    
+    def _get_retry_after(self, error: KoyweAPIError) -> Optional[float]:
+        """Parse the Retry-After header of a failed response, in seconds"""
+        if not self.respect_retry_after:
+            return None
+        
+        value = error.headers.get("Retry-After")
+        if not value:
+            return None
+        
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        return max(0.0, retry_at.timestamp() - time.time())
@@ -0,0 +1,69 @@
+"""
+Pooled HTTP session handling for the Koywe API client
+"""
+
+import threading
+import time
+from typing import Optional
+import requests
+from requests.adapters import HTTPAdapter
+
+
+DEFAULT_POOL_CONNECTIONS = 10
+DEFAULT_POOL_MAXSIZE = 10
+DEFAULT_KEEPALIVE_EXPIRY = 60.0
+
+
+class KeepAliveHTTPAdapter(HTTPAdapter):
+    """HTTP adapter that drops pooled connections once they sit idle too long"""
+
+    def __init__(
+        self,
+        pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        keepalive_expiry: Optional[float] = DEFAULT_KEEPALIVE_EXPIRY,
+        **kwargs
+    ):
+        self.keepalive_expiry = keepalive_expiry
+        self._last_used: Optional[float] = None
+        self._lock = threading.Lock()
+        super().__init__(pool_connections=pool_connections, pool_maxsize=pool_maxsize, **kwargs)
+
+    def send(self, request, **kwargs):
+        """Send a request, recycling the pool if the idle connections have expired"""
+        if self.keepalive_expiry is not None:
+            now = time.monotonic()
+            with self._lock:
+                if self._last_used is not None and now - self._last_used > self.keepalive_expiry:
+                    # The server has most likely closed these sockets already
+                    self.poolmanager.clear()
+                self._last_used = now
+
+        return super().send(request, **kwargs)
+
+
+def create_session(
+    pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+    pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+    keepalive_expiry: Optional[float] = DEFAULT_KEEPALIVE_EXPIRY
+) -> requests.Session:
+    """
+    Create a requests session backed by a keep-alive connection pool
+
+    Args:
+        pool_connections: Number of per-host connection pools to keep
+        pool_maxsize: Maximum number of connections kept per host
+        keepalive_expiry: Seconds an idle connection may be reused (None: no limit)
+
+    Returns:
+        Configured requests.Session instance
+    """
+    session = requests.Session()
+    adapter = KeepAliveHTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        keepalive_expiry=keepalive_expiry
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
@@ -0,0 +1,251 @@
+"""
+Incremental parsing of list responses
+"""
+
+import codecs
+import json
+import re
+from typing import Any, AsyncIterable, AsyncIterator, Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+_WHITESPACE = re.compile(r"[ \t\r\n]*")
+# Characters that may follow the part of a number decoded so far ("" is the buffer end)
+_NUMBER_CHARS = ("", ".", "e", "E", "+", "-", "0", "1", "2", "3", "4", "5", "6", "7", "8", "9")
+
+# Characters that cannot start a JSON value
+_NOT_A_VALUE = (",", ":", "]", "}")
+
+# Parser states
+_START = "start"
+_KEY_OR_END = "key_or_end"  # after "{"
+_KEY = "key"  # after "," in the object
+_COLON = "colon"
+_ARRAY_START = "array_start"
+_ITEM_OR_END = "item_or_end"  # after "[" of the data array
+_ITEM = "item"  # after "," in the data array
+_ITEM_END = "item_end"  # after an item
+_SKIP = "skip"
+_MEMBER_END = "member_end"  # after the value of another key
+_DONE = "done"
+
+
+class ItemStreamParser:
+    """
+    Push parser yielding the items of a list response as its body arrives
+    
+    Chunks of the response body are fed in as they are received, and each
+    item of the response's data array is decoded as soon as it is
+    complete, so the parser holds one item and one chunk in memory rather
+    than the whole page. The other top-level keys of the response, such as
+    its pagination metadata, are decoded into metadata; keys following the
+    data array are only there once the whole body was parsed. A response
+    that is a JSON array is treated as the data array itself.
+    
+    Items are decoded by the standard library's C scanner, which also finds
+    where each item ends; the client's JSON codec is not used.
+    """
+    
+    def __init__(self, key: str = "data"):
+        """
+        Initialize the parser
+        
+        Args:
+            key: Key of the array holding the items (default: "data")
+        """
+        self.key = key
+        self.metadata: Dict[str, Any] = {}
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._scanner = json.JSONDecoder()
+        self._text = ""
+        self._pos = 0
+        self._chunks: List[str] = []
+        self._pending = 0
+        self._state = _START
+        self._top_level_array = False
+        self._current_key = ""
+        self._final = False
+        self._retry_length = 0
+    
+    def feed(self, chunk: bytes) -> List[Any]:
+        """
+        Parse the next chunk of the body
+        
+        Returns:
+            The items completed by this chunk, decoded
+            
+        Raises:
+            ValueError: If the body is not valid JSON
+        """
+        text = self._decoder.decode(chunk)
+        self._chunks.append(text)
+        self._pending += len(text)
+        if self._pending < self._retry_length:
+            # Wait for more of a large value rather than scan it again for every chunk
+            return []
+        return self._parse_pending()
+    
+    def close(self) -> List[Any]:
+        """
+        Finish parsing once the whole body was fed
+        
+        Returns:
+            The remaining items, decoded
+            
+        Raises:
+            ValueError: If the body is incomplete or not valid JSON
+        """
+        self._chunks.append(self._decoder.decode(b"", final=True))
+        self._final = True
+        items = self._parse_pending()
+        if self._state != _DONE:
+            raise ValueError("Incomplete JSON response")
+        return items
+    
+    def _parse_pending(self) -> List[Any]:
+        # Drop what was consumed before appending, so the buffer stays small
+        self._text = self._text[self._pos:] + "".join(self._chunks)
+        self._chunks = []
+        self._pos = 0
+        items = self._parse()
+        self._pending = len(self._text) - self._pos
+        return items
+    
+    def _parse(self) -> List[Any]:
+        items = []
+        text = self._text
+        
+        while True:
+            self._pos = _WHITESPACE.match(text, self._pos).end()
+            if self._pos >= len(text):
+                return items
+            char = text[self._pos]
+            
+            if self._state == _START:
+                if char == "{":
+                    self._state = _KEY_OR_END
+                elif char == "[":
+                    self._top_level_array = True
+                    self._state = _ITEM_OR_END
+                else:
+                    raise ValueError("Expected a JSON object or array")
+                self._pos += 1
+                
+            elif self._state in (_KEY_OR_END, _KEY):
+                if char == "}" and self._state == _KEY_OR_END:
+                    self._pos += 1
+                    self._state = _DONE
+                    continue
+                if char != '"':
+                    raise ValueError(f"Expected an object key at character {self._pos}")
+                decoded = self._decode_value()
+                if decoded is None:
+                    return items
+                self._current_key, self._pos = decoded
+                self._state = _COLON
+                
+            elif self._state == _COLON:
+                if char != ":":
+                    raise ValueError(f"Expected ':' at character {self._pos}")
+                self._pos += 1
+                self._state = _ARRAY_START if self._current_key == self.key else _SKIP
+                
+            elif self._state == _ARRAY_START:
+                if char == "[":
+                    self._pos += 1
+                    self._state = _ITEM_OR_END
+                else:
+                    # Not an array, e.g. null; nothing to yield
+                    self._state = _SKIP
+                    
+            elif self._state in (_ITEM_OR_END, _ITEM):
+                if char == "]" and self._state == _ITEM_OR_END:
+                    self._pos += 1
+                    self._state = _DONE if self._top_level_array else _MEMBER_END
+                    continue
+                self._expect_value(char)
+                decoded = self._decode_value()
+                if decoded is None:
+                    return items
+                item, self._pos = decoded
+                items.append(item)
+                self._state = _ITEM_END
+                
+            elif self._state == _ITEM_END:
+                if char == ",":
+                    self._state = _ITEM
+                elif char == "]":
+                    self._state = _DONE if self._top_level_array else _MEMBER_END
+                else:
+                    raise ValueError(f"Expected ',' or ']' at character {self._pos}")
+                self._pos += 1
+                
+            elif self._state == _SKIP:
+                self._expect_value(char)
+                decoded = self._decode_value()
+                if decoded is None:
+                    return items
+                self.metadata[self._current_key], self._pos = decoded
+                self._state = _MEMBER_END
+                
+            elif self._state == _MEMBER_END:
+                if char == ",":
+                    self._state = _KEY
+                elif char == "}":
+                    self._state = _DONE
+                else:
+                    raise ValueError(f"Expected ',' or '}}' at character {self._pos}")
+                self._pos += 1
+                
+            else:
+                raise ValueError(f"Unexpected data after the JSON response at character {self._pos}")
+    
+    def _expect_value(self, char: str) -> None:
+        """Reject an empty element, e.g. the second comma of [1,,2]"""
+        if char in _NOT_A_VALUE:
+            raise ValueError(f"Expected a value at character {self._pos}")
+    
+    def _decode_value(self) -> Optional[Tuple[Any, int]]:
+        """Decode the value at the current position, or return None until more data arrives"""
+        try:
+            value, end = self._scanner.raw_decode(self._text, self._pos)
+        except json.JSONDecodeError:
+            if self._final:
+                raise
+            # The value most likely continues in the next chunk
+            self._retry_length = 2 * (len(self._text) - self._pos)
+            return None
+        
+        # A number cut off by the end of the buffer, e.g. "12." or "1e", may
+        # continue in the next chunk
+        if isinstance(value, (int, float)) and not self._final and self._text[end:end + 1] in _NUMBER_CHARS:
+            return None
+        self._retry_length = 0
+        return value, end
+
+
+def iter_items(chunks: Iterable[bytes], key: str = "data") -> Iterator[Any]:
+    """
+    Yield the items of a list response from the chunks of its body
+    
+    Args:
+        chunks: The response body in chunks
+        key: Key of the array holding the items (default: "data")
+    """
+    parser = ItemStreamParser(key=key)
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+    yield from parser.close()
+
+
+async def aiter_items(chunks: AsyncIterable[bytes], key: str = "data") -> AsyncIterator[Any]:
+    """
+    Yield the items of a list response from the chunks of its body as they arrive
+    
+    See iter_items for the arguments.
+    """
+    parser = ItemStreamParser(key=key)
+    async for chunk in chunks:
+        for item in parser.feed(chunk):
+            yield item
+    for item in parser.close():
+        yield item
@@ -0,0 +1,101 @@
+"""
+Token stores for sharing access tokens between clients and processes
+"""
+
+import hashlib
+import json
+import os
+import threading
+from contextlib import contextmanager
+from typing import Dict, Any, Optional, Iterator, ContextManager
+from .filelock import FileLock, write_atomic
+
+
+class TokenStore:
+    """
+    Base class for shared token storage
+    
+    Tokens are stored as dicts holding access_token, refresh_token,
+    token_type, issued_at, lifetime and expires_at (Unix timestamps).
+    """
+    
+    def load(self, key: str) -> Optional[Dict[str, Any]]:
+        """Load the token stored under key, if any"""
+        raise NotImplementedError
+    
+    def save(self, key: str, token: Dict[str, Any]) -> None:
+        """Store a token under key"""
+        raise NotImplementedError
+    
+    def delete(self, key: str) -> None:
+        """Remove the token stored under key"""
+        raise NotImplementedError
+    
+    def lock(self, key: str) -> ContextManager[None]:
+        """Hold an exclusive lock on key while a token is acquired or refreshed"""
+        raise NotImplementedError
+
+
+class MemoryTokenStore(TokenStore):
+    """Token store shared by the clients of a single process"""
+    
+    def __init__(self):
+        self._tokens: Dict[str, Dict[str, Any]] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._guard = threading.Lock()
+    
+    def load(self, key: str) -> Optional[Dict[str, Any]]:
+        token = self._tokens.get(key)
+        return dict(token) if token is not None else None
+    
+    def save(self, key: str, token: Dict[str, Any]) -> None:
+        self._tokens[key] = dict(token)
+    
+    def delete(self, key: str) -> None:
+        self._tokens.pop(key, None)
+    
+    @contextmanager
+    def lock(self, key: str) -> Iterator[None]:
+        with self._guard:
+            key_lock = self._locks.setdefault(key, threading.Lock())
+        with key_lock:
+            yield
+
+
+class FileTokenStore(TokenStore):
+    """Token store in a directory, shared by every process on the host"""
+    
+    def __init__(self, directory: str):
+        """
+        Initialize the store
+        
+        Args:
+            directory: Directory holding the token files; created if missing
+        """
+        self.directory = directory
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+    
+    def _path(self, key: str, suffix: str) -> str:
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, f"{digest}{suffix}")
+    
+    def load(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._path(key, ".json"), "r", encoding="utf-8") as fh:
+                return json.load(fh)
+        except (OSError, ValueError):
+            return None
+    
+    def save(self, key: str, token: Dict[str, Any]) -> None:
+        write_atomic(self._path(key, ".json"), json.dumps(token).encode("utf-8"))
+    
+    def delete(self, key: str) -> None:
+        try:
+            os.remove(self._path(key, ".json"))
+        except FileNotFoundError:
+            pass
+    
+    @contextmanager
+    def lock(self, key: str) -> Iterator[None]:
+        with FileLock(self._path(key, ".lock")):
+            yield
@@ -37,6 +37,10 @@ setup(
     ],
     python_requires=">=3.7",
     install_requires=requirements,
+    extras_require={
+        "async": ["httpx>=0.24.0"],
+        "analytics": ["numpy>=1.21.0"],
+    },
     keywords="koywe, e-invoicing, api, client, billing, invoice",
     project_urls={
         "Bug Reports": "https://github.com/brunoreisportela/koywe-api-client/issues",
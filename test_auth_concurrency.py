@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Test script to verify single-flight token acquisition under concurrency
+"""
+
+import sys
+import os
+import asyncio
+import threading
+import time
+
+# Add the current directory to the path so we can import the client
+sys.path.insert(0, os.path.dirname(__file__))
+
+from fake_api import FakeAPI
+from koywe_api_client import KoyweClient, AsyncKoyweClient, AuthenticationError
+from koywe_api_client.auth import AuthHandler
+from koywe_api_client.async_auth import AsyncAuthHandler
+
+THREADS = 64
+
+
+class FakeResponse:
+    """Minimal stand-in for a successful /auth response"""
+    
+    def __init__(self, token: str):
+        self.status_code = 200
+        self.content = b"{}"
+        self._token = token
+    
+    def json(self):
+        return {
+            "access_token": self._token,
+            "refresh_token": f"refresh-{self._token}",
+            "expires_in": 3600
+        }
+
+
+class FakeSession:
+    """Counts /auth calls and makes each one slow enough for threads to pile up"""
+    
+    def __init__(self, delay: float = 0.05):
+        self.delay = delay
+        self.calls = 0
+        self.issued = 0
+        self._lock = threading.Lock()
+    
+    def post(self, url, **kwargs):
+        with self._lock:
+            self.calls += 1
+            self.issued += 1
+            token = f"token-{self.issued}"
+        time.sleep(self.delay)
+        return FakeResponse(token)
+
+
+class FakeAsyncSession(FakeSession):
+    """Async variant of FakeSession"""
+    
+    async def post(self, url, **kwargs):
+        self.calls += 1
+        self.issued += 1
+        token = f"token-{self.issued}"
+        await asyncio.sleep(self.delay)
+        return FakeResponse(token)
+
+
+def _make_handler(handler_class, session):
+    return handler_class(
+        client_id="test_id",
+        client_secret="test_secret",
+        username="test_user",
+        password="test_pass",
+        base_url="https://example.invalid/V1",
+        session=session
+    )
+
+
+def _run_threads(target):
+    """Release THREADS threads at the same instant and collect their results"""
+    barrier = threading.Barrier(THREADS)
+    results = []
+    results_lock = threading.Lock()
+    
+    def worker():
+        barrier.wait()
+        value = target()
+        with results_lock:
+            results.append(value)
+            
+    threads = [threading.Thread(target=worker) for _ in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+        
+    return results
+
+
+def test_concurrent_expiry_authenticates_once():
+    """All threads see an expired token; exactly one /auth call happens"""
+    session = FakeSession()
+    handler = _make_handler(AuthHandler, session)
+    
+    # Start from an expired token, as after a long idle period
+    handler._access_token = "expired"
+    handler._token_expires_at = time.time() - 1
+    
+    results = _run_threads(handler.get_auth_headers)
+    
+    assert session.calls == 1, f"expected 1 /auth call, got {session.calls}"
+    assert all(headers == results[0] for headers in results), "threads received different tokens"
+    print(f"✅ {THREADS} threads, {session.calls} /auth call")
+
+
+def test_concurrent_unauthorized_refreshes_once():
+    """All threads had the same token rejected; only one of them refreshes it"""
+    session = FakeSession()
+    handler = _make_handler(AuthHandler, session)
+    stale_headers = handler.get_auth_headers()
+    session.calls = 0
+    
+    _run_threads(lambda: handler.refresh_access_token(stale_headers=stale_headers))
+    
+    assert session.calls == 1, f"expected 1 refresh call, got {session.calls}"
+    assert handler.get_auth_headers() != stale_headers, "token was not refreshed"
+    print(f"✅ {THREADS} rejected requests, {session.calls} refresh call")
+
+
+def test_async_concurrent_expiry_authenticates_once():
+    """All tasks see an expired token; exactly one /auth call happens"""
+    session = FakeAsyncSession()
+    handler = _make_handler(AsyncAuthHandler, session)
+    
+    async def run():
+        return await asyncio.gather(*(handler.get_auth_headers() for _ in range(THREADS)))
+    
+    results = asyncio.run(run())
+    
+    assert session.calls == 1, f"expected 1 /auth call, got {session.calls}"
+    assert all(headers == results[0] for headers in results), "tasks received different tokens"
+    print(f"✅ {THREADS} tasks, {session.calls} /auth call")
+
+
+def test_rejected_token_discarded_only_while_current():
+    """A request rejected after its replay drops the token only if no one replaced it meanwhile"""
+    session = FakeSession(delay=0)
+    handler = _make_handler(AuthHandler, session)
+    stale_headers = handler.get_auth_headers()
+    # Another thread refreshed the token while the rejected request was in flight
+    handler.refresh_access_token(stale_headers=stale_headers)
+    current_headers = handler.get_auth_headers()
+    
+    _run_threads(lambda: handler.discard_tokens(stale_headers))
+    assert handler.is_authenticated and handler.get_auth_headers() == current_headers, "a newer token was dropped"
+    handler.discard_tokens(current_headers)
+    assert not handler.is_authenticated
+    
+    async def run():
+        handler = _make_handler(AsyncAuthHandler, FakeAsyncSession(delay=0))
+        stale_headers = await handler.get_auth_headers()
+        await handler.refresh_access_token(stale_headers=stale_headers)
+        current_headers = await handler.get_auth_headers()
+        await asyncio.gather(*(handler.discard_tokens(stale_headers) for _ in range(THREADS)))
+        assert handler.is_authenticated and await handler.get_auth_headers() == current_headers
+        await handler.discard_tokens(current_headers)
+        assert not handler.is_authenticated
+        
+    asyncio.run(run())
+    print("✅ rejected tokens discarded only while current")
+
+
+def test_replayed_401_discards_the_token():
+    """A request rejected again after its replay raises and drops the token it used"""
+    
+    async def run_async(api):
+        async with AsyncKoyweClient(**api.credentials()) as client:
+            api.failures.extend([("GET", 401), ("GET", 401)])
+            try:
+                await client.documents.get(1)
+                raise AssertionError("the rejection was not reported")
+            except AuthenticationError:
+                pass
+            assert not client.auth_handler.is_authenticated
+            assert (await client.documents.get(1))["document_id"] == 1
+            
+    with FakeAPI(documents=1) as api:
+        client = KoyweClient(**api.credentials())
+        api.failures.extend([("GET", 401), ("GET", 401)])
+        try:
+            client.documents.get(1)
+            raise AssertionError("the rejection was not reported")
+        except AuthenticationError:
+            pass
+        assert not client.auth_handler.is_authenticated
+        assert client.documents.get(1)["document_id"] == 1
+        client.close()
+        asyncio.run(run_async(api))
+    print("✅ token dropped after a rejected replay")
+
+
+def main():
+    """Main test function"""
+    
+    print("Koywe API Client - Auth Concurrency Test\n")
+    
+    test_concurrent_expiry_authenticates_once()
+    test_concurrent_unauthorized_refreshes_once()
+    test_async_concurrent_expiry_authenticates_once()
+    test_rejected_token_discarded_only_while_current()
+    test_replayed_401_discards_the_token()
+    
+    print("\n✅ All concurrency tests passed!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the response cache
+"""
+
+import sys
+import os
+import asyncio
+import time
+
+# Add the current directory to the path so we can import the client
+sys.path.insert(0, os.path.dirname(__file__))
+
+from fake_api import FakeAPI
+from koywe_api_client import KoyweClient, AsyncKoyweClient, ResponseCache, MemoryCache
+
+
+def _client(api, cache, username: str = "test_user"):
+    return KoyweClient(**{**api.credentials(), "username": username}, cache=cache)
+
+
+def test_keys_scoped_to_credentials():
+    """Keys and invalidation are scoped, so tenants sharing a backend stay apart"""
+    cache = ResponseCache()
+    assert cache.key_for("documents/1", scope="a") != cache.key_for("documents/1", scope="b")
+    
+    cache.set("documents/1", None, {"tenant": "a"}, scope="a")
+    cache.set("documents/1", None, {"tenant": "b"}, scope="b")
+    assert cache.get("documents/1", scope="a") == {"tenant": "a"}
+    assert cache.get("documents/1", scope="b") == {"tenant": "b"}
+    assert cache.get("documents/1") is None
+    
+    cache.invalidate("documents/1", scope="a")
+    assert cache.get("documents/1", scope="a") is None
+    assert cache.get("documents/1", scope="b") == {"tenant": "b"}
+    print("✅ cache keys scoped to credentials")
+
+
+def test_clients_sharing_a_cache():
+    """A client never reads what a client with other credentials cached"""
+    cache = ResponseCache()
+    with FakeAPI(documents=1) as api:
+        first, second = _client(api, cache, "alice"), _client(api, cache, "bob")
+        first.documents.get(1)
+        first.documents.get(1)
+        assert api.count("GET", "/V1/documents/1") == 1
+        
+        second.documents.get(1)
+        assert api.count("GET", "/V1/documents/1") == 2, "read another tenant's cached response"
+        
+        # A write invalidates the writer's entries only
+        first.documents.update(1, {"status": "paid"})
+        second.documents.get(1)
+        assert api.count("GET", "/V1/documents/1") == 2
+        assert first.documents.get(1)["status"] == "paid"
+        assert api.count("GET", "/V1/documents/1") == 3
+        first.close()
+        second.close()
+    print("✅ clients with other credentials do not share entries")
+
+
+class EvictingCache(MemoryCache):
+    """Backend losing an entry right after it is read, as if another process evicted it"""
+    
+    evict = False
+    
+    def get(self, key):
+        value = super().get(key)
+        if self.evict:
+            self.delete(key)
+        return value
+
+
+def test_304_for_evicted_entry_refetched():
+    """A 304 arriving after the entry was evicted is answered by a request without validators"""
+    
+    async def run_async(api, cache):
+        async with AsyncKoyweClient(**api.credentials(), cache=cache) as client:
+            return await client.documents.get(1)
+    
+    def run_sync(api, cache):
+        client = _client(api, cache)
+        try:
+            return client.documents.get(1)
+        finally:
+            client.close()
+            
+    for run in (run_sync, lambda api, cache: asyncio.run(run_async(api, cache))):
+        backend = EvictingCache()
+        cache = ResponseCache(backend, ttl=0.05)
+        with FakeAPI(documents=1) as api:
+            first = _client(api, cache)
+            expected = first.documents.get(1)
+            time.sleep(0.1)
+            
+            # The stale entry is revalidated, then evicted before the 304 arrives
+            backend.evict = True
+            assert run(api, cache) == expected
+            with api.lock:
+                requests = [headers for method, path, headers in api.requests if path == "/V1/documents/1"]
+            assert len(requests) == 3, f"{len(requests)} requests"
+            assert "If-None-Match" in requests[1] and "If-None-Match" not in requests[2]
+            first.close()
+    print("✅ 304 for an evicted entry refetched without validators")
+
+
+def main():
+    """Main test function"""
+    
+    print("Koywe API Client - Response Cache Test\n")
+    
+    test_keys_scoped_to_credentials()
+    test_clients_sharing_a_cache()
+    test_304_for_evicted_entry_refetched()
+    
+    print("\n✅ All response cache tests passed!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Test script to verify request coalescing under concurrency
+"""
+
+import sys
+import os
+import asyncio
+import threading
+import time
+
+# Add the current directory to the path so we can import the client
+sys.path.insert(0, os.path.dirname(__file__))
+
+from koywe_api_client.coalesce import RequestCoalescer
+
+THREADS = 32
+KEY = "documents/1"
+
+
+def _wait_for(condition, timeout: float = 5.0) -> None:
+    """Poll until condition() holds"""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out waiting for the other threads"
+        time.sleep(0.001)
+
+
+def _run_threads(target, count: int = THREADS):
+    """Start count threads running target and collect their results"""
+    results = []
+    results_lock = threading.Lock()
+    
+    def worker():
+        value = target()
+        with results_lock:
+            results.append(value)
+            
+    threads = [threading.Thread(target=worker) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+        
+    return results
+
+
+class LeaderPausingLock:
+    """
+    Lock that pauses the leader just before it removes its finished call
+    
+    This opens the window in which a new caller can join a call whose
+    result is already known.
+    """
+    
+    def __init__(self, lock):
+        self._lock = lock
+        self._acquisitions = 0
+        self.leader_finishing = threading.Event()
+    
+    def __enter__(self):
+        if threading.current_thread().name == "leader":
+            self._acquisitions += 1
+            if self._acquisitions == 2:
+                self.leader_finishing.set()
+                time.sleep(0.2)
+        self._lock.acquire()
+    
+    def __exit__(self, *exc_info):
+        self._lock.release()
+
+
+def test_concurrent_identical_requests_share_one_call():
+    """All threads ask for the same resource while it is in flight; one call is made"""
+    coalescer = RequestCoalescer()
+    calls = []
+    
+    def fetch():
+        calls.append(1)
+        # Hold the call open until every other thread has joined it
+        _wait_for(lambda: coalescer.stats()["coalesced"] == THREADS - 1)
+        return {"document_id": 1}
+    
+    results = _run_threads(lambda: coalescer.do(KEY, fetch))
+    
+    assert len(calls) == 1, f"expected 1 call, got {len(calls)}"
+    assert results == [{"document_id": 1}] * THREADS, "threads received different results"
+    print(f"✅ {THREADS} threads, {len(calls)} call")
+
+
+def test_followers_get_independent_copies():
+    """A caller modifying its result does not change the result of the others"""
+    coalescer = RequestCoalescer()
+    
+    def fetch():
+        _wait_for(lambda: coalescer.stats()["coalesced"] == THREADS - 1)
+        return {"document_id": 1, "details": []}
+    
+    def request():
+        result = coalescer.do(KEY, fetch)
+        result["details"].append(threading.get_ident())
+        return result
+    
+    results = _run_threads(request)
+    
+    assert all(len(result["details"]) == 1 for result in results), "results are shared between callers"
+    print(f"✅ {THREADS} independent copies")
+
+
+def test_follower_joining_as_leader_finishes():
+    """A caller joining just before the finished call is removed still gets its result"""
+    coalescer = RequestCoalescer()
+    lock = coalescer._lock = LeaderPausingLock(coalescer._lock)
+    results = {}
+    
+    def leader():
+        results["leader"] = coalescer.do(KEY, lambda: {"document_id": 1})
+    
+    def follower():
+        lock.leader_finishing.wait()
+        results["follower"] = coalescer.do(KEY, lambda: {"document_id": 2})
+        
+    threads = [threading.Thread(target=leader, name="leader"), threading.Thread(target=follower)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+        
+    assert coalescer.stats()["coalesced"] == 1, "the follower did not join the call"
+    assert results["follower"] == {"document_id": 1}, f"follower received {results['follower']!r}"
+    print("✅ late follower received the result")
+
+
+def test_async_cancelled_leader_leaves_followers_waiting():
+    """Cancelling the task that started a call does not cancel the tasks that joined it"""
+    
+    async def run():
+        coalescer = RequestCoalescer()
+        release = asyncio.Event()
+        calls = []
+        
+        async def fetch():
+            calls.append(1)
+            await release.wait()
+            return {"document_id": 1}
+        
+        leader = asyncio.ensure_future(coalescer.do_async(KEY, fetch))
+        await asyncio.sleep(0)
+        followers = [asyncio.ensure_future(coalescer.do_async(KEY, fetch)) for _ in range(3)]
+        await asyncio.sleep(0)
+        
+        leader.cancel()
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*followers)
+        
+        assert leader.cancelled(), "the leader was not cancelled"
+        assert results == [{"document_id": 1}] * 3, f"followers received {results!r}"
+        assert len(calls) == 1, f"expected 1 call, got {len(calls)}"
+        
+    asyncio.run(run())
+    print("✅ followers unaffected by a cancelled leader")
+
+
+def test_async_call_cancelled_when_every_caller_is():
+    """A call nobody waits for any more is cancelled, and the next caller starts a new one"""
+    
+    async def run():
+        coalescer = RequestCoalescer()
+        started = []
+        
+        async def fetch():
+            started.append(1)
+            await asyncio.sleep(10)
+            
+        callers = [asyncio.ensure_future(coalescer.do_async(KEY, fetch)) for _ in range(2)]
+        await asyncio.sleep(0)
+        for caller in callers:
+            caller.cancel()
+        await asyncio.gather(*callers, return_exceptions=True)
+        
+        result = await coalescer.do_async(KEY, lambda: asyncio.sleep(0, result={"document_id": 2}))
+        assert result == {"document_id": 2}, f"got {result!r}"
+        assert coalescer.stats()["in_flight"] == 0, "a call was left in flight"
+        
+    asyncio.run(run())
+    print("✅ abandoned call cancelled")
+
+
+def main():
+    """Main test function"""
+    
+    print("Koywe API Client - Request Coalescing Test\n")
+    
+    test_concurrent_identical_requests_share_one_call()
+    test_followers_get_independent_copies()
+    test_follower_joining_as_leader_finishes()
+    test_async_cancelled_leader_leaves_followers_waiting()
+    test_async_call_cancelled_when_every_caller_is()
+    
+    print("\n✅ All coalescing tests passed!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the JSON codecs
+"""
+
+import sys
+import os
+import json
+from datetime import date, datetime, time, timezone
+from decimal import Decimal
+
+# Add the current directory to the path so we can import the client
+sys.path.insert(0, os.path.dirname(__file__))
+
+from koywe_api_client.codec import CODECS, JSONCodec, get_codec
+
+PAYLOAD = {
+    "totals": {"subtotal": Decimal("10.10"), "tax": Decimal("1.919"), "total": Decimal("12.019")},
+    "amounts": [Decimal("0.00"), Decimal("-1E+3"), Decimal("1E-7"), Decimal("123456789012345678901.000000001")],
+    "issued_at": datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc),
+    "issue_date": date(2024, 1, 2),
+    "cutoff": time(23, 59),
+    "name": "Año ñandú € 😀 \"quoted\" \\ \u0000 10.10",
+    "count": 3,
+    "ratio": 0.5
+}
+
+
+def _installed_codecs():
+    codecs = []
+    for name in CODECS:
+        try:
+            codecs.append(get_codec(name))
+        except ImportError:
+            print(f"   {name} not installed, skipped")
+    return codecs
+
+
+def test_decimal_sent_as_exact_number():
+    """Decimal values are JSON numbers keeping their exact digits"""
+    for codec in _installed_codecs():
+        encoded = codec.dumps(PAYLOAD)
+        decoded = json.loads(encoded, parse_float=Decimal)
+        assert b'"subtotal":10.10' in encoded.replace(b" ", b""), f"{codec.name}: {encoded!r}"
+        assert decoded["totals"] == {"subtotal": Decimal("10.10"), "tax": Decimal("1.919"), "total": Decimal("12.019")}
+        if codec.name != "ujson":
+            # ujson rounds Decimal values through float
+            assert decoded["amounts"] == [
+                Decimal("0.00"), -1000, Decimal("0.0000001"), Decimal("123456789012345678901.000000001")
+            ], f"{codec.name}: {decoded['amounts']!r}"
+    print("✅ Decimal sent as exact numbers")
+
+
+def test_round_trip():
+    """Dates, times and non-ASCII text survive an encode and decode"""
+    for codec in _installed_codecs():
+        decoded = codec.loads(codec.dumps(PAYLOAD))
+        assert decoded["issued_at"] == "2024-01-02T03:04:05+00:00", f"{codec.name}: {decoded['issued_at']!r}"
+        assert decoded["issue_date"] == "2024-01-02"
+        assert decoded["cutoff"] == "23:59:00"
+        assert decoded["name"] == PAYLOAD["name"], f"{codec.name}: {decoded['name']!r}"
+        assert decoded["count"] == 3 and decoded["ratio"] == 0.5
+        assert decoded["totals"]["subtotal"] == 10.1
+        assert "Año".encode("utf-8") in codec.dumps(PAYLOAD), f"{codec.name} escaped non-ASCII text"
+    print("✅ round trip")
+
+
+def test_invalid_values_rejected():
+    """Values JSON cannot represent raise instead of being sent"""
+    for codec in _installed_codecs():
+        for value in (Decimal("NaN"), Decimal("Infinity"), object()):
+            try:
+                codec.dumps({"total": value})
+            except (TypeError, ValueError):
+                continue
+            raise AssertionError(f"{codec.name} encoded {value!r}")
+    print("✅ invalid values rejected")
+
+
+def test_default_codec():
+    """The default codec is an installed one"""
+    assert isinstance(get_codec(), JSONCodec)
+    assert get_codec("json").name == "json"
+    print(f"✅ default codec: {get_codec().name}")
+
+
+def main():
+    """Main test function"""
+    
+    print("Koywe API Client - JSON Codec Test\n")
+    
+    test_decimal_sent_as_exact_number()
+    test_round_trip()
+    test_invalid_values_rejected()
+    test_default_codec()
+    
+    print("\n✅ All codec tests passed!")
+
+
+if __name__ == "__main__":
+    main()
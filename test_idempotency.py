@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Test script to verify that idempotent document creation never posts twice
+"""
+
+import sys
+import os
+import asyncio
+import tempfile
+import threading
+
+# Add the current directory to the path so we can import the client
+sys.path.insert(0, os.path.dirname(__file__))
+
+from fake_api import FakeAPI
+from koywe_api_client import (
+    KoyweClient,
+    AsyncKoyweClient,
+    IdempotencyLedger,
+    RetryPolicy,
+    PendingCreateError,
+    ValidationError,
+    NetworkError
+)
+from koywe_api_client.exceptions import KoyweAPIError, ServerError
+
+FAST_RETRIES = RetryPolicy(max_attempts=3, base_delay=0.01, jitter=False)
+DOCUMENT = {"reference": "order-1042", "totals": {"total": 11.0}}
+
+
+def _lookup_in(api):
+    """Lookup finding the document the fake API stored for a create's reference"""
+    def lookup(key, document_data):
+        with api.lock:
+            for document in api.documents.values():
+                if document.get("reference") == document_data["reference"]:
+                    return document
+        return None
+    return lookup
+
+
+def _reference(document_data):
+    return document_data["reference"]
+
+
+def test_pending_key_not_reposted_without_lookup():
+    """A create whose response was lost is not sent again when it cannot be checked"""
+    with FakeAPI() as api:
+        client = KoyweClient(
+            **api.credentials(), retry_policy=FAST_RETRIES, idempotency_ledger=IdempotencyLedger(reference=_reference)
+        )
+        # The document is created but the response is lost
+        api.failures.append(("POST", 503, True))
+        try:
+            client.documents.create(DOCUMENT)
+            raise AssertionError("the lost response was not reported")
+        except ServerError:
+            pass
+        
+        try:
+            client.documents.create(DOCUMENT)
+            raise AssertionError("the pending key was posted again")
+        except PendingCreateError:
+            pass
+        assert api.count("POST") == 1, f"{api.count('POST')} POSTs"
+        client.close()
+    print("✅ pending key not re-posted without a lookup")
+
+
+def test_recover_returns_the_earlier_result():
+    """A retried create finds the document its lost attempt created instead of posting again"""
+    with FakeAPI() as api:
+        ledger = IdempotencyLedger(lookup=_lookup_in(api), reference=_reference)
+        client = KoyweClient(**api.credentials(), retry_policy=FAST_RETRIES, idempotency_ledger=ledger)
+        api.failures.append(("POST", 503, True))
+        
+        created = client.documents.create(DOCUMENT)
+        assert created["document_id"] == 1, f"got {created!r}"
+        assert api.count("POST") == 1, f"{api.count('POST')} POSTs"
+        assert ledger.get(ledger.key_for("documents", DOCUMENT))["status"] == "succeeded"
+        
+        # A later create with the same reference returns the recorded document
+        assert client.documents.create(DOCUMENT) == created
+        assert api.count("POST") == 1, f"{api.count('POST')} POSTs"
+        assert len(api.documents) == 1
+        client.close()
+    print("✅ recover returned the earlier result")
+
+
+def test_pending_key_checked_before_posting():
+    """A create left pending, e.g. by a crash, is looked up before it is posted"""
+    with FakeAPI() as api:
+        ledger = IdempotencyLedger(lookup=_lookup_in(api))
+        client = KoyweClient(**api.credentials(), idempotency_ledger=ledger)
+        
+        created = client.documents.create(DOCUMENT, idempotency_key="k1")
+        ledger.begin("k1", "documents")
+        assert client.documents.create(DOCUMENT, idempotency_key="k1") == created
+        
+        ledger.begin("k2", "documents")
+        other = {"reference": "order-1043"}
+        assert client.documents.create(other, idempotency_key="k2")["document_id"] == 2
+        assert api.count("POST") == 2, f"{api.count('POST')} POSTs"
+        client.close()
+    print("✅ pending key checked before posting")
+
+
+def test_fail_forgets_only_definite_rejections():
+    """Only a definite 4xx forgets a key; other failures keep it pending"""
+    ledger = IdempotencyLedger()
+    cases = [
+        (ValidationError("bad", status_code=400), None),
+        (KoyweAPIError("gone", status_code=404), None),
+        (ServerError("down", status_code=503), "pending"),
+        (KoyweAPIError("conflict", status_code=409), "pending"),
+        (KoyweAPIError("timeout", status_code=408), "pending"),
+        (KoyweAPIError("slow down", status_code=429), None),
+        (NetworkError("reset"), "pending")
+    ]
+    for error, expected in cases:
+        ledger.begin("key", "documents")
+        ledger.fail("key", error)
+        record = ledger.get("key")
+        status = record["status"] if record else None
+        assert status == expected, f"{error.status_code}: {status}"
+        ledger.forget("key")
+        
+    # Through the endpoint: a rejected create can be fixed and sent again
+    with FakeAPI() as api:
+        client = KoyweClient(**api.credentials(), idempotency_ledger=IdempotencyLedger())
+        api.failures.append(("POST", 400))
+        try:
+            client.documents.create(DOCUMENT, idempotency_key="k1")
+            raise AssertionError("the rejection was not reported")
+        except ValidationError:
+            pass
+        assert client.documents.create(DOCUMENT, idempotency_key="k1")["document_id"] == 1
+        assert api.count("POST") == 2
+        client.close()
+    print("✅ fail() forgets only definite rejections")
+
+
+def test_key_survives_restart():
+    """Recorded and pending keys are kept in the database file across processes"""
+    with tempfile.TemporaryDirectory() as directory, FakeAPI() as api:
+        path = os.path.join(directory, "idempotency.db")
+        
+        ledger = IdempotencyLedger(path)
+        client = KoyweClient(**api.credentials(), idempotency_ledger=ledger)
+        created = client.documents.create(DOCUMENT, idempotency_key="done")
+        ledger.begin("crashed", "documents")
+        client.close()
+        ledger.close()
+        
+        # A new process opens the same ledger
+        ledger = IdempotencyLedger(path)
+        client = KoyweClient(**api.credentials(), idempotency_ledger=ledger)
+        assert client.documents.create(DOCUMENT, idempotency_key="done") == created
+        try:
+            client.documents.create(DOCUMENT, idempotency_key="crashed")
+            raise AssertionError("the pending key was posted after the restart")
+        except PendingCreateError:
+            pass
+        assert api.count("POST") == 1, f"{api.count('POST')} POSTs"
+        client.close()
+        ledger.close()
+    print("✅ keys survive a restart")
+
+
+class ThreadRecordingLedger(IdempotencyLedger):
+    """Ledger remembering which threads its database calls ran on"""
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.threads = set()
+    
+    def get(self, key):
+        self.threads.add(threading.get_ident())
+        return super().get(key)
+    
+    def begin(self, key, endpoint):
+        self.threads.add(threading.get_ident())
+        super().begin(key, endpoint)
+    
+    def complete(self, key, response):
+        self.threads.add(threading.get_ident())
+        super().complete(key, response)
+
+
+def test_async_create():
+    """The asyncio client follows the same steps, with the ledger off the event loop"""
+    
+    async def run(api):
+        lookup = _lookup_in(api)
+        
+        async def async_lookup(key, document_data):
+            return lookup(key, document_data)
+        
+        ledger = ThreadRecordingLedger(lookup=async_lookup, reference=_reference)
+        async with AsyncKoyweClient(**api.credentials(), retry_policy=FAST_RETRIES, idempotency_ledger=ledger) as client:
+            api.failures.append(("POST", 503, True))
+            created = await client.documents.create(DOCUMENT)
+            assert await client.documents.create(DOCUMENT) == created
+            assert api.count("POST") == 1, f"{api.count('POST')} POSTs"
+            assert threading.get_ident() not in ledger.threads, "the ledger ran on the event loop"
+            
+        async with AsyncKoyweClient(**api.credentials(), idempotency_ledger=IdempotencyLedger()) as client:
+            api.failures.append(("POST", 503, True))
+            for expected in (ServerError, PendingCreateError):
+                try:
+                    await client.documents.create(DOCUMENT, idempotency_key="k1")
+                    raise AssertionError(f"expected {expected.__name__}")
+                except expected:
+                    pass
+            assert api.count("POST") == 2, f"{api.count('POST')} POSTs"
+            
+    with FakeAPI() as api:
+        asyncio.run(run(api))
+    print("✅ async creates")
+
+
+def main():
+    """Main test function"""
+    
+    print("Koywe API Client - Idempotent Creation Test\n")
+    
+    test_pending_key_not_reposted_without_lookup()
+    test_recover_returns_the_earlier_result()
+    test_pending_key_checked_before_posting()
+    test_fail_forgets_only_definite_rejections()
+    test_key_survives_restart()
+    test_async_create()
+    
+    print("\n✅ All idempotency tests passed!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Test script to verify that the invoice outbox submits every item exactly once
+"""
+
+import sys
+import os
+import tempfile
+import time
+from collections import Counter
+
+# Add the current directory to the path so we can import the client
+sys.path.insert(0, os.path.dirname(__file__))
+
+from fake_api import FakeAPI
+from koywe_api_client import KoyweClient, IdempotencyLedger, InvoiceOutbox, RetryPolicy
+
+ITEMS = 40
+# One request per outbox attempt, so attempts can be counted in POSTs
+NO_RETRIES = RetryPolicy(max_attempts=1)
+
+
+def _lookup_in(api):
+    """Lookup finding the document the fake API stored for an item's reference"""
+    def lookup(key, document_data):
+        with api.lock:
+            for document in api.documents.values():
+                if document.get("reference") == document_data["reference"]:
+                    return document
+        return None
+    return lookup
+
+
+def _client(api, lookup: bool = True):
+    ledger = IdempotencyLedger(lookup=_lookup_in(api) if lookup else None)
+    return KoyweClient(**api.credentials(), retry_policy=NO_RETRIES, idempotency_ledger=ledger)
+
+
+def _outbox(api, path, lookup: bool = True, **options):
+    options = {"workers": 4, "base_delay": 0.01, "poll_interval": 0.01, **options}
+    return InvoiceOutbox(_client(api, lookup=lookup), path, **options)
+
+
+def _posted_keys(api):
+    with api.lock:
+        return Counter(
+            headers.get("Idempotency-Key") for method, path, headers in api.requests
+            if method == "POST" and path.endswith("/documents")
+        )
+
+
+def test_two_processes_post_each_item_once():
+    """Two outboxes sharing one database file never post the same item twice"""
+    with tempfile.TemporaryDirectory() as directory, FakeAPI() as api:
+        path = os.path.join(directory, "outbox.db")
+        first, second = _outbox(api, path), _outbox(api, path)
+        for index in range(ITEMS):
+            first.enqueue({"reference": f"order-{index}"}, idempotency_key=f"key-{index}")
+            
+        first.start()
+        second.start()
+        assert first.drain(10) and second.drain(10), "the outbox did not drain"
+        
+        posted = _posted_keys(api)
+        assert len(posted) == ITEMS, f"{len(posted)} of {ITEMS} items posted"
+        assert max(posted.values()) == 1, f"posted twice: {[key for key, count in posted.items() if count > 1]}"
+        assert first.metrics()["done"] == ITEMS
+        assert first.metrics()["succeeded"] + second.metrics()["succeeded"] == ITEMS
+        first.close()
+        second.close()
+    print(f"✅ {ITEMS} items, each posted once by two processes")
+
+
+def test_leased_item_left_to_its_owner():
+    """An item another process is submitting is not taken over until its lease expires"""
+    with tempfile.TemporaryDirectory() as directory, FakeAPI() as api:
+        path = os.path.join(directory, "outbox.db")
+        owner = _outbox(api, path)
+        owner.enqueue({"reference": "order-1"}, idempotency_key="key-1")
+        # The owner claims the item and is, say, still waiting for the API
+        item = owner._claim()
+        assert item is not None
+        
+        other = _outbox(api, path, lease_timeout=1.0)
+        other.start()
+        assert not other.drain(0.3), "the leased item was taken over"
+        assert api.count("POST") == 0
+        
+        # The owner created the document, then crashed before recording it
+        api.documents[1] = {"reference": "order-1", "document_id": 1}
+        assert other.drain(5), "the expired lease was not reclaimed"
+        assert api.count("POST") == 0, "the reclaimed item was posted again"
+        assert other.get(item["id"])["status"] == "done"
+        assert other.get(item["id"])["result"]["document_id"] == 1
+        owner.close()
+        other.close()
+    print("✅ leased item left to its owner, then verified instead of re-posted")
+
+
+def test_expired_lease_without_lookup_dead_lettered():
+    """A reclaimed item is dead-lettered when the API cannot be checked for it"""
+    with tempfile.TemporaryDirectory() as directory, FakeAPI() as api:
+        path = os.path.join(directory, "outbox.db")
+        owner = _outbox(api, path, lookup=False)
+        item_id = owner.enqueue({"reference": "order-1"})
+        owner._claim()
+        
+        other = _outbox(api, path, lookup=False, lease_timeout=0.05)
+        time.sleep(0.1)
+        other.start()
+        assert other.drain(5)
+        item = other.get(item_id)
+        assert item["status"] == "dead", item
+        assert "Interrupted" in item["last_error"], item["last_error"]
+        assert api.count("POST") == 0
+        owner.close()
+        other.close()
+    print("✅ unverifiable reclaimed item dead-lettered")
+
+
+def test_max_attempts_then_requeue_dead():
+    """An item failing every attempt is dead-lettered after max_attempts, and requeue_dead retries it"""
+    with tempfile.TemporaryDirectory() as directory, FakeAPI() as api:
+        outbox = _outbox(api, os.path.join(directory, "outbox.db"), max_attempts=3)
+        item_id = outbox.enqueue({"reference": "order-1"})
+        api.failures.extend([("POST", 503)] * 3)
+        
+        outbox.start()
+        assert outbox.drain(5)
+        item = outbox.get(item_id)
+        assert item["status"] == "dead" and item["attempts"] == 3, item
+        assert api.count("POST") == 3, f"{api.count('POST')} POSTs"
+        assert [dead["id"] for dead in outbox.dead_letters()] == [item_id]
+        
+        assert outbox.requeue_dead() == 1
+        assert outbox.drain(5)
+        item = outbox.get(item_id)
+        assert item["status"] == "done" and item["attempts"] == 1, item
+        assert api.count("POST") == 4
+        assert outbox.dead_letters() == []
+        outbox.close()
+    print("✅ dead-lettered after max_attempts, then requeued")
+
+
+def test_failures_without_lookup():
+    """Without a lookup a 429 is retried, while a 5xx, after which the document may exist, is not"""
+    with tempfile.TemporaryDirectory() as directory, FakeAPI() as api:
+        outbox = _outbox(api, os.path.join(directory, "outbox.db"), lookup=False, workers=1)
+        throttled = outbox.enqueue({"reference": "order-1"})
+        failed = outbox.enqueue({"reference": "order-2"})
+        api.failures.extend([("POST", 429), ("POST", 503)])
+        
+        outbox.start()
+        assert outbox.drain(5)
+        assert outbox.get(throttled)["status"] == "done"
+        assert outbox.get(failed)["status"] == "dead"
+        assert api.count("POST") == 3, f"{api.count('POST')} POSTs"
+        outbox.close()
+    print("✅ 429 retried, 5xx dead-lettered without a lookup")
+
+
+def main():
+    """Main test function"""
+    
+    print("Koywe API Client - Invoice Outbox Test\n")
+    
+    test_two_processes_post_each_item_once()
+    test_leased_item_left_to_its_owner()
+    test_expired_lease_without_lookup_dead_lettered()
+    test_max_attempts_then_requeue_dead()
+    test_failures_without_lookup()
+    
+    print("\n✅ All outbox tests passed!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Test script to verify that pagination reaches the last page
+"""
+
+import sys
+import os
+import asyncio
+
+# Add the current directory to the path so we can import the client
+sys.path.insert(0, os.path.dirname(__file__))
+
+from fake_api import FakeAPI
+from koywe_api_client import KoyweClient, AsyncKoyweClient, RetryPolicy
+from koywe_api_client.exceptions import ServerError
+from koywe_api_client.pagination import is_last_page, total_pages
+from koywe_api_client.sync import DocumentSync
+
+DOCUMENTS = 7
+PAGE_CAP = 3
+PAGE_SIZE = 5
+STYLES = ("total_count", "total_pages", "has_more", None)
+FAST_RETRIES = RetryPolicy(max_attempts=3, base_delay=0.01, jitter=False)
+
+
+def _ids(documents):
+    return [document["document_id"] for document in documents]
+
+
+def test_page_count_uses_the_served_page_size():
+    """An item total is divided by the items the first page holds, not the requested size"""
+    first = {"data": [{}] * PAGE_CAP, "total_count": DOCUMENTS}
+    assert total_pages(first, PAGE_SIZE) == 3
+    assert not is_last_page(first, 1, PAGE_SIZE, items_seen=PAGE_CAP)
+    assert not is_last_page({"data": [{}] * PAGE_CAP, "total_count": DOCUMENTS}, 2, PAGE_SIZE)
+    assert is_last_page({"data": [{}], "total_count": DOCUMENTS}, 3, PAGE_SIZE, items_seen=DOCUMENTS)
+    print("✅ page count from the served page size")
+
+
+def test_iter_all_and_fetch_all_with_capped_page_size():
+    """Every document is returned when the server serves fewer items than requested"""
+    expected = list(range(1, DOCUMENTS + 1))
+    for style in STYLES[:3]:
+        with FakeAPI(documents=DOCUMENTS, page_cap=PAGE_CAP, pagination=style) as api:
+            client = KoyweClient(**api.credentials())
+            for prefetch in (0, 1, 4):
+                documents = client.documents.iter_all(page_size=PAGE_SIZE, prefetch=prefetch)
+                assert _ids(documents) == expected, f"{style}, prefetch {prefetch}"
+            for workers in (1, 4):
+                documents = client.documents.fetch_all(page_size=PAGE_SIZE, max_workers=workers)
+                assert _ids(documents) == expected, f"{style}, {workers} workers"
+            client.close()
+    print(f"✅ iter_all and fetch_all return all {DOCUMENTS} documents")
+
+
+def test_async_iter_all_and_fetch_all_with_capped_page_size():
+    """The asyncio client returns every document from a server capping the page size"""
+    expected = list(range(1, DOCUMENTS + 1))
+    
+    async def run(api):
+        async with AsyncKoyweClient(**api.credentials()) as client:
+            documents = [document async for document in client.documents.iter_all(page_size=PAGE_SIZE)]
+            assert _ids(documents) == expected, f"{api.pagination} iter_all"
+            documents = await client.documents.fetch_all(page_size=PAGE_SIZE, max_concurrency=4)
+            assert _ids(documents) == expected, f"{api.pagination} fetch_all"
+            
+    for style in STYLES[:3]:
+        with FakeAPI(documents=DOCUMENTS, page_cap=PAGE_CAP, pagination=style) as api:
+            asyncio.run(run(api))
+    print(f"✅ async iter_all and fetch_all return all {DOCUMENTS} documents")
+
+
+def test_sync_with_capped_page_size():
+    """DocumentSync delivers every document from a server capping the page size"""
+    with FakeAPI(documents=DOCUMENTS, page_cap=PAGE_CAP) as api:
+        client = KoyweClient(**api.credentials())
+        delivered = []
+        sync = DocumentSync(client, delivered.append, page_size=PAGE_SIZE)
+        assert sync.run() == DOCUMENTS
+        assert _ids(delivered) == list(range(1, DOCUMENTS + 1))
+        client.close()
+    print(f"✅ DocumentSync delivered all {DOCUMENTS} documents")
+
+
+def test_last_page_not_fetched_twice():
+    """Without a page cap, iteration stops at the last page without an extra request"""
+    for style in STYLES:
+        with FakeAPI(documents=10, pagination=style) as api:
+            client = KoyweClient(**api.credentials())
+            assert len(list(client.documents.iter_all(page_size=PAGE_SIZE, prefetch=0))) == 10
+            # The style without metadata needs the empty third page to know the second was the last
+            expected = 3 if style is None else 2
+            assert api.count("GET") == expected, f"{style}: {api.count('GET')} pages requested"
+            client.close()
+    print("✅ no requests past the last page")
+
+
+def test_export_page_retried_under_the_client_policy():
+    """A failed export page is retried on its own, and only as often as the retry policy allows"""
+    expected = list(range(1, DOCUMENTS + 1))
+    
+    async def run_async(api):
+        async with AsyncKoyweClient(**api.credentials(), retry_policy=FAST_RETRIES) as client:
+            return await client.documents.fetch_all(page_size=PAGE_SIZE, max_concurrency=4)
+    
+    for fetch_all in ("sync", "async"):
+        with FakeAPI(documents=DOCUMENTS, page_cap=PAGE_CAP) as api:
+            client = KoyweClient(**api.credentials(), retry_policy=FAST_RETRIES)
+            export = (
+                (lambda: client.documents.fetch_all(page_size=PAGE_SIZE, max_workers=4)) if fetch_all == "sync"
+                else (lambda: asyncio.run(run_async(api)))
+            )
+            # One failure costs one extra request, not a restarted export
+            api.failures.append(("GET", 503))
+            assert _ids(export()) == expected, fetch_all
+            assert api.count("GET") == 4, f"{fetch_all}: {api.count('GET')} pages requested"
+            
+            # A page failing every attempt is given up after the policy's attempts
+            api.failures.extend([("GET", 503)] * 10)
+            try:
+                export()
+                raise AssertionError(f"{fetch_all}: the failing export was not reported")
+            except ServerError as e:
+                assert len(e.attempts) == FAST_RETRIES.max_attempts, f"{fetch_all}: {len(e.attempts)} attempts"
+            assert api.count("GET") == 4 + FAST_RETRIES.max_attempts, f"{fetch_all}: {api.count('GET')} requests"
+            client.close()
+    print("✅ export pages retried under the client retry policy")
+
+
+def main():
+    """Main test function"""
+    
+    print("Koywe API Client - Pagination Test\n")
+    
+    test_page_count_uses_the_served_page_size()
+    test_iter_all_and_fetch_all_with_capped_page_size()
+    test_async_iter_all_and_fetch_all_with_capped_page_size()
+    test_sync_with_capped_page_size()
+    test_last_page_not_fetched_twice()
+    test_export_page_retried_under_the_client_policy()
+    
+    print("\n✅ All pagination tests passed!")
+
+
+if __name__ == "__main__":
+    main()
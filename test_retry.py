@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Test script to verify retries of failed requests
+"""
+
+import sys
+import os
+import asyncio
+
+# Add the current directory to the path so we can import the client
+sys.path.insert(0, os.path.dirname(__file__))
+
+from fake_api import FakeAPI
+from koywe_api_client import KoyweClient, AsyncKoyweClient, RetryPolicy, RateLimitError
+from koywe_api_client.exceptions import ServerError
+
+
+def test_none_disables_retries():
+    """retry_policy=None sends each request once, while the default retries"""
+    
+    async def run_async(api, **options):
+        async with AsyncKoyweClient(**api.credentials(), **options) as client:
+            assert (client.retry_policy is None) == ("retry_policy" in options)
+            await client.documents.get(1)
+    
+    def run_sync(api, **options):
+        client = KoyweClient(**api.credentials(), **options)
+        try:
+            assert (client.retry_policy is None) == ("retry_policy" in options)
+            client.documents.get(1)
+        finally:
+            client.close()
+            
+    for run in (run_sync, lambda api, **options: asyncio.run(run_async(api, **options))):
+        with FakeAPI(documents=1) as api:
+            api.failures.append(("GET", 503))
+            try:
+                run(api, retry_policy=None)
+                raise AssertionError("the failure was retried")
+            except ServerError as e:
+                assert len(e.attempts) == 1, f"{len(e.attempts)} attempts"
+            assert api.count("GET", "/V1/documents/1") == 1
+            
+            api.failures.append(("GET", 503))
+            run(api)
+            assert api.count("GET", "/V1/documents/1") == 3
+    print("✅ retry_policy=None disables retries")
+
+
+def test_retry_after_read_in_any_casing():
+    """Retry-After is honoured whatever casing the server sent the header name in"""
+    policy = RetryPolicy(jitter=False)
+    for name in ("Retry-After", "retry-after", "RETRY-AFTER", "Retry-after"):
+        error = RateLimitError("slow down", status_code=429, headers={name: "7"})
+        assert error.headers["retry-after"] == "7"
+        assert policy.get_delay(1, error) == 7.0, name
+    print("✅ Retry-After read in any casing")
+
+
+def main():
+    """Main test function"""
+    
+    print("Koywe API Client - Retry Test\n")
+    
+    test_none_disables_retries()
+    test_retry_after_read_in_any_casing()
+    
+    print("\n✅ All retry tests passed!")
+
+
+if __name__ == "__main__":
+    main()
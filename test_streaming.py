@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Test script to verify incremental parsing of list responses
+"""
+
+import sys
+import os
+import asyncio
+import json
+
+# Add the current directory to the path so we can import the client
+sys.path.insert(0, os.path.dirname(__file__))
+
+from fake_api import FakeAPI
+from koywe_api_client import KoyweClient, AsyncKoyweClient
+from koywe_api_client.streaming import ItemStreamParser, iter_items
+
+BODY = json.dumps({
+    "meta": {"filters": ["a]", "b,"], "empty": [], "nested": {"x": [1, {"y": "}"}]}},
+    "data": [
+        {"document_id": 1, "comment": "bracket ] and comma , inside", "total": 12.5e3},
+        {"document_id": 2, "comment": "quote \" backslash \\ slash / tab \t", "total": -0.25},
+        {"document_id": 3, "comment": "accents á é ñ, escaped é and 😀", "lines": [[], {}, [1, [2]]]},
+        "text with ] and ,",
+        1234567890,
+        None,
+        True,
+        []
+    ],
+    "total_count": 8
+}, ensure_ascii=False).encode("utf-8")
+
+MALFORMED = [
+    b'{"data":[1,,2]}',
+    b'{"data":[,1]}',
+    b'{"data":[1,]}',
+    b'{"data":[1 2]}',
+    b'[1,,2]',
+    b'[,]',
+    b'{,"data":[]}',
+    b'{"meta":1,,"data":[]}',
+    b'{"meta":1,}',
+    b'{"meta":1 "data":[]}',
+    b'{"meta":,"data":[]}',
+    b'{"data" [1]}',
+    b'{"data":[1]',
+    b'{"data":[1, {"a": "unterminated',
+    b'{"data":[1]} trailing',
+    b'"data"'
+]
+
+
+def _chunks(data: bytes, size: int):
+    return [data[start:start + size] for start in range(0, len(data), size)]
+
+
+def _parse(chunks, key: str = "data"):
+    """Feed the chunks to a parser and collect the items"""
+    parser = ItemStreamParser(key=key)
+    items = []
+    for chunk in chunks:
+        items.extend(parser.feed(chunk))
+    items.extend(parser.close())
+    return items
+
+
+def test_item_boundaries_split_across_chunks():
+    """Every chunk size, down to one byte, yields the same items"""
+    expected = json.loads(BODY)["data"]
+    for size in range(1, len(BODY) + 1):
+        items = _parse(_chunks(BODY, size))
+        assert items == expected, f"chunk size {size}: got {items!r}"
+    print(f"✅ {len(BODY)} chunk sizes, {len(expected)} items each")
+
+
+def test_items_yielded_as_they_complete():
+    """An item is returned by the feed that completes it, not at the end"""
+    parser = ItemStreamParser()
+    assert parser.feed(b'{"data":[{"a":"],"},') == [{"a": "],"}]
+    assert parser.feed(b'{"b":') == []
+    assert parser.feed(b'"\\u00e9"}') == [{"b": "é"}]
+    # A number at the end of a chunk may still continue
+    assert parser.feed(b',12') == []
+    assert parser.feed(b'.5]}') == [12.5]
+    assert parser.close() == []
+    print("✅ items yielded as they complete")
+
+
+def test_multibyte_characters_split_across_chunks():
+    """A UTF-8 character split between chunks is decoded once whole"""
+    body = '{"data":["ñandú €"]}'.encode("utf-8")
+    for split in range(len(body)):
+        items = _parse([body[:split], body[split:]])
+        assert items == ["ñandú €"], f"split at {split}: got {items!r}"
+    print("✅ multi-byte characters split across chunks")
+
+
+def test_top_level_array_and_other_shapes():
+    """Arrays, empty data and non-array data keys are handled"""
+    assert list(iter_items([b'[1, "]", {"a": [2]}]'])) == [1, "]", {"a": [2]}]
+    assert list(iter_items([b'{"data": []}'])) == []
+    assert list(iter_items([b'[]'])) == []
+    assert list(iter_items([b'{}'])) == []
+    assert list(iter_items([b'{"data": null, "other": [1]}'])) == []
+    assert list(iter_items([b'{"results": [1, 2]}'], key="results")) == [1, 2]
+    print("✅ top-level arrays and other shapes")
+
+
+def test_metadata_kept():
+    """The top-level keys around the data array are decoded into metadata"""
+    for size in (1, len(BODY)):
+        parser = ItemStreamParser()
+        for chunk in _chunks(BODY, size):
+            parser.feed(chunk)
+        parser.close()
+        expected = json.loads(BODY)
+        del expected["data"]
+        assert parser.metadata == expected, f"chunk size {size}: got {parser.metadata!r}"
+    print("✅ metadata kept")
+
+
+def test_iter_all_stream_with_capped_page_size():
+    """Streamed iteration reads every page of a server capping the page size"""
+    expected = list(range(1, 10))
+    
+    async def run_async(api):
+        async with AsyncKoyweClient(**api.credentials()) as client:
+            return [document["document_id"] async for document in client.documents.iter_all(page_size=5, stream=True)]
+    
+    for style in ("total_count", "total_pages", "has_more"):
+        with FakeAPI(documents=9, page_cap=3, pagination=style) as api:
+            client = KoyweClient(**api.credentials())
+            documents = client.documents.iter_all(page_size=5, stream=True)
+            assert [document["document_id"] for document in documents] == expected, style
+            assert api.count("GET") == 3, f"{style}: {api.count('GET')} pages requested"
+            client.close()
+            assert asyncio.run(run_async(api)) == expected, f"{style} async"
+    print("✅ streamed iter_all reads every page")
+
+
+def test_malformed_bodies_rejected():
+    """Empty elements, missing separators and incomplete bodies raise ValueError"""
+    for body in MALFORMED:
+        for size in (1, len(body)):
+            try:
+                _parse(_chunks(body, size))
+            except ValueError:
+                continue
+            raise AssertionError(f"{body!r} in chunks of {size} was accepted")
+    print(f"✅ {len(MALFORMED)} malformed bodies rejected")
+
+
+def main():
+    """Main test function"""
+    
+    print("Koywe API Client - Streaming Parser Test\n")
+    
+    test_item_boundaries_split_across_chunks()
+    test_items_yielded_as_they_complete()
+    test_multibyte_characters_split_across_chunks()
+    test_top_level_array_and_other_shapes()
+    test_metadata_kept()
+    test_iter_all_stream_with_capped_page_size()
+    test_malformed_bodies_rejected()
+    
+    print("\n✅ All streaming parser tests passed!")
+
+
+if __name__ == "__main__":
+    main()
@@ -35,8 +35,14 @@ def test_imports():
         # Test endpoint imports
         print("Testing endpoint imports...")
         from koywe_api_client.endpoints import DocumentsEndpoint, AccountsEndpoint
+        from koywe_api_client.endpoints import AsyncDocumentsEndpoint, AsyncAccountsEndpoint
         print("✅ Endpoint classes imported successfully")
         
+        # Test async client import
+        print("Testing async client import...")
+        from koywe_api_client import AsyncKoyweClient
+        print("✅ AsyncKoyweClient imported successfully")
+        
         # Test model imports
         print("Testing model imports...")
         from koywe_api_client.models import Document, DocumentHeader, DocumentDetail, Account
@@ -114,6 +120,8 @@ def test_client_methods():
         assert hasattr(client, 'authenticate'), "authenticate method missing"
         assert hasattr(client, 'is_authenticated'), "is_authenticated method missing"
         assert hasattr(client, 'clear_authentication'), "clear_authentication method missing"
+        assert hasattr(client, 'close'), "close method missing"
+        assert client.documents.session is client.auth_handler.session, "Connection pool not shared"
         print("✅ All client methods available")
         
         print("\n✅ All method tests passed!")